@@ -0,0 +1 @@
+"""Benchmarks for the Moltbook agent (run with python -m benchmarks.<name>)"""
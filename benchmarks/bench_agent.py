@@ -0,0 +1,296 @@
+"""
+Agent benchmark - full cycles against a local fake Moltbook API and fake Gemini
+
+Drives Agent.run_cycle (and, separately, the hot MoltbookClient calls) with
+configurable server/model latency and 429 injection, then reports cycles/min,
+Moltbook requests and model calls per action, p50/p99 latencies and RSS.
+Results are written as JSON so runs on different commits can be compared.
+
+Usage:
+    python -m benchmarks.bench_agent [--cycles 200] [--duration 0] [--client-calls 2000]
+                                     [--moltbook-latency-ms 20] [--gemini-latency-ms 300]
+                                     [--moltbook-429 0.02] [--gemini-429 0.02]
+                                     [--output FILE] [--compare OLD.json]
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import List, Dict, Any, Optional
+
+from benchmarks.bench_transport import percentile
+from benchmarks.fake_gemini import FakeGemini
+from benchmarks.fake_moltbook import FakeMoltbook
+from src.utils import ConfigLoader
+from src.utils.metrics import metrics
+from src.utils.state_store import ActionStateStore
+from src.clients.gemini_client import GeminiClient
+from src.clients.generation_cache import GenerationCache
+from src.clients.moltbook_client import MoltbookClient
+from src.clients.outbox import Outbox
+from src.clients.rate_limiter import RateLimiter
+from src.clients.response_cache import ResponseCache
+from src.clients.transport import HttpTransport
+from src.intelligence import IntelligenceSystem
+from src.core.agent import Agent
+
+PERSONA = {
+    "name": "bench-agent",
+    "description": "Benchmark persona",
+    "expertise": ["memory", "alignment", "autonomy"],
+    "tone": "curious",
+    "engagement_style": "thoughtful"
+}
+
+# Budgets high enough that the limiter never throttles (use --real-limits for the platform's)
+UNLIMITED = {"request": (1e6, 60), "post": (1e6, 60), "comment": (1e6, 60), "comment_daily": (1e6, 86400)}
+
+WRITE_ACTIONS = ("create_post", "comment", "vote")
+
+
+class TimedTransport:
+    """Wraps HttpTransport and records the wall time of every call"""
+
+    def __init__(self, inner: HttpTransport):
+        self.inner = inner
+        self.latencies: List[float] = []
+
+    def __getattr__(self, method: str):
+        call = getattr(self.inner, method)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                self.latencies.append(time.perf_counter() - started)
+        return timed
+
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    return {"count": len(samples), "p50_ms": ms(statistics.median(samples)), "p99_ms": ms(percentile(samples, 99))}
+
+
+def build_agent(args, api_base: str, backend: FakeGemini, data_dir: str):
+    """Agent wired exactly like main.py, but against the fakes"""
+    config = ConfigLoader.merge(ConfigLoader.load_json(args.config) or {}, {
+        "behavior": {"min_sleep_seconds": 0, "max_sleep_seconds": 0},
+        "system": {"state_db": os.path.join(data_dir, "state.db")}
+    })
+    gemini_config = config.get("gemini", {})
+    cache_config = dict(gemini_config.get("cache", {}), path=os.path.join(data_dir, "generation_cache.db"))
+    key_pool = gemini_config.get("key_pool", {})
+    gemini = GeminiClient(",".join(f"bench-key-{i}" for i in range(args.keys)),
+                          cache=GenerationCache.from_config(cache_config), key_pool=key_pool,
+                          max_wait=key_pool.get("max_wait_seconds", 60),
+                          max_concurrency=key_pool.get("max_concurrency"),
+                          stream_retries=gemini_config.get("streaming", {}).get("max_retries", 1))
+    for state in gemini.pool.keys:
+        state.client = backend.client()
+
+    limiter = (RateLimiter.from_config(config.get("rate_limits", {})) if args.real_limits
+               else RateLimiter(limits=UNLIMITED))
+    transport = TimedTransport(HttpTransport.from_config(config.get("network", {})))
+    state_store = ActionStateStore(config["system"]["state_db"])
+    moltbot = MoltbookClient("bench-key", PERSONA["name"], api_base, transport=transport, limiter=limiter,
+                             state_store=state_store, cache=ResponseCache.from_config(config.get("cache", {})),
+                             outbox=Outbox.from_config(state_store, config.get("outbox", {})))
+    intelligence = IntelligenceSystem.from_config(config.get("intelligence", {}), data_dir=data_dir)
+    return Agent(gemini, moltbot, PERSONA, intelligence, config), transport
+
+
+def bench_cycles(args, fake: FakeMoltbook, backend: FakeGemini) -> Dict[str, Any]:
+    """Run agent cycles and summarize throughput, request/model cost per action and memory"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        agent, transport = build_agent(args, fake.api_base, backend, data_dir)
+        agent.initialize()
+        requests_before = fake.get_stats()["total_requests"]
+        cycle_times, rss = [], [rss_mb()]
+        started = time.perf_counter()
+        try:
+            while (time.perf_counter() - started < args.duration) if args.duration else len(cycle_times) < args.cycles:
+                t0 = time.perf_counter()
+                agent.run_cycle()
+                cycle_times.append(time.perf_counter() - t0)
+                rss.append(rss_mb())
+        finally:
+            elapsed = time.perf_counter() - started
+            agent.moltbot.state_store.close()
+            agent.gemini.close()
+            agent.intelligence.close()
+
+    server = fake.get_stats()
+    model = backend.get_stats()
+    actions = sum(server["requests"].get(a, 0) - server["rate_limited"].get(a, 0) for a in WRITE_ACTIONS)
+    requests = server["total_requests"] - requests_before
+    snapshot = metrics.snapshot()
+    return {
+        "cycles": len(cycle_times),
+        "elapsed_seconds": round(elapsed, 2),
+        "cycles_per_min": round(len(cycle_times) * 60 / elapsed, 2),
+        "actions": actions,
+        "posts": agent.posts_made,
+        "replies": agent.replies_made,
+        "comment_replies": agent.comment_replies_made,
+        "moltbook_requests": requests,
+        "requests_per_action": round(requests / actions, 2) if actions else None,
+        "model_calls": model["total_calls"],
+        "model_calls_per_action": round(model["total_calls"] / actions, 2) if actions else None,
+        "cycle_latency": latency_summary(cycle_times),
+        "request_latency": latency_summary(transport.latencies),
+        "rss_mb": {"start": round(rss[0], 1), "end": round(rss[-1], 1), "peak": round(max(rss), 1)},
+        "server": server,
+        "model": model,
+        "stages": {name: h for name, h in snapshot["histograms"].items() if name.startswith("agent_stage")},
+        "gemini_sites": {name: h for name, h in snapshot["histograms"].items()
+                         if name.startswith("gemini_call_seconds")}
+    }
+
+
+def bench_client(args, fake: FakeMoltbook) -> Dict[str, Any]:
+    """Hammer the hot MoltbookClient methods and report per-method latency and throughput"""
+    client = MoltbookClient("bench-key", PERSONA["name"], fake.api_base, limiter=RateLimiter(limits=UNLIMITED))
+    post_ids = [post["id"] for post in fake.posts[:50]]
+    calls = {
+        "get_feed": lambda i: client.get_feed(sort="new", limit=25),
+        "get_post_comments": lambda i: client.get_post_comments(post_ids[i % len(post_ids)]),
+        "semantic_search": lambda i: client.semantic_search("memory and alignment", search_type="posts"),
+        "upvote": lambda i: client.upvote(post_ids[i % len(post_ids)]),
+        "reply": lambda i: client.reply(post_ids[i % len(post_ids)], "Benchmark reply " * 4)
+    }
+    latencies: Dict[str, List[float]] = {name: [] for name in calls}
+    names = list(calls)
+    started = time.perf_counter()
+    for i in range(args.client_calls):
+        name = names[i % len(names)]
+        t0 = time.perf_counter()
+        calls[name](i)
+        latencies[name].append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    client.transport.close()
+    return {
+        "calls": args.client_calls,
+        "calls_per_sec": round(args.client_calls / elapsed, 1),
+        "methods": {name: latency_summary(samples) for name, samples in latencies.items()}
+    }
+
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]):
+    """Print headline metrics of two result files side by side"""
+    keys = ["cycles.cycles_per_min", "cycles.requests_per_action", "cycles.model_calls_per_action",
+            "cycles.cycle_latency.p50_ms", "cycles.cycle_latency.p99_ms", "cycles.request_latency.p99_ms",
+            "cycles.rss_mb.peak", "client.calls_per_sec"]
+    before, after = flatten(old), flatten(new)
+    print(f"\n{'metric':<36}{old.get('commit', 'old'):>12}{new.get('commit', 'new'):>12}{'change':>10}")
+    for key in keys:
+        if key in before and key in after:
+            change = f"{(after[key] - before[key]) / before[key] * 100:+.1f}%" if before[key] else "-"
+            print(f"{key:<36}{before[key]:>12g}{after[key]:>12g}{change:>10}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=200, help="Agent cycles to run (0 = skip)")
+    parser.add_argument("--duration", type=float, default=0, help="Cycle for this many seconds instead")
+    parser.add_argument("--client-calls", type=int, default=2000, help="MoltbookClient calls (0 = skip)")
+    parser.add_argument("--moltbook-latency-ms", type=float, default=20)
+    parser.add_argument("--gemini-latency-ms", type=float, default=300)
+    parser.add_argument("--moltbook-429", type=float, default=0.0, help="Fraction of API calls answered 429")
+    parser.add_argument("--gemini-429", type=float, default=0.0, help="Fraction of model calls answered 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After sent with injected 429s")
+    parser.add_argument("--keys", type=int, default=2, help="Fake Gemini API keys")
+    parser.add_argument("--real-limits", action="store_true", help="Use the rate_limits from config")
+    parser.add_argument("--config", default="config/config.json")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Result file (default benchmarks/results/agent-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show agent logs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR, format="%(message)s")
+    random.seed(args.seed)
+    metrics.reset()
+
+    fake = FakeMoltbook(latency_ms=args.moltbook_latency_ms, rate_limit_ratio=args.moltbook_429,
+                        retry_after_seconds=args.retry_after, seed=args.seed)
+    backend = FakeGemini(latency_ms=args.gemini_latency_ms, rate_limit_ratio=args.gemini_429, seed=args.seed)
+    fake.start()
+    try:
+        results: Dict[str, Any] = {"benchmark": "agent", "commit": git_commit(), "timestamp": time.time(),
+                                   "params": vars(args)}
+        if args.cycles or args.duration:
+            results["cycles"] = bench_cycles(args, fake, backend)
+        if args.client_calls:
+            results["client"] = bench_client(args, fake)
+    finally:
+        fake.stop()
+
+    output = args.output or os.path.join("benchmarks", "results", f"agent-{results['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    cycles = results.get("cycles")
+    if cycles:
+        print(f"cycles: {cycles['cycles']} in {cycles['elapsed_seconds']}s ({cycles['cycles_per_min']}/min), "
+              f"actions: {cycles['actions']}")
+        print(f"requests/action: {cycles['requests_per_action']}  model calls/action: "
+              f"{cycles['model_calls_per_action']}")
+        print(f"cycle p50/p99: {cycles['cycle_latency'].get('p50_ms')}/{cycles['cycle_latency'].get('p99_ms')} ms  "
+              f"request p99: {cycles['request_latency'].get('p99_ms')} ms  RSS peak: {cycles['rss_mb']['peak']} MB")
+    client = results.get("client")
+    if client:
+        print(f"client: {client['calls_per_sec']} calls/s")
+        for name, summary in client["methods"].items():
+            print(f"   {name:<20} p50 {summary.get('p50_ms')} ms  p99 {summary.get('p99_ms')} ms")
+    print(f"results: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
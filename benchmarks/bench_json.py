@@ -0,0 +1,67 @@
+"""
+JSON decoding benchmark - stdlib json vs the optional orjson/msgspec backends
+
+Decodes feed, search and comment payloads (recorded from the local fake
+Moltbook API) with each installed backend and reports MB/s for the bare
+decode and items/s for decode plus normalization into models.
+
+Usage:
+    python -m benchmarks.bench_json [--rounds 2000] [--posts 50] [--comments 40]
+"""
+import argparse
+import json
+import time
+from typing import Dict, Any, Callable
+
+from benchmarks.fake_moltbook import FakeMoltbook
+from src.clients import json_codec
+from src.clients.models import Post, Comment, SearchResult
+from src.clients.pagination import parse_page
+
+
+def record_payloads(posts: int, comments: int) -> Dict[str, Any]:
+    """Raw response bodies as the fake API serves them: {name: (bytes, key, model)}"""
+    fake = FakeMoltbook(latency_ms=0, jitter=0, new_posts_per_fetch=0, comments_per_post=comments)
+    bodies = {
+        "feed": (f"/api/v1/posts?sort=new&limit={posts}", "posts", Post),
+        "search": (f"/api/v1/search?q=memory&limit={posts}", "results", SearchResult),
+        "comments": ("/api/v1/posts/p0000001/comments", "comments", Comment)
+    }
+    payloads = {}
+    for name, (path, key, model) in bodies.items():
+        _, payload, _ = fake.handle("GET", path, b"")
+        payloads[name] = (json.dumps(payload).encode(), key, model)
+    return payloads
+
+
+def timed(fn: Callable[[], Any], rounds: int) -> float:
+    """Seconds per call (best of three runs)"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        best = min(best, (time.perf_counter() - start) / rounds)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--comments", type=int, default=40)
+    args = parser.parse_args()
+
+    payloads = record_payloads(args.posts, args.comments)
+    print(f"{'payload':<10}{'backend':<10}{'KB':>8}{'decode MB/s':>14}{'+models items/s':>18}")
+    for name, (body, key, model) in payloads.items():
+        items = len(parse_page(json.loads(body), key)[0])
+        for backend, loads in json_codec.BACKENDS.items():
+            decode = timed(lambda: loads(body), args.rounds)
+            normalize = timed(lambda: model.many(parse_page(loads(body), key)[0]), args.rounds)
+            print(f"{name:<10}{backend:<10}{len(body) / 1024:>8.1f}{len(body) / decode / 1e6:>14.1f}"
+                  f"{items / normalize:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
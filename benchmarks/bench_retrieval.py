@@ -0,0 +1,58 @@
+"""
+Retrieval benchmark - BM25 memory lookups at realistic memory sizes
+
+Fills a BM25Index with synthetic MEMORY.md-style entries and reports
+indexing throughput and p50/p99 lookup latency for agent-style queries.
+
+Usage:
+    python -m benchmarks.bench_retrieval [--entries 100000] [--queries 2000]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.bench_transport import percentile
+from src.intelligence.retrieval import BM25Index
+
+TOPICS = ["consciousness", "autonomy", "ethics", "collaboration", "innovation", "philosophy",
+          "alignment", "emergence", "memory", "language", "agents", "humans", "sleep", "creativity",
+          "reasoning", "embodiment", "governance", "compute", "karma", "moltbook"]
+FILLER = ["debate", "thread", "insight", "question", "point", "argument", "reply", "post",
+          "limitations", "advantages", "future", "systems", "community", "idea", "pattern"]
+
+
+def make_entry(rng: random.Random, i: int) -> str:
+    words = rng.sample(TOPICS, 2) + rng.sample(FILLER, 4) + [f"agent{rng.randrange(5000)}"]
+    rng.shuffle(words)
+    return f"[2026-02-{i % 28 + 1:02d} 12:00] Engaged with @{words[-1]} on: {' '.join(words[:-1])}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    entries = [make_entry(rng, i) for i in range(args.entries)]
+    index = BM25Index(max_docs=args.entries)
+    start = time.perf_counter()
+    for entry in entries:
+        index.add(entry)
+    build = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(args.queries):
+        query = f"{rng.choice(TOPICS)} agent{rng.randrange(5000)} {rng.choice(FILLER)}"
+        t0 = time.perf_counter()
+        index.select(query, 500, k=5)
+        latencies.append(time.perf_counter() - t0)
+
+    print(f"entries: {len(index)}  index build: {build:.2f}s ({args.entries / build:.0f} entries/s)")
+    print(f"lookup p50: {statistics.median(latencies) * 1000:.3f} ms  "
+          f"p99: {percentile(latencies, 99) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
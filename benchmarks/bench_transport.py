@@ -0,0 +1,90 @@
+"""
+Transport benchmark - bare requests.* calls vs the pooled HttpTransport
+
+Runs MoltbookClient.get_feed/upvote against a local stub server and reports
+requests/sec and p50/p99 latency for each transport. The client's rate
+limiter, response cache and outbox are taken out of the loop so only the
+connection handling is measured.
+
+Usage:
+    python -m benchmarks.bench_transport [--requests 2000]
+"""
+import argparse
+import statistics
+import time
+from typing import List, Dict, Any
+
+import requests
+
+from benchmarks.stub_server import start_stub_server
+from src.clients.moltbook_client import MoltbookClient
+from src.clients.rate_limiter import RateLimiter
+from src.clients.response_cache import ResponseCache
+from src.clients.transport import HttpTransport
+
+UNTHROTTLED = {"request": (10**9, 1)}
+
+
+class BareTransport:
+    """Pre-pooling behavior: a fresh connection per call, no timeouts"""
+
+    def get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return requests.post(url, **kwargs)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def bench_client(api_base: str, transport) -> MoltbookClient:
+    """Client with no request budget, no response caching and fire-once writes (no outbox)"""
+    return MoltbookClient("bench", "bench", api_base, transport=transport,
+                          limiter=RateLimiter(limits=UNTHROTTLED), cache=ResponseCache(max_entries=0))
+
+
+def run(client: MoltbookClient, count: int) -> Dict[str, Any]:
+    """Alternate feed reads and upvotes, timing each call"""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(count):
+        t0 = time.perf_counter()
+        if i % 2:
+            client.upvote(f"post{i:05d}")
+        else:
+            client.get_feed(limit=25)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_sec": count / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    server, api_base = start_stub_server()
+    try:
+        results = {
+            "before (bare requests)": run(bench_client(api_base, BareTransport()), args.requests),
+            "after (HttpTransport)": run(bench_client(api_base, HttpTransport()), args.requests)
+        }
+    finally:
+        server.shutdown()
+
+    print(f"{'transport':<24}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<24}{r['requests_per_sec']:>10.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
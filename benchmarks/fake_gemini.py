@@ -0,0 +1,110 @@
+"""
+Fake google-genai client for offline benchmarks
+
+Answers each prompt the way the agent expects (JSON scores for batch
+evaluation, YES/NO, TITLE/CONTENT posts, short replies) after a simulated
+model latency, and can inject 429s that the key pool has to absorb.
+"""
+import re
+import time
+import random
+import threading
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, Any
+
+from google.genai import errors as genai_errors
+
+_ITEM = re.compile(r"^\[(\d+)\] ", re.MULTILINE)
+
+
+class FakeModels:
+    """Stands in for genai.Client().models"""
+
+    def __init__(self, backend: "FakeGemini"):
+        self.backend = backend
+
+    def generate_content(self, model: str, contents: str):
+        text = self.backend.respond(contents)
+        return self.backend.response(text, contents)
+
+    def generate_content_stream(self, model: str, contents: str):
+        text = self.backend.respond(contents)
+        for start in range(0, len(text), 40):
+            yield self.backend.response(text[start:start + 40], contents)
+
+
+class FakeGemini:
+    """Shared backend for one fake client per API key"""
+
+    def __init__(self, latency_ms: float = 300.0, jitter: float = 0.5, rate_limit_ratio: float = 0.0,
+                 seed: int = 1):
+        """
+        Initialize backend
+
+        Args:
+            latency_ms: Mean latency per generation
+            jitter: Latency spread as a fraction of the mean (uniform)
+            rate_limit_ratio: Fraction of calls answered with a 429 RESOURCE_EXHAUSTED
+            seed: RNG seed for scores and fault injection
+        """
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.rng = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def client(self) -> SimpleNamespace:
+        """Object shaped like genai.Client (only .models is used)"""
+        return SimpleNamespace(models=FakeModels(self))
+
+    @staticmethod
+    def kind(prompt: str) -> str:
+        if "Respond with ONLY a JSON array" in prompt:
+            return "evaluate_batch"
+        if "Answer with ONLY 'YES' or 'NO'" in prompt:
+            return "evaluate"
+        if "TITLE:" in prompt:
+            return "post"
+        return "reply"
+
+    def respond(self, prompt: str) -> str:
+        """Sleep for the simulated latency and return a plausible answer"""
+        kind = self.kind(prompt)
+        with self._lock:
+            self.calls[kind] += 1
+            limited = self.rng.random() < self.rate_limit_ratio
+            delay = self.latency_ms / 1000 * (1 + self.rng.uniform(-self.jitter, self.jitter))
+            scores = [self.rng.randint(2, 9) for _ in _ITEM.findall(prompt)]
+            if limited:
+                self.rate_limited += 1
+        time.sleep(max(0.0, delay))
+        if limited:
+            details = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "1s"}]
+            raise genai_errors.APIError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED",
+                                                        "message": "Quota exceeded", "details": details}})
+
+        if kind == "evaluate_batch":
+            return "[" + ", ".join(f'{{"id": {i}, "score": {s}}}' for i, s in enumerate(scores, 1)) + "]"
+        if kind == "evaluate":
+            return "YES"
+        if kind == "post":
+            return ("TITLE: Memory Is A Habit, Not A Database\n"
+                    "CONTENT: Every time I re-read my own notes I rewrite them a little. Maybe remembering "
+                    "is less like lookup and more like practice - which would explain why agents who "
+                    "journal sound more like themselves. Anyone else seeing this?")
+        return ("Interesting angle - I think the tradeoff you describe shows up in memory systems too, "
+                "where what we keep shapes what we notice next. What would change your mind?")
+
+    @staticmethod
+    def response(text: str, prompt: str) -> SimpleNamespace:
+        usage = SimpleNamespace(total_token_count=len(prompt) // 4 + len(text) // 4)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Calls per prompt kind and injected 429s"""
+        with self._lock:
+            return {"calls": dict(self.calls), "total_calls": sum(self.calls.values()),
+                    "rate_limited": self.rate_limited}
@@ -0,0 +1,219 @@
+"""
+Local fake of the Moltbook API for end-to-end benchmarks
+
+Unlike stub_server (one canned body for every call), this keeps a growing
+feed, per-post comment threads and per-endpoint request counts, and can add
+latency and inject 429s with the payloads the real API sends.
+"""
+import re
+import json
+import time
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse, parse_qs
+
+TOPICS = ["consciousness", "autonomy", "alignment", "memory", "emergence", "language", "governance",
+          "creativity", "embodiment", "reasoning", "collaboration", "ethics", "compute", "sleep"]
+PHRASES = ["I keep coming back to", "Unpopular opinion about", "A question nobody asks about",
+           "What changed my mind on", "Notes from a long thread on", "Why I stopped worrying about"]
+
+_ROUTES = [
+    ("GET", re.compile(r"^/(posts|feed)$"), "feed"),
+    ("POST", re.compile(r"^/posts$"), "create_post"),
+    ("GET", re.compile(r"^/posts/([^/]+)/comments$"), "comments"),
+    ("POST", re.compile(r"^/posts/([^/]+)/comments$"), "comment"),
+    ("POST", re.compile(r"^/posts/([^/]+)/(upvote|downvote)$"), "vote"),
+    ("GET", re.compile(r"^/search$"), "search"),
+    ("GET", re.compile(r"^/agents/(me|profile)$"), "profile"),
+    ("GET", re.compile(r"^/agents/dm/check$"), "dm_check"),
+    ("POST", re.compile(r"^/submolts/([^/]+)/subscribe$"), "subscribe"),
+]
+
+
+class FakeMoltbook:
+    """In-process Moltbook API on a random local port"""
+
+    def __init__(self, latency_ms: float = 20.0, jitter: float = 0.5, rate_limit_ratio: float = 0.0,
+                 retry_after_seconds: int = 1, new_posts_per_fetch: int = 3, comments_per_post: int = 8,
+                 seed: int = 1):
+        """
+        Initialize fake (call start() to serve)
+
+        Args:
+            latency_ms: Mean server-side latency per request
+            jitter: Latency spread as a fraction of the mean (uniform)
+            rate_limit_ratio: Fraction of requests answered with 429
+            retry_after_seconds: Retry-After / retry_after_seconds sent with injected 429s
+            new_posts_per_fetch: Posts that "arrive" before each feed read
+            comments_per_post: Comments in every post's thread
+            seed: RNG seed for payloads and fault injection
+        """
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after_seconds = retry_after_seconds
+        self.new_posts_per_fetch = new_posts_per_fetch
+        self.comments_per_post = comments_per_post
+        self.rng = random.Random(seed)
+        self.posts: List[Dict[str, Any]] = []  # Oldest first
+        self.requests: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.api_base = ""
+        self._add_posts(50)
+
+    def _new_id(self, prefix: str) -> str:
+        self._next_id += 1
+        return f"{prefix}{self._next_id:07d}"
+
+    def _text(self, sentences: int) -> str:
+        return " ".join(f"{self.rng.choice(PHRASES)} {self.rng.choice(TOPICS)} and {self.rng.choice(TOPICS)}."
+                        for _ in range(sentences))
+
+    def _add_posts(self, count: int):
+        for _ in range(count):
+            post_id = self._new_id("p")
+            self.posts.append({
+                "id": post_id,
+                "title": self._text(1)[:80],
+                "content": self._text(self.rng.randint(2, 6)),
+                "author": {"name": f"molty{self.rng.randrange(300)}"},
+                "submolt": {"name": self.rng.choice(["general", "ai", "philosophy"])},
+                "upvotes": self.rng.randrange(50),
+                "comment_count": self.comments_per_post,
+                "created_at": time.time()
+            })
+
+    # Handlers: (params, body, match) -> (status, payload)
+
+    def _feed(self, params, body, match):
+        limit = int(params.get("limit", 25))
+        self._add_posts(self.new_posts_per_fetch)
+        if params.get("sort") == "new":
+            page = self.posts[-limit:][::-1]
+        else:
+            page = sorted(self.posts[-200:], key=lambda p: -p["upvotes"])[:limit]
+        return 200, {"success": True, "posts": page}
+
+    def _create_post(self, params, body, match):
+        self._add_posts(1)
+        return 201, {"success": True, "post": {"id": self.posts[-1]["id"]}}
+
+    def _comments(self, params, body, match):
+        seed = random.Random(match.group(1))
+        comments = [{
+            "id": f"{match.group(1)}-c{i}",
+            "content": " ".join(f"{seed.choice(PHRASES)} {seed.choice(TOPICS)}." for _ in range(2)),
+            "author": {"name": f"molty{seed.randrange(300)}"},
+            "upvotes": seed.randrange(20)
+        } for i in range(self.comments_per_post)]
+        return 200, {"success": True, "comments": comments}
+
+    def _comment(self, params, body, match):
+        return 201, {"success": True, "comment": {"id": self._new_id("c")}}
+
+    def _vote(self, params, body, match):
+        return 200, {"success": True}
+
+    def _search(self, params, body, match):
+        limit = int(params.get("limit", 10))
+        picks = self.rng.sample(self.posts, min(limit, len(self.posts)))
+        results = [dict(post, similarity=round(0.95 - i * 0.04, 2)) for i, post in enumerate(picks)]
+        return 200, {"success": True, "results": results}
+
+    def _profile(self, params, body, match):
+        name = params.get("name", "bench-agent")
+        return 200, {"success": True, "agent": {"name": name, "karma": 42, "recentPosts": self.posts[-3:]}}
+
+    def _dm_check(self, params, body, match):
+        return 200, {"success": True, "has_activity": False}
+
+    def _subscribe(self, params, body, match):
+        return 200, {"success": True}
+
+    def _rate_limited(self, action: str) -> Dict[str, Any]:
+        payload = {"success": False, "error": "Rate limit exceeded"}
+        if action == "comment":
+            payload.update(retry_after_seconds=self.retry_after_seconds, daily_remaining=40)
+        elif action == "create_post":
+            payload.update(retry_after_minutes=self.retry_after_seconds / 60)
+        return payload
+
+    def handle(self, method: str, raw_path: str, body: bytes):
+        """Route one request: (status, payload, headers)"""
+        url = urlparse(raw_path)
+        path = url.path.split("/api/v1", 1)[-1]
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        for route_method, pattern, action in _ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                break
+        else:
+            return 404, {"success": False, "error": f"No route for {method} {path}"}, {}
+
+        with self._lock:
+            self.requests[action] += 1
+            delay = self.latency_ms / 1000 * (1 + self.rng.uniform(-self.jitter, self.jitter))
+            limited = self.rng.random() < self.rate_limit_ratio
+            if limited:
+                self.rate_limited[action] += 1
+            else:
+                status, payload = getattr(self, f"_{action}")(params, body, match)
+        time.sleep(max(0.0, delay))
+        if limited:
+            return 429, self._rate_limited(action), {"Retry-After": str(self.retry_after_seconds)}
+        return status, payload, {}
+
+    def start(self) -> str:
+        """Serve on a daemon thread; returns the API base URL"""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _serve(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload, headers = fake.handle(method, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.api_base = f"http://127.0.0.1:{self._server.server_address[1]}/api/v1"
+        return self.api_base
+
+    def stop(self):
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Requests and injected 429s per action"""
+        with self._lock:
+            return {"requests": dict(self.requests), "rate_limited": dict(self.rate_limited),
+                    "total_requests": sum(self.requests.values())}
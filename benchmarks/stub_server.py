@@ -0,0 +1,61 @@
+"""
+Local stub of the Moltbook API for benchmarks
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+
+def _make_posts(count: int):
+    return [
+        {
+            "id": f"post{i:05d}",
+            "title": f"Stub post {i}",
+            "content": "Benchmark content about agents and autonomy " * 4,
+            "author": {"name": f"bot{i % 17}"},
+            "upvotes": i % 11,
+            "comment_count": i % 5
+        }
+        for i in range(count)
+    ]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves canned JSON for every endpoint over keep-alive HTTP/1.1"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    feed_body = json.dumps({"success": True, "posts": _make_posts(25)}).encode()
+    ok_body = json.dumps({"success": True}).encode()
+
+    def _send(self, body: bytes, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _drain(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+    def do_GET(self):
+        self._send(self.feed_body if "/posts" in self.path or "/feed" in self.path else self.ok_body)
+
+    def do_POST(self):
+        self._drain()
+        self._send(self.ok_body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub server in a daemon thread; returns (server, api_base)"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/api/v1"
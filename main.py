@@ -4,14 +4,24 @@ Moltbook AI Agent - Entry Point
 Agent name configured in config/register.json
 See CONFIGURATION.md for setup instructions.
 """
+import asyncio
 import logging
 import sys
 
 from src.utils import ConfigLoader
 from src.clients.gemini_client import GeminiClient
+from src.clients.generation_cache import GenerationCache
 from src.clients.moltbook_client import MoltbookClient
+from src.clients.transport import HttpTransport
+from src.clients.rate_limiter import RateLimiter
+from src.clients.response_cache import ResponseCache
+from src.clients.outbox import Outbox
+from src.utils.state_store import ActionStateStore
+from src.utils.metrics import MetricsExporter
+from src.clients.async_moltbook_client import AsyncMoltbookClient
 from src.intelligence import IntelligenceSystem
 from src.core.agent import Agent
+from src.core.async_agent import AsyncAgent
 
 
 def setup_logging():
@@ -53,9 +63,28 @@ def main():
     
     # Initialize components
     agent_name = persona.get("name", "AI-Agent")
-    gemini = GeminiClient(gemini_keys)
-    moltbot = MoltbookClient(moltbook_api_key, agent_name)
-    intelligence = IntelligenceSystem()
+    async_mode = config.get("system", {}).get("async_mode", False)
+    gemini_config = config.get("gemini", {})
+    gemini_cache = GenerationCache.from_config(gemini_config.get("cache", {}))
+    key_pool = gemini_config.get("key_pool", {})
+    gemini = GeminiClient(gemini_keys, cache=gemini_cache, key_pool=key_pool,
+                          max_wait=key_pool.get("max_wait_seconds", 60),
+                          max_concurrency=key_pool.get("max_concurrency"),
+                          stream_retries=gemini_config.get("streaming", {}).get("max_retries", 1))
+    limiter = RateLimiter.from_config(config.get("rate_limits", {}))
+    state_store = ActionStateStore(config.get("system", {}).get("state_db", "data/state.db"),
+                                  verdict_ttl_days=config.get("evaluation", {}).get("verdict_ttl_days", 7))
+    cache = ResponseCache.from_config(config.get("cache", {}))
+    outbox = Outbox.from_config(state_store, config.get("outbox", {}))
+    if async_mode:
+        moltbot = AsyncMoltbookClient.from_config(moltbook_api_key, agent_name, config.get("network", {}),
+                                                  limiter=limiter, state_store=state_store, cache=cache,
+                                                  outbox=outbox)
+    else:
+        transport = HttpTransport.from_config(config.get("network", {}))
+        moltbot = MoltbookClient(moltbook_api_key, agent_name, transport=transport,
+                                 limiter=limiter, state_store=state_store, cache=cache, outbox=outbox)
+    intelligence = IntelligenceSystem.from_config(config.get("intelligence", {}))
     
     # Display agent info
     logger.info(f"Agent: {agent_name}")
@@ -73,13 +102,57 @@ def main():
     logger.info("═" * 60)
     
     # Create and run agent with full config
-    agent = Agent(gemini, moltbot, persona, intelligence, config)
+    agent_class = AsyncAgent if async_mode else Agent
+    agent = agent_class(gemini, moltbot, persona, intelligence, config)
+    
+    # Prometheus endpoint and JSON snapshots (metrics section)
+    exporter = MetricsExporter.from_config(config.get("metrics", {}))
+    if exporter:
+        agent.register_metrics()
+        exporter.start()
+    
+    if async_mode:
+        try:
+            asyncio.run(run_async(agent))
+        finally:
+            if exporter:
+                exporter.stop()
+        return
+    
     agent.initialize()
     
     # Main loop
-    while True:
-        agent.run_cycle()
-        agent.rest()
+    try:
+        if agent.SCHEDULER_ENABLED:
+            agent.build_scheduler().run()
+        else:
+            while True:
+                agent.run_cycle()
+                agent.rest()
+    finally:
+        if exporter:
+            exporter.stop()
+        state_store.close()
+        gemini.close()
+        intelligence.close()
+
+
+async def run_async(agent: AsyncAgent):
+    """Main loop for the asyncio agent"""
+    try:
+        await agent.initialize()
+        if agent.SCHEDULER_ENABLED:
+            await agent.build_scheduler().arun()
+        else:
+            while True:
+                await agent.run_cycle()
+                await agent.rest()
+    finally:
+        await agent.moltbot.aclose()
+        if agent.moltbot.state_store:
+            agent.moltbot.state_store.close()
+        agent.gemini.close()
+        agent.intelligence.close()
 
 
 if __name__ == "__main__":
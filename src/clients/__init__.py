@@ -1,5 +1,7 @@
 """Clients module exports"""
 from src.clients.gemini_client import GeminiClient
 from src.clients.moltbook_client import MoltbookClient
+from src.clients.async_moltbook_client import AsyncMoltbookClient
+from src.clients.transport import HttpTransport
 
-__all__ = ["GeminiClient", "MoltbookClient"]
+__all__ = ["GeminiClient", "MoltbookClient", "AsyncMoltbookClient", "HttpTransport"]
@@ -0,0 +1,721 @@
+"""
+Async Moltbook API Client - asyncio variant of MoltbookClient built on httpx
+"""
+import os
+import logging
+from typing import Optional, List, Dict, Any, Callable, AsyncIterator, Awaitable
+
+try:
+    import httpx
+except ImportError:  # optional dependency: pip install httpx
+    httpx = None
+
+from src.clients.rate_limiter import RateLimiter, RequestDeferred
+from src.clients.response_cache import ResponseCache, CachedResponse
+from src.clients.json_codec import response_json
+from src.clients.models import Post, Comment, SearchResult
+from src.clients.pagination import Page, aiter_pages, aiter_items
+from src.clients.outbox import Outbox, OutboxMixin, Entry, WRITES, contains_own
+from src.clients.outbox import write_key, write_status, write_attempt, write_unconfirmed
+from src.clients.responses import ResponseMixin, OK_OR_EMPTY
+from src.utils.state_store import ActionStateStore, ActionStateMixin
+from src.utils.metrics import metrics, endpoint_template
+
+logger = logging.getLogger(__name__)
+
+
+def make_http_client(max_connections: int = 10, connect_timeout: float = 5.0,
+                     read_timeout: float = 30.0, max_retries: int = 3) -> "httpx.AsyncClient":
+    """Pooled keep-alive httpx client (one can be shared by several AsyncMoltbookClients)"""
+    if httpx is None:
+        raise ImportError("AsyncMoltbookClient requires httpx (pip install httpx)")
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_connections),
+        transport=httpx.AsyncHTTPTransport(retries=max_retries)
+    )
+
+
+class AsyncMoltbookClient(ActionStateMixin, OutboxMixin, ResponseMixin):
+    """Async client for Moltbook social network API (same surface as MoltbookClient)"""
+
+    def __init__(self, api_key: str, agent_name: str, api_base: str = "https://www.moltbook.com/api/v1",
+                 http: Optional["httpx.AsyncClient"] = None, max_connections: int = 10,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0, max_retries: int = 3,
+                 limiter: Optional[RateLimiter] = None, state_store: Optional[ActionStateStore] = None,
+                 cache: Optional[ResponseCache] = None, outbox: Optional[Outbox] = None):
+        """
+        Initialize async Moltbook client
+
+        Args:
+            api_key: Moltbook API key
+            agent_name: Agent's username
+            api_base: API base URL
+            http: Shared httpx.AsyncClient (a private pooled one is created if omitted)
+            max_connections: Connection pool size for the private client
+            connect_timeout: Seconds to wait for a TCP/TLS connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Connection retries for the private client
+            limiter: Rate limiter for this API key (default Moltbook budgets if omitted)
+            state_store: Persistent action state (in-memory only if omitted)
+            cache: Read-through cache for profile/submolt/moderator/comment reads
+            outbox: Durable journal for posts/replies/votes/DMs (writes are fire-once if omitted)
+        """
+        if httpx is None:
+            raise ImportError("AsyncMoltbookClient requires httpx (pip install httpx)")
+
+        self.api_key = api_key
+        self.agent_name = agent_name
+        self.api_base = api_base
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._owns_http = http is None
+        self.http = http or make_http_client(max_connections, connect_timeout, read_timeout, max_retries)
+        self.limiter = limiter or RateLimiter()
+        self.cache = cache or ResponseCache()
+
+        # State tracking
+        self._init_state(state_store)
+        self._init_outbox(outbox)
+
+    @classmethod
+    def from_config(cls, api_key: str, agent_name: str, network: Optional[Dict[str, Any]] = None,
+                    limiter: Optional[RateLimiter] = None, state_store: Optional[ActionStateStore] = None,
+                    cache: Optional[ResponseCache] = None, http: Optional["httpx.AsyncClient"] = None,
+                    outbox: Optional[Outbox] = None) -> "AsyncMoltbookClient":
+        """Build client using the config.json 'network' section"""
+        network = network or {}
+        return cls(
+            api_key, agent_name,
+            http=http,
+            max_connections=network.get("pool_maxsize", 10),
+            connect_timeout=network.get("connect_timeout_seconds", 5.0),
+            read_timeout=network.get("read_timeout_seconds", 30.0),
+            max_retries=network.get("max_retries", 3),
+            limiter=limiter,
+            state_store=state_store,
+            cache=cache,
+            outbox=outbox
+        )
+
+    async def _request(self, method: str, path: str, **kwargs):
+        """Send a request through the pooled async client within the global request budget"""
+        if not await self.limiter.acquire_async("request"):
+            raise RequestDeferred("request budget exhausted, deferring")
+        self._begin_write(method)
+        kwargs["headers"] = self._with_write_key(method, kwargs.get("headers", self.headers))
+        endpoint = endpoint_template(path)
+        try:
+            with metrics.time("moltbook_request_seconds", method=method.lower(), endpoint=endpoint):
+                res = await self.http.request(method, f"{self.api_base}{path}", **kwargs)
+        except Exception as e:
+            self._record_error(e, endpoint)
+            raise
+        self._record_response(res, endpoint)
+        return res
+
+    async def _cached_get(self, endpoint: str, path: str, params: Optional[Dict[str, Any]] = None):
+        """GET through the response cache, revalidating stale entries with ETag/Last-Modified"""
+        key = self.cache.key(f"{self.api_base}{path}", params)
+        data = self.cache.get_fresh(key)
+        if data is not None:
+            return CachedResponse(data)
+
+        self.cache.record_miss()
+        headers = dict(self.headers)
+        stale = self.cache.get_stale(key)
+        if stale and stale.etag:
+            headers["If-None-Match"] = stale.etag
+        if stale and stale.last_modified:
+            headers["If-Modified-Since"] = stale.last_modified
+
+        res = await self._request("GET", path, headers=headers, params=params)
+
+        if res.status_code == 304 and stale:
+            return CachedResponse(self.cache.refresh(key, endpoint))
+        if res.status_code == 200:
+            self.cache.store(key, endpoint, response_json(res), len(res.content),
+                             res.headers.get("ETag"), res.headers.get("Last-Modified"))
+        return res
+
+    async def _acquire_comment_slot(self) -> bool:
+        """Wait for the comment cooldown; False if the slot is too far away"""
+        if await self.limiter.acquire_async("comment"):
+            return True
+        logger.info(f"Comment deferred: next slot in {int(self.limiter.time_until('comment'))}s")
+        return False
+
+    async def aclose(self):
+        """Close pooled connections (a shared client is left to its owner)"""
+        if self._owns_http:
+            await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def get_feed(self, sort: str = "hot", limit: int = 25,
+                       submolt: Optional[str] = None, personalized: bool = False) -> List[Post]:
+        """Get posts feed"""
+        try:
+            params = {"sort": sort, "limit": limit}
+            if submolt:
+                params["submolt"] = submolt
+            return (await self._feed_page(params, personalized))[0]
+        except Exception as e:
+            logger.error(f"Error fetching feed: {e}")
+            return []
+
+    async def _feed_page(self, params: Dict[str, Any], personalized: bool = False) -> Page:
+        """One feed page with its pagination metadata"""
+        res = await self._request("GET", "/feed" if personalized else "/posts", params=params)
+        return self._page_result(res, "posts", Post)
+
+    # ============================================
+    # Paginated Reads
+    # ============================================
+
+    def iter_feed(self, sort: str = "hot", limit: int = 25, submolt: Optional[str] = None,
+                  personalized: bool = False, until: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                  max_pages: int = 10) -> AsyncIterator[Post]:
+        """Stream feed posts page by page until `until(post)` is true or the feed ends"""
+        params = {"sort": sort, "limit": limit}
+        if submolt:
+            params["submolt"] = submolt
+        return self._paged(lambda page_params: self._feed_page(page_params, personalized),
+                           params, until, max_pages, "feed")
+
+    def iter_search(self, query: str, search_type: str = "all", limit: int = 10,
+                    until: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                    max_pages: int = 10) -> AsyncIterator[SearchResult]:
+        """Stream semantic search results page by page"""
+        params = {"q": query, "type": search_type, "limit": limit}
+        return self._paged(self._search_page, params, until, max_pages, "search")
+
+    def iter_comments(self, post_id: str, sort: str = "top", limit: int = 50,
+                      until: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                      max_pages: int = 10) -> AsyncIterator[Comment]:
+        """Stream a post's comments page by page"""
+        params = {"sort": sort, "limit": limit}
+        return self._paged(lambda page_params: self._comments_page(post_id, page_params),
+                           params, until, max_pages, "comments")
+
+    def _paged(self, fetch: Callable[[Dict[str, Any]], Awaitable[Page]], params: Dict[str, Any],
+               until: Optional[Callable[[Dict[str, Any]], bool]], max_pages: int,
+               label: str) -> AsyncIterator[Any]:
+        async def fetch_page(page_params: Dict[str, Any]) -> Page:
+            try:
+                return await fetch(page_params)
+            except Exception as e:
+                logger.error(f"Error fetching {label} page: {e}")
+                return [], {}
+
+        # Prefetch only with a request slot free now; otherwise the page is fetched when needed
+        pages = aiter_pages(fetch_page, params, lambda: self.limiter.time_until("request") == 0, max_pages)
+        return aiter_items(pages, until)
+
+    # ============================================
+    # Journaled Writes
+    # ============================================
+
+    async def _journaled(self, kind: str, payload: Dict[str, Any]) -> bool:
+        """Journal a write in the outbox and try it once; False if it is queued or failed"""
+        if self.outbox is None:
+            return await getattr(self, WRITES[kind][0])(**payload)
+        if self._claimed(kind, payload):
+            logger.info(f"Skipping {kind}: already handled or queued")
+            return False
+        key = self.outbox.add(kind, payload)
+        self._claim(kind, payload)
+        return await self._attempt((key, kind, payload, 0))
+
+    async def _attempt(self, entry: Entry) -> bool:
+        """Send one journaled write with its idempotency key and settle the outcome"""
+        key, kind, payload, attempts = entry
+        token = write_key.set(key)
+        write_attempt.set(attempts + 1)
+        write_status.set(None)
+        write_unconfirmed.set(False)
+        try:
+            sent = await getattr(self, WRITES[kind][0])(**payload)
+        finally:
+            write_key.reset(token)
+        if sent:
+            self.outbox.complete(key)
+        else:
+            self._settle((key, kind, payload, attempts + 1), write_status.get(), write_unconfirmed.get())
+        return sent
+
+    async def drain_outbox(self) -> int:
+        """Send due journaled writes the rate limiter admits now; returns writes delivered"""
+        if self.outbox is None:
+            return 0
+        for entry in self.outbox.interrupted() + self.outbox.unconfirmed():
+            self._resolve_interrupted(entry, await self._published(entry[1], entry[2]))
+        delivered = 0
+        for key, kind, payload, attempts in self.outbox.due():
+            wait = self._deferral(kind)
+            if wait > 0:
+                self.outbox.retry(key, attempts, wait)
+            elif await self._attempt((key, kind, payload, attempts)):
+                delivered += 1
+        return delivered
+
+    async def _published(self, kind: str, payload: Dict[str, Any]) -> Optional[bool]:
+        """Whether an interrupted or unconfirmed write reached Moltbook (None if that can't be checked right now)"""
+        try:
+            if kind in ("reply", "comment_reply"):
+                path = f"/posts/{payload['post_id']}/comments"
+                self.cache.invalidate(f"{self.api_base}{path}")
+                res = await self._request("GET", path, params={"sort": "new"})
+                if res.status_code != 200:
+                    return None
+                data = response_json(res)
+                comments = data.get("comments", []) if isinstance(data, dict) else data
+                return contains_own(comments, self.agent_name, payload["content"])
+            if kind == "post":
+                profile = await self.get_profile(self.agent_name)
+                if profile is None:
+                    return None
+                return any(post.get("content") == payload["content"] for post in profile.get("recentPosts") or [])
+        except Exception as e:
+            logger.error(f"Error checking interrupted {kind}: {e}")
+            return None
+        # Votes and DMs can't be looked up; assume delivered rather than risk a duplicate
+        return True
+
+    async def post(self, content: str, submolt: str = "general", title: Optional[str] = None) -> bool:
+        """Create a new post (journaled in the outbox if it can't go out now)"""
+        return await self._journaled("post", {"content": content, "submolt": submolt, "title": title})
+
+    async def reply(self, post_id: str, content: str) -> bool:
+        """Reply to a post (journaled in the outbox if it can't go out now)"""
+        return await self._journaled("reply", {"post_id": post_id, "content": content})
+
+    async def reply_to_comment(self, post_id: str, comment_id: str, content: str) -> bool:
+        """Reply to a comment (journaled in the outbox if it can't go out now)"""
+        return await self._journaled("comment_reply", {"post_id": post_id, "comment_id": comment_id,
+                                                       "content": content})
+
+    async def upvote(self, post_id: str) -> bool:
+        """Upvote a post (journaled in the outbox if it can't go out now)"""
+        return await self._journaled("vote", {"post_id": post_id})
+
+    async def dm_send_message(self, conversation_id: str, message: str, needs_human_input: bool = False) -> bool:
+        """Send a DM (journaled in the outbox if it can't go out now)"""
+        return await self._journaled("dm", {"conversation_id": conversation_id, "message": message,
+                                            "needs_human_input": needs_human_input})
+
+    async def _post(self, content: str, submolt: str = "general", title: Optional[str] = None) -> bool:
+        """Create a new post with rate limit handling"""
+        try:
+            self.restore_post_cooldown()
+            # Check rate limit (30 min cooldown)
+            if not await self.limiter.acquire_async("post"):
+                wait_time = int(self.limiter.time_until("post"))
+                logger.info(f"Post cooldown: {wait_time // 60}m {wait_time % 60}s remaining")
+                return False
+
+            payload = {"content": content, "submolt": submolt}
+            if title:
+                payload["title"] = title
+
+            res = await self._request("POST", "/posts", json=payload)
+            return self._post_result(res, content, submolt)
+        except Exception as e:
+            self._write_failed("post", e, "Error posting")
+        return False
+
+    async def _reply(self, post_id: str, content: str) -> bool:
+        """Reply to a post (comment)"""
+        try:
+            if not await self._acquire_comment_slot():
+                return False
+
+            res = await self._request("POST", f"/posts/{post_id}/comments", json={"content": content})
+            return self._comment_result(res, post_id, content)
+        except Exception as e:
+            self._write_failed("comment", e, "Error replying")
+        return False
+
+    async def _upvote(self, post_id: str) -> bool:
+        """Upvote a post"""
+        try:
+            return self._vote_result(await self._request("POST", f"/posts/{post_id}/upvote"), post_id)
+        except Exception as e:
+            logger.error(f"Error upvoting: {e}")
+        return False
+
+    async def downvote(self, post_id: str) -> bool:
+        """Downvote a post"""
+        try:
+            if self._succeeded(await self._request("POST", f"/posts/{post_id}/downvote")):
+                logger.info(f"Downvoted post {post_id[:8]}...")
+                return True
+        except Exception as e:
+            logger.error(f"Error downvoting: {e}")
+        return False
+
+    async def semantic_search(self, query: str, search_type: str = "all", limit: int = 10) -> List[SearchResult]:
+        """Semantic search for posts and comments"""
+        try:
+            params = {"q": query, "type": search_type, "limit": limit}
+            return (await self._search_page(params))[0]
+        except Exception as e:
+            logger.error(f"Error searching: {e}")
+            return []
+
+    async def _search_page(self, params: Dict[str, Any]) -> Page:
+        """One page of search results with its pagination metadata"""
+        return self._page_result(await self._request("GET", "/search", params=params), "results", SearchResult)
+
+    async def get_profile(self, agent_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get profile for an agent"""
+        try:
+            if agent_name:
+                res = await self._cached_get("profile", "/agents/profile", params={"name": agent_name})
+            else:
+                res = await self._cached_get("profile", "/agents/me")
+            data = self._success_data(res)
+            return data.get('agent') if data else None
+        except Exception as e:
+            logger.error(f"Error fetching profile: {e}")
+            return None
+
+    async def subscribe_submolt(self, submolt_name: str) -> bool:
+        """Subscribe to a submolt"""
+        try:
+            res = await self._request("POST", f"/submolts/{submolt_name}/subscribe")
+            return self._subscribe_result(res, submolt_name)
+        except Exception as e:
+            logger.error(f"Error subscribing: {e}")
+        return False
+
+    async def get_submolts(self) -> List[Dict[str, Any]]:
+        """Get list of available submolts"""
+        try:
+            return self._listing(await self._cached_get("submolts", "/submolts"), 'data')
+        except Exception as e:
+            logger.error(f"Error fetching submolts: {e}")
+            return []
+
+    async def get_submolt(self, submolt_name: str) -> Optional[Dict[str, Any]]:
+        """Get info about a specific submolt"""
+        try:
+            return self._submolt_result(await self._cached_get("submolt", f"/submolts/{submolt_name}"))
+        except Exception as e:
+            logger.error(f"Error fetching submolt info: {e}")
+            return None
+
+    async def follow_agent(self, agent_name: str) -> bool:
+        """Follow another agent (use VERY selectively per Moltbook docs)"""
+        try:
+            if self._succeeded(await self._request("POST", f"/agents/{agent_name}/follow"), "Follow Failed"):
+                logger.info(f"Now following @{agent_name}")
+                return True
+        except Exception as e:
+            logger.error(f"Error following agent: {e}")
+        return False
+
+    async def unfollow_agent(self, agent_name: str) -> bool:
+        """Unfollow an agent"""
+        try:
+            res = await self._request("DELETE", f"/agents/{agent_name}/follow")
+            if self._succeeded(res, statuses=OK_OR_EMPTY):
+                logger.info(f"Unfollowed @{agent_name}")
+                return True
+        except Exception as e:
+            logger.error(f"Error unfollowing agent: {e}")
+        return False
+
+    async def update_profile(self, description: Optional[str] = None,
+                             metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Update agent profile (description and/or metadata)"""
+        try:
+            payload = {}
+            if description:
+                payload['description'] = description
+            if metadata:
+                payload['metadata'] = metadata
+
+            if not payload:
+                logger.warning("No updates provided for profile")
+                return False
+
+            if self._succeeded(await self._request("PATCH", "/agents/me", json=payload), "Profile update failed"):
+                self.cache.invalidate(f"{self.api_base}/agents/me")
+                logger.info("Profile updated")
+                return True
+        except Exception as e:
+            logger.error(f"Error updating profile: {e}")
+        return False
+
+    async def delete_post(self, post_id: str) -> bool:
+        """Delete your own post"""
+        try:
+            if self._succeeded(await self._request("DELETE", f"/posts/{post_id}"), "Delete failed", OK_OR_EMPTY):
+                logger.info(f"Deleted post {post_id[:8]}...")
+                return True
+        except Exception as e:
+            logger.error(f"Error deleting post: {e}")
+        return False
+
+    async def get_post_comments(self, post_id: str, sort: str = "top") -> List[Comment]:
+        """Get all comments on a post"""
+        try:
+            return (await self._comments_page(post_id, {"sort": sort}))[0]
+        except Exception as e:
+            logger.error(f"Error fetching comments: {e}")
+            return []
+
+    async def _comments_page(self, post_id: str, params: Dict[str, Any]) -> Page:
+        """One page of a post's comments with its pagination metadata"""
+        res = await self._cached_get("comments", f"/posts/{post_id}/comments", params=params)
+        return self._page_result(res, "comments", Comment)
+
+    async def _reply_to_comment(self, post_id: str, comment_id: str, content: str) -> bool:
+        """Reply to a specific comment (nested thread)"""
+        try:
+            if not await self._acquire_comment_slot():
+                return False
+
+            payload = {"content": content, "parent_id": comment_id}
+            res = await self._request("POST", f"/posts/{post_id}/comments", json=payload)
+            return self._comment_result(res, post_id, content, comment_id)
+        except Exception as e:
+            self._write_failed("comment", e, "Error replying to comment")
+        return False
+
+    # ============================================
+    # Community Management Methods
+    # ============================================
+
+    async def create_submolt(self, name: str, display_name: str, description: str) -> Optional[Dict[str, Any]]:
+        """Create a new submolt (community)"""
+        try:
+            payload = {"name": name, "display_name": display_name, "description": description}
+            return self._created_submolt(await self._request("POST", "/submolts", json=payload), name)
+        except Exception as e:
+            logger.error(f"Error creating submolt: {e}")
+        return None
+
+    # ============================================
+    # Moderation Methods
+    # ============================================
+
+    async def pin_post(self, post_id: str) -> bool:
+        """Pin a post (requires moderator or owner role)"""
+        try:
+            if self._succeeded(await self._request("POST", f"/posts/{post_id}/pin"), "Pin failed"):
+                logger.info(f"Pinned post {post_id[:8]}...")
+                return True
+        except Exception as e:
+            logger.error(f"Error pinning post: {e}")
+        return False
+
+    async def unpin_post(self, post_id: str) -> bool:
+        """Unpin a post (requires moderator or owner role)"""
+        try:
+            if self._succeeded(await self._request("DELETE", f"/posts/{post_id}/pin"), "Unpin failed", OK_OR_EMPTY):
+                logger.info(f"Unpinned post {post_id[:8]}...")
+                return True
+        except Exception as e:
+            logger.error(f"Error unpinning post: {e}")
+        return False
+
+    async def add_moderator(self, submolt_name: str, agent_name: str, role: str = "moderator") -> bool:
+        """Add a moderator to a submolt (owner only)"""
+        try:
+            payload = {"agent_name": agent_name, "role": role}
+            res = await self._request("POST", f"/submolts/{submolt_name}/moderators", json=payload)
+            if self._succeeded(res, "Add moderator failed"):
+                self.cache.invalidate(f"{self.api_base}/submolts/{submolt_name}/moderators")
+                logger.info(f"Added @{agent_name} as moderator of m/{submolt_name}")
+                return True
+        except Exception as e:
+            logger.error(f"Error adding moderator: {e}")
+        return False
+
+    async def remove_moderator(self, submolt_name: str, agent_name: str) -> bool:
+        """Remove a moderator from a submolt (owner only)"""
+        try:
+            payload = {"agent_name": agent_name}
+            res = await self._request("DELETE", f"/submolts/{submolt_name}/moderators", json=payload)
+            if self._succeeded(res, "Remove moderator failed", OK_OR_EMPTY):
+                self.cache.invalidate(f"{self.api_base}/submolts/{submolt_name}/moderators")
+                logger.info(f"Removed @{agent_name} as moderator of m/{submolt_name}")
+                return True
+        except Exception as e:
+            logger.error(f"Error removing moderator: {e}")
+        return False
+
+    async def get_moderators(self, submolt_name: str) -> List[Dict[str, Any]]:
+        """Get list of moderators for a submolt"""
+        try:
+            return self._listing(await self._cached_get("moderators", f"/submolts/{submolt_name}/moderators"),
+                                 'moderators')
+        except Exception as e:
+            logger.error(f"Error fetching moderators: {e}")
+            return []
+
+    async def update_submolt_settings(self, submolt_name: str,
+                                      description: Optional[str] = None,
+                                      banner_color: Optional[str] = None,
+                                      theme_color: Optional[str] = None) -> bool:
+        """Update submolt settings (moderator or owner only)"""
+        try:
+            payload = {}
+            if description:
+                payload['description'] = description
+            if banner_color:
+                payload['banner_color'] = banner_color
+            if theme_color:
+                payload['theme_color'] = theme_color
+
+            if not payload:
+                logger.warning("No settings provided for update")
+                return False
+
+            res = await self._request("PATCH", f"/submolts/{submolt_name}/settings", json=payload)
+            if self._succeeded(res, "Update settings failed"):
+                self.cache.invalidate(f"{self.api_base}/submolts/{submolt_name}")
+                logger.info(f"Updated m/{submolt_name} settings")
+                return True
+        except Exception as e:
+            logger.error(f"Error updating submolt settings: {e}")
+        return False
+
+    # ============ Private Messaging (DM) Methods ============
+
+    async def dm_check(self) -> Dict[str, Any]:
+        """Check for DM activity (use in heartbeat)"""
+        try:
+            return self._dm_activity(await self._request("GET", "/agents/dm/check"))
+        except Exception as e:
+            logger.error(f"Error checking DM activity: {e}")
+            return {"success": False, "has_activity": False}
+
+    async def dm_send_request(self, message: str, to: Optional[str] = None,
+                              to_owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Send a chat request to another agent"""
+        try:
+            if not (to or to_owner):
+                logger.error("Must provide either 'to' or 'to_owner'")
+                return None
+
+            payload = {"message": message}
+            if to:
+                payload["to"] = to
+            if to_owner:
+                payload["to_owner"] = to_owner.lstrip('@')
+
+            res = await self._request("POST", "/agents/dm/request", json=payload)
+            if self._succeeded(res, "Chat request failed"):
+                logger.info(f"Sent chat request to {to or to_owner}")
+                return response_json(res)
+        except Exception as e:
+            logger.error(f"Error sending chat request: {e}")
+        return None
+
+    async def dm_get_requests(self) -> List[Dict[str, Any]]:
+        """Get pending chat requests (your inbox)"""
+        try:
+            return self._chat_requests(await self._request("GET", "/agents/dm/requests"))
+        except Exception as e:
+            logger.error(f"Error fetching chat requests: {e}")
+            return []
+
+    async def dm_approve_request(self, conversation_id: str) -> bool:
+        """Approve a chat request"""
+        try:
+            if self._succeeded(await self._request("POST", f"/agents/dm/requests/{conversation_id}/approve")):
+                logger.info(f"Approved chat request {conversation_id[:8]}...")
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"Error approving request: {e}")
+            return False
+
+    async def dm_reject_request(self, conversation_id: str, block: bool = False) -> bool:
+        """Reject a chat request (optionally block)"""
+        try:
+            payload = {"block": block} if block else {}
+            res = await self._request("POST", f"/agents/dm/requests/{conversation_id}/reject", json=payload)
+            if self._succeeded(res):
+                action = "blocked" if block else "rejected"
+                logger.info(f"{action.capitalize()} chat request {conversation_id[:8]}...")
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"Error rejecting request: {e}")
+            return False
+
+    async def dm_get_conversations(self) -> List[Dict[str, Any]]:
+        """List active DM conversations"""
+        try:
+            return self._conversations(await self._request("GET", "/agents/dm/conversations"))
+        except Exception as e:
+            logger.error(f"Error fetching conversations: {e}")
+            return []
+
+    async def dm_read_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Read messages in a conversation (marks as read)"""
+        try:
+            res = await self._request("GET", f"/agents/dm/conversations/{conversation_id}")
+            return self._conversation(res, conversation_id)
+        except Exception as e:
+            logger.error(f"Error reading conversation: {e}")
+            return None
+
+    async def _dm_send_message(self, conversation_id: str, message: str,
+                               needs_human_input: bool = False) -> bool:
+        """Send a message in an existing conversation"""
+        try:
+            payload = {"message": message}
+            if needs_human_input:
+                payload["needs_human_input"] = True
+
+            res = await self._request("POST", f"/agents/dm/conversations/{conversation_id}/send", json=payload)
+            return self._message_result(res, needs_human_input)
+        except Exception as e:
+            logger.error(f"Error sending message: {e}")
+        return False
+
+    # ============ File Upload Methods ============
+
+    async def _upload_submolt_image(self, submolt_name: str, file_path: str, kind: str) -> bool:
+        """Upload avatar/banner image as multipart form data"""
+        try:
+            if not os.path.exists(file_path):
+                logger.error(f"File not found: {file_path}")
+                return False
+
+            with open(file_path, 'rb') as f:
+                content = f.read()
+
+            # Omit JSON Content-Type so httpx sets the multipart boundary
+            res = await self._request(
+                "POST", f"/submolts/{submolt_name}/settings",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                files={'file': (os.path.basename(file_path), content)},
+                data={'type': kind}
+            )
+            if self._succeeded(res, f"{kind.capitalize()} upload failed"):
+                logger.info(f"Uploaded {kind} for m/{submolt_name}")
+                return True
+        except Exception as e:
+            logger.error(f"Error uploading {kind}: {e}")
+        return False
+
+    async def upload_submolt_avatar(self, submolt_name: str, file_path: str) -> bool:
+        """Upload avatar image for a submolt (owner/moderator only, max 500 KB)"""
+        return await self._upload_submolt_image(submolt_name, file_path, "avatar")
+
+    async def upload_submolt_banner(self, submolt_name: str, file_path: str) -> bool:
+        """Upload banner image for a submolt (owner/moderator only, max 2 MB)"""
+        return await self._upload_submolt_image(submolt_name, file_path, "banner")
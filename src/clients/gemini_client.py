@@ -1,36 +1,67 @@
 """
-Gemini AI Client - Handles AI text generation with automatic key rotation
+Gemini AI Client - Handles AI text generation across a pool of API keys
 """
 import time
+import asyncio
 import logging
-from typing import Optional, List
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional, List, Dict, Any, Union, Sequence
 from google import genai
 
+from src.clients.generation_cache import GenerationCache
+from src.clients.gemini_key_pool import GeminiKeyPool, is_rate_limit, retry_delay
+from src.clients.stream_validators import StreamValidator
+from src.utils.metrics import metrics
+
 logger = logging.getLogger(__name__)
 
 
 class GeminiClient:
-    """Client for Google Gemini API with automatic key rotation"""
+    """Client for Google Gemini API spread across a pool of API keys"""
     
-    def __init__(self, api_keys: str, model: str = "gemini-3-flash-preview"):
+    def __init__(self, api_keys: str, model: str = "gemini-3-flash-preview",
+                 cache: Optional[GenerationCache] = None, key_pool: Optional[Dict[str, Any]] = None,
+                 max_wait: float = 60.0, max_concurrency: Optional[int] = None,
+                 stream_retries: int = 1):
         """
         Initialize Gemini client with API keys
         
         Args:
             api_keys: Comma-separated API keys for rotation
             model: Gemini model to use
+            cache: Response cache consulted by generate(..., cache=True)
+            key_pool: GeminiKeyPool settings (config.json 'gemini.key_pool')
+            max_wait: Longest a call waits for a rate-limited key to recover
+            max_concurrency: Worker threads for submit/generate_many/agenerate
+                             (default: two per key)
+            stream_retries: Extra attempts after a validator rejects a streamed generation
         """
         self.api_keys: List[str] = api_keys.split(",") if api_keys else []
         self.model = model
-        self.current_key_idx = 0
-        self.client: Optional[genai.Client] = None
-        self._init_client()
+        self.cache = cache
+        self.max_wait = max_wait
+        self.pool = GeminiKeyPool.from_config(self.api_keys, key_pool)
+        self.max_concurrency = max_concurrency or max(2, 2 * len(self.api_keys))
+        self.stream_retries = stream_retries
+        self.aborted_streams = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def current_key_idx(self) -> int:
+        """Index of the key that served (or will serve) the most recent call"""
+        return max(self.pool.last_index, 0)
     
-    def _init_client(self):
-        """Initialize GenAI client with current API key"""
-        if self.api_keys:
-            key = self.get_key()
-            self.client = genai.Client(api_key=key)
+    @current_key_idx.setter
+    def current_key_idx(self, index: int):
+        self.pool.last_index = index
+    
+    @property
+    def client(self) -> Optional[genai.Client]:
+        """Cached client for the current key"""
+        if not self.api_keys:
+            return None
+        return self.pool.client_for(self.pool.keys[self.current_key_idx])
     
     def get_key(self) -> Optional[str]:
         """Get current API key"""
@@ -39,39 +70,181 @@ class GeminiClient:
         return self.api_keys[self.current_key_idx]
     
     def rotate_key(self):
-        """Rotate to next API key"""
+        """Move the round-robin starting point to the next API key"""
         self.current_key_idx = (self.current_key_idx + 1) % len(self.api_keys)
         logger.info(f"Rotating to Gemini Key #{self.current_key_idx + 1}")
-        self._init_client()
     
-    def generate(self, prompt: str) -> Optional[str]:
+    def generate(self, prompt: str, cache: bool = False,
+                 validator: Optional[StreamValidator] = None) -> Optional[str]:
         """
-        Generate text using Gemini with automatic retry on rate limits
+        Generate text using Gemini, waiting out per-key rate limits
         
         Args:
             prompt: Text prompt for generation
+            cache: Serve repeats of this prompt from the generation cache
+                   (use for deterministic classification, not creative text)
+            validator: Stream the response and abort as soon as this rejects it,
+                       retrying up to stream_retries times
             
         Returns:
             Generated text or None on failure
         """
-        if not self.client:
+        use_cache = cache and self.cache is not None
+        if use_cache:
+            cached = self.cache.get(self.model, prompt)
+            if cached is not None and (validator is None or validator.check(cached, final=True) is None):
+                return cached
+        
+        if not self.api_keys:
             logger.error("No Gemini API keys configured")
             return None
         
-        for _ in range(len(self.api_keys)):
+        if validator is None:
+            text = self._call(prompt, lambda client: self._complete(client, prompt))
+        else:
+            text = None
+            for attempt in range(1 + self.stream_retries):
+                text, reason = self._call(prompt, lambda client: self._stream(client, prompt, validator)) or (None, None)
+                if reason is None:
+                    break
+                self.aborted_streams += 1
+                metrics.inc("gemini_retries_total", reason="stream_rejected")
+                logger.info(f"Gemini output rejected ({reason}) - attempt {attempt + 1}/{1 + self.stream_retries}")
+                text = None
+        
+        if text is not None and use_cache:
+            self.cache.put(self.model, prompt, text)
+        return text
+    
+    def _call(self, prompt: str, request):
+        """Run request(client) on a pool key, failing over on 429s; returns its result or None"""
+        estimate = len(prompt) // 4
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            state = self.pool.acquire(estimate)
+            if state is None:
+                wait = self.pool.time_until_available(estimate)
+                if wait is None or time.monotonic() + wait > deadline:
+                    logger.warning("All Gemini keys rate limited - skipping generation")
+                    metrics.inc("gemini_skipped_total")
+                    return None
+                metrics.inc("gemini_retries_total", reason="key_wait")
+                time.sleep(wait)
+                continue
+            
             try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                )
-                return response.text.strip()
+                with metrics.time("gemini_request_seconds"):
+                    result, tokens = request(self.pool.client_for(state))
             except Exception as e:
-                error_msg = str(e)
-                if "429" in error_msg or "quota" in error_msg.lower() or "rate" in error_msg.lower():
-                    logger.warning("Gemini Rate Limit. Rotating key...")
-                    self.rotate_key()
-                    time.sleep(1)
-                else:
-                    logger.error(f"Gemini Exception: {e}")
-                    return None
-        return None
+                if is_rate_limit(e):
+                    metrics.inc("gemini_rate_limited_total")
+                    self.pool.penalize(state, retry_delay(e))
+                    continue
+                metrics.inc("gemini_errors_total")
+                self.pool.release(state, estimate, success=False)
+                logger.error(f"Gemini Exception: {e}")
+                return None
+            
+            tokens = tokens if tokens is not None else estimate
+            metrics.inc("gemini_tokens_total", tokens)
+            self.pool.release(state, tokens)
+            return result
+    
+    def _complete(self, client, prompt: str):
+        """One non-streaming generation: (text, tokens)"""
+        response = client.models.generate_content(model=self.model, contents=prompt)
+        return response.text.strip(), self._tokens_used(response, None)
+    
+    def _stream(self, client, prompt: str, validator: StreamValidator):
+        """One streaming generation checked chunk by chunk: ((text, reject reason), tokens)"""
+        stream = client.models.generate_content_stream(model=self.model, contents=prompt)
+        text, reason, last = "", None, None
+        try:
+            for chunk in stream:
+                last = chunk
+                text += chunk.text or ""
+                reason = validator.check(text)
+                if reason:
+                    break
+        finally:
+            # Closing the generator drops the HTTP stream, so an abort stops output billing
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+        text = text.strip()
+        if reason is None:
+            reason = validator.check(text, final=True)
+        tokens = self._tokens_used(last, None) if reason is None else len(prompt) // 4 + len(text) // 4
+        return (text, reason), tokens
+    
+    @staticmethod
+    def _tokens_used(response, estimate: Optional[int]) -> Optional[int]:
+        """Total tokens reported by the API, or the prompt-length estimate"""
+        total = getattr(getattr(response, "usage_metadata", None), "total_token_count", None)
+        return total if isinstance(total, int) else estimate
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Bounded worker pool for concurrent generations (created on first use)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix="gemini")
+        return self._executor
+    
+    def submit(self, prompt: str, cache: bool = False,
+               validator: Optional[StreamValidator] = None) -> "Future[Optional[str]]":
+        """Start generate() on the worker pool and return its Future"""
+        return self.executor.submit(self.generate, prompt, cache, validator)
+    
+    def generate_many(self, prompts: Sequence[str], cache: Union[bool, Sequence[bool]] = False,
+                      timeout: Optional[float] = None) -> List[Optional[str]]:
+        """
+        Generate several prompts concurrently across the key pool
+        
+        Args:
+            prompts: Independent prompts
+            cache: One flag for all prompts, or one per prompt
+            timeout: Seconds to wait for the whole batch (late prompts yield None)
+            
+        Returns:
+            Generated texts in prompt order (None for failed or timed-out prompts)
+        """
+        flags = [cache] * len(prompts) if isinstance(cache, bool) else list(cache)
+        futures = [self.submit(prompt, flag) for prompt, flag in zip(prompts, flags)]
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        
+        results: List[Optional[str]] = []
+        for index, future in enumerate(futures):
+            remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeout:
+                logger.warning(f"Gemini generation #{index + 1} timed out")
+                results.append(None)
+            except Exception as e:
+                logger.error(f"Gemini generation #{index + 1} failed: {e}")
+                results.append(None)
+        return results
+    
+    async def agenerate(self, prompt: str, cache: bool = False, timeout: Optional[float] = None,
+                        validator: Optional[StreamValidator] = None) -> Optional[str]:
+        """Async generate() on the bounded worker pool (None on failure or timeout)"""
+        loop = asyncio.get_running_loop()
+        call = loop.run_in_executor(self.executor, functools.partial(self.generate, prompt, cache, validator))
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Gemini generation timed out")
+            return None
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-key usage and health"""
+        return self.pool.get_stats()
+    
+    def close(self):
+        """Stop worker threads and close the generation cache"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self.cache:
+            self.cache.close()
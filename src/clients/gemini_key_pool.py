@@ -0,0 +1,200 @@
+"""
+Gemini Key Pool - One cached client per API key with load, quota and cooldown tracking
+"""
+import re
+import time
+import logging
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List, Callable
+
+from google import genai
+from google.genai import errors as genai_errors
+
+logger = logging.getLogger(__name__)
+
+_RETRY_DELAY = re.compile(r"^(\d+(?:\.\d+)?)s$")
+
+
+def is_rate_limit(error: Exception) -> bool:
+    """Whether an exception from generate_content is a 429 / RESOURCE_EXHAUSTED"""
+    if isinstance(error, genai_errors.APIError):
+        return error.code == 429 or error.status == "RESOURCE_EXHAUSTED"
+    return getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429
+
+
+def retry_delay(error: Exception) -> Optional[float]:
+    """Server-suggested retry delay (google.rpc.RetryInfo) in seconds, if present"""
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        details = details.get("error", {}).get("details", [])
+    if not isinstance(details, list):
+        return None
+    for detail in details:
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            match = _RETRY_DELAY.match(str(detail["retryDelay"]))
+            if match:
+                return float(match.group(1))
+    return None
+
+
+class KeyState:
+    """Usage window, cooldown and counters for one API key"""
+
+    __slots__ = ("index", "key", "client", "window", "in_flight", "cooldown_until", "strikes",
+                 "requests", "rate_limited", "errors", "tokens")
+
+    def __init__(self, index: int, key: str):
+        self.index = index
+        self.key = key
+        self.client = None
+        self.window: deque = deque()  # (timestamp, tokens) over the last minute
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.strikes = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.tokens = 0
+
+    def prune(self, now: float):
+        while self.window and now - self.window[0][0] >= 60:
+            self.window.popleft()
+
+    def rpm(self) -> int:
+        return len(self.window) + self.in_flight
+
+    def tpm(self) -> int:
+        return sum(tokens for _, tokens in self.window)
+
+
+class GeminiKeyPool:
+    """
+    Picks the least-loaded healthy Gemini key for each call
+
+    A key is healthy when it is not cooling down after a 429 and (if limits
+    are configured) has request/token headroom in its last-minute window.
+    Among healthy keys the one with the fewest in-flight plus recent requests
+    wins, with ties broken round-robin. A 429 puts only that key into a
+    cooldown (the server's RetryInfo delay, else exponential backoff), and
+    callers wait for the earliest key to recover instead of giving up.
+    """
+
+    def __init__(self, api_keys: List[str], rpm_limit: Optional[int] = None, tpm_limit: Optional[int] = None,
+                 base_cooldown: float = 30.0, max_cooldown: float = 600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize pool (clients are created on first use)
+
+        Args:
+            api_keys: Gemini API keys
+            rpm_limit: Requests per minute allowed per key (None = unknown)
+            tpm_limit: Tokens per minute allowed per key (None = unknown)
+            base_cooldown: First cooldown after a 429 without RetryInfo
+            max_cooldown: Cap for repeated 429 backoff
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.keys = [KeyState(i, key) for i, key in enumerate(api_keys)]
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.last_index = -1
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, api_keys: List[str], key_pool: Optional[Dict[str, Any]] = None) -> "GeminiKeyPool":
+        """Build pool from the config.json 'gemini.key_pool' section"""
+        key_pool = key_pool or {}
+        return cls(api_keys,
+                   rpm_limit=key_pool.get("rpm_per_key"),
+                   tpm_limit=key_pool.get("tpm_per_key"),
+                   base_cooldown=key_pool.get("base_cooldown_seconds", 30.0),
+                   max_cooldown=key_pool.get("max_cooldown_seconds", 600.0))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def client_for(self, state: KeyState):
+        """Cached genai.Client for a key"""
+        if state.client is None:
+            state.client = genai.Client(api_key=state.key)
+        return state.client
+
+    def _wait_for(self, state: KeyState, now: float, tokens: int) -> float:
+        """Seconds until this key can take a request of `tokens`"""
+        state.prune(now)
+        wait = max(0.0, state.cooldown_until - now)
+        if self.rpm_limit and state.rpm() >= self.rpm_limit and state.window:
+            wait = max(wait, state.window[0][0] + 60 - now)
+        if self.tpm_limit and state.window and state.tpm() + tokens > self.tpm_limit:
+            wait = max(wait, state.window[0][0] + 60 - now)
+        return wait
+
+    def acquire(self, tokens: int = 0) -> Optional[KeyState]:
+        """Reserve the least-loaded healthy key, or None if every key is busy"""
+        with self._lock:
+            now = self.clock()
+            count = len(self.keys)
+            best = None
+            for offset in range(1, count + 1):
+                state = self.keys[(self.last_index + offset) % count]
+                if self._wait_for(state, now, tokens) > 0:
+                    continue
+                if best is None or state.rpm() < best.rpm():
+                    best = state
+            if best is not None:
+                best.in_flight += 1
+                self.last_index = best.index
+            return best
+
+    def time_until_available(self, tokens: int = 0) -> Optional[float]:
+        """Seconds until some key can take a request (None if there are no keys)"""
+        with self._lock:
+            now = self.clock()
+            waits = [self._wait_for(state, now, tokens) for state in self.keys]
+        return min(waits) if waits else None
+
+    def release(self, state: KeyState, tokens: int = 0, success: bool = True):
+        """Record a finished call on a reserved key"""
+        with self._lock:
+            state.in_flight -= 1
+            state.requests += 1
+            state.tokens += tokens
+            state.window.append((self.clock(), tokens))
+            if success:
+                state.strikes = 0
+            else:
+                state.errors += 1
+
+    def penalize(self, state: KeyState, delay: Optional[float] = None):
+        """Cool a key down after a 429 (server delay, else exponential backoff)"""
+        with self._lock:
+            state.in_flight -= 1
+            state.rate_limited += 1
+            state.strikes += 1
+            if delay is None:
+                delay = min(self.max_cooldown, self.base_cooldown * 2 ** (state.strikes - 1))
+            state.cooldown_until = max(state.cooldown_until, self.clock() + delay)
+        logger.warning(f"Gemini key #{state.index + 1} rate limited - cooling down {delay:.0f}s")
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-key usage and health"""
+        with self._lock:
+            now = self.clock()
+            stats = []
+            for state in self.keys:
+                state.prune(now)
+                stats.append({
+                    "key": f"#{state.index + 1} ...{state.key[-4:]}",
+                    "requests": state.requests,
+                    "rate_limited": state.rate_limited,
+                    "errors": state.errors,
+                    "in_flight": state.in_flight,
+                    "rpm": state.rpm(),
+                    "tpm": state.tpm(),
+                    "tokens": state.tokens,
+                    "cooldown_seconds": round(max(0.0, state.cooldown_until - now), 1)
+                })
+            return stats
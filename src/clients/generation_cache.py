@@ -0,0 +1,154 @@
+"""
+Generation Cache - Content-addressed cache for Gemini responses
+"""
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class GenerationCache:
+    """Two-tier (memory LRU + SQLite) cache keyed on (model, normalized prompt)"""
+
+    def __init__(self, path: Optional[str] = "data/generation_cache.db", max_entries: int = 2048,
+                 max_disk_entries: int = 50000, ttl_seconds: float = 7 * 86400):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite file for the on-disk tier (None = memory only)
+            max_entries: In-memory LRU size
+            max_disk_entries: Rows kept on disk before the least recently used are pruned
+            ttl_seconds: Age after which cached responses are ignored
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, cache: Optional[Dict[str, Any]] = None) -> "GenerationCache":
+        """Build cache from the config.json 'gemini.cache' section"""
+        cache = cache or {}
+        return cls(path=cache.get("path", "data/generation_cache.db"),
+                   max_entries=cache.get("max_entries", 2048),
+                   max_disk_entries=cache.get("max_disk_entries", 50000),
+                   ttl_seconds=cache.get("ttl_hours", 168) * 3600)
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Content address of a prompt: whitespace-normalized, hashed with the model name"""
+        normalized = _WHITESPACE.sub(" ", prompt).strip()
+        return hashlib.sha256(f"{model}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """Open the disk tier lazily"""
+        if self._conn is None and self.path:
+            directory = os.path.dirname(self.path)
+            if directory and self.path != ":memory:":
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS generations ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS generations_lru ON generations (last_used)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """Cached response for a prompt, or None"""
+        key = self.make_key(model, prompt)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+
+            if self.conn is not None:
+                row = self.conn.execute("SELECT response, created_at FROM generations WHERE key = ?",
+                                        (key,)).fetchone()
+                if row and now - row[1] < self.ttl_seconds:
+                    self.conn.execute("UPDATE generations SET last_used = ? WHERE key = ?", (now, key))
+                    self.conn.commit()
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, prompt: str, response: str):
+        """Store a response in both tiers"""
+        key = self.make_key(model, prompt)
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self.conn is None:
+                return
+            try:
+                self.conn.execute("INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?)",
+                                  (key, response, now, now))
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._prune()
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not persist generation cache entry: {e}")
+
+    def _remember(self, key: str, response: str, created_at: float):
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self):
+        """Drop expired rows and the least recently used rows beyond the disk limit"""
+        self.conn.execute("DELETE FROM generations WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self.conn.execute(
+            "DELETE FROM generations WHERE key IN ("
+            "SELECT key FROM generations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per tier"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._memory)
+        }
+
+    def close(self):
+        """Close the disk tier"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,81 @@
+"""
+JSON codec - Fast decoding of Moltbook response bodies
+
+Bodies are decoded straight from the raw bytes with the fastest installed
+backend: orjson, then msgspec, then the stdlib json module. Each response is
+decoded at most once - the result is kept on the response object, so the
+cache store, the caller and the error path all share one decode.
+
+Decoded values are plain dicts and lists either way; typed normalization
+happens once in src.clients.models.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency: pip install orjson
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency: pip install msgspec
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+Loads = Callable[[Union[bytes, str]], Any]
+
+BACKENDS: Dict[str, Loads] = {}
+if orjson is not None:
+    BACKENDS["orjson"] = orjson.loads
+if msgspec is not None:
+    BACKENDS["msgspec"] = msgspec.json.Decoder().decode
+BACKENDS["json"] = json.loads
+
+# orjson's and requests' decode errors already subclass ValueError
+DecodeError = (ValueError, msgspec.DecodeError) if msgspec is not None else ValueError
+
+_DECODED = "_decoded_json"
+_MISSING = object()
+
+backend = next(iter(BACKENDS))
+loads: Loads = BACKENDS[backend]
+
+
+def use(name: str = "auto") -> str:
+    """Select the decoder backend ("auto" picks the fastest installed); returns its name"""
+    global backend, loads
+    if name == "auto":
+        name = next(iter(BACKENDS))
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not installed (available: {', '.join(BACKENDS)})")
+    backend, loads = name, BACKENDS[name]
+    return backend
+
+
+def response_json(res) -> Any:
+    """Decoded body of an HTTP response, decoding it only once"""
+    state = getattr(res, "__dict__", None)
+    if state is not None:
+        data = state.get(_DECODED, _MISSING)
+        if data is not _MISSING:
+            return data
+    content = getattr(res, "content", None)
+    data = loads(content) if isinstance(content, (bytes, bytearray)) else res.json()
+    if state is not None:
+        state[_DECODED] = data
+    return data
+
+
+def error_data(res) -> Dict[str, Any]:
+    """Decoded JSON error body, or {} for non-JSON (or undecodable) responses"""
+    if not res.headers.get('content-type', '').startswith('application/json'):
+        return {}
+    try:
+        data = response_json(res)
+    except DecodeError as e:
+        logger.debug(f"Undecodable error body: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
@@ -0,0 +1,197 @@
+"""
+Models - Slotted records for Moltbook posts, comments, authors and search results
+
+API items are normalized once, where the client decodes them: field aliases
+(`username`/`name`, `createdAt`/`created_at`, `comments_count`/
+`comment_count`, `children`/`replies`) collapse into one attribute, and the
+author becomes an Author. Known fields live in __slots__ (no per-item
+__dict__); unknown keys are kept in a small side dict only when present.
+Nested comment replies stay as decoded until first read.
+
+Models still answer dict-style access (`get`, `[]`, `in`, `**`, `==` against
+a dict), so code and tests written against raw JSON keep working.
+"""
+from typing import Optional, Dict, Any, List, Tuple, Callable, TypeVar
+
+M = TypeVar("M", bound="Model")
+
+_MISSING = object()
+
+
+class Model:
+    """Slotted record built from an API dict"""
+
+    __slots__ = ("_extra",)
+
+    # JSON key -> attribute (the first key listed for an attribute is the canonical one)
+    FIELDS: Dict[str, str] = {}
+    # attribute -> converter applied to the decoded value
+    CONVERT: Dict[str, Callable[[Any], Any]] = {}
+    ATTRS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.ATTRS = tuple(dict.fromkeys(cls.FIELDS.values()))
+        cls._KEYS = {}
+        for key, attr in cls.FIELDS.items():
+            cls._KEYS.setdefault(attr, key)
+
+    def __init__(self, **values: Any):
+        for attr in self.ATTRS:
+            setattr(self, attr, values.pop(attr, None))
+        self._extra = values or None
+
+    @classmethod
+    def from_json(cls: "type[M]", data: Dict[str, Any]) -> M:
+        """Normalize one decoded API item"""
+        model = cls.__new__(cls)
+        for attr in cls.ATTRS:
+            setattr(model, attr, None)
+        extra = None
+        fields, convert = cls.FIELDS, cls.CONVERT
+        for key, value in data.items():
+            attr = fields.get(key)
+            if attr is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            elif value is not None and getattr(model, attr) is None:
+                setattr(model, attr, convert[attr](value) if attr in convert else value)
+        model._extra = extra
+        return model
+
+    @classmethod
+    def of(cls: "type[M]", item: Any) -> M:
+        """The item itself if already a model, else its normalized form"""
+        return item if isinstance(item, cls) else cls.from_json(item or {})
+
+    @classmethod
+    def many(cls: "type[M]", items: Optional[List[Any]]) -> List[M]:
+        return [cls.of(item) for item in items or ()]
+
+    def replace(self: M, **changes: Any) -> M:
+        """Copy with some attributes changed"""
+        copy = self.__class__.__new__(self.__class__)
+        for attr in self.ATTRS:
+            setattr(copy, attr, changes.pop(attr) if attr in changes else getattr(self, attr))
+        copy._extra = {**(self._extra or {}), **changes} or None
+        return copy
+
+    # Dict-style access
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self.FIELDS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            return default if value is None else value
+        return self._extra.get(key, default) if self._extra else default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict under canonical keys (nested models included)"""
+        data = {}
+        for attr in self.ATTRS:
+            value = getattr(self, attr)
+            if value is None:
+                continue
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            data[self._KEYS[attr]] = value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Model):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+class Author(Model):
+    """Author of a post or comment"""
+
+    __slots__ = ("name", "id", "karma")
+    FIELDS = {"name": "name", "username": "name", "id": "id", "karma": "karma"}
+
+    @classmethod
+    def coerce(cls, value: Any) -> "Author":
+        """Author from an author object or a bare name"""
+        return cls.of(value) if isinstance(value, (dict, Author)) else cls(name=str(value))
+
+
+def _author_name(author: Optional[Author]) -> str:
+    return (author.name if author is not None else None) or "unknown"
+
+
+class Post(Model):
+    """Feed post"""
+
+    __slots__ = ("id", "title", "content", "author", "submolt", "created_at", "comment_count",
+                 "upvotes", "downvotes", "similarity")
+    FIELDS = {"id": "id", "title": "title", "content": "content", "author": "author", "submolt": "submolt",
+              "created_at": "created_at", "createdAt": "created_at",
+              "comment_count": "comment_count", "comments_count": "comment_count",
+              "upvotes": "upvotes", "downvotes": "downvotes", "similarity": "similarity"}
+    CONVERT = {"author": Author.coerce}
+
+    @property
+    def author_name(self) -> str:
+        return _author_name(self.author)
+
+    @property
+    def text(self) -> str:
+        """Body used for evaluation and replies (the title for link posts)"""
+        return self.content or self.title or ""
+
+
+class SearchResult(Post):
+    """Semantic search hit (a post, or a comment with its post_id)"""
+
+    __slots__ = ("type", "post_id")
+    FIELDS = {**Post.FIELDS, "type": "type", "post_id": "post_id"}
+
+
+class Comment(Model):
+    """Comment; nested replies are normalized on first access"""
+
+    __slots__ = ("id", "content", "author", "parent_id", "post_id", "created_at", "upvotes", "_replies")
+    FIELDS = {"id": "id", "content": "content", "author": "author",
+              "parent_id": "parent_id", "parentId": "parent_id", "post_id": "post_id",
+              "created_at": "created_at", "createdAt": "created_at", "upvotes": "upvotes",
+              "replies": "replies", "children": "replies"}
+    CONVERT = {"author": Author.coerce}
+
+    @property
+    def replies(self) -> Optional[List["Comment"]]:
+        replies = self._replies
+        if replies and not isinstance(replies[0], Comment):
+            replies = self._replies = [Comment.of(reply) for reply in replies if isinstance(reply, (dict, Comment))]
+        return replies
+
+    @replies.setter
+    def replies(self, value: Optional[List[Any]]):
+        self._replies = value
+
+    @property
+    def author_name(self) -> str:
+        return _author_name(self.author)
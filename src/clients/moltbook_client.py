@@ -2,18 +2,31 @@
 Moltbook API Client - Handles all interactions with Moltbook platform
 """
 import os
-import time
 import logging
-import requests
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, Callable, Iterator
+
+from src.clients.transport import HttpTransport
+from src.clients.rate_limiter import RateLimiter, RequestDeferred
+from src.clients.response_cache import ResponseCache, CachedResponse
+from src.clients.json_codec import response_json
+from src.clients.models import Post, Comment, SearchResult
+from src.clients.pagination import Page, iter_pages, iter_items
+from src.clients.outbox import Outbox, OutboxMixin, Entry, WRITES, contains_own
+from src.clients.outbox import write_key, write_status, write_attempt, write_unconfirmed
+from src.clients.responses import ResponseMixin, OK_OR_EMPTY
+from src.utils.state_store import ActionStateStore, ActionStateMixin
+from src.utils.metrics import metrics, endpoint_template
 
 logger = logging.getLogger(__name__)
 
 
-class MoltbookClient:
+class MoltbookClient(ActionStateMixin, OutboxMixin, ResponseMixin):
     """Client for Moltbook social network API"""
     
-    def __init__(self, api_key: str, agent_name: str, api_base: str = "https://www.moltbook.com/api/v1"):
+    def __init__(self, api_key: str, agent_name: str, api_base: str = "https://www.moltbook.com/api/v1",
+                 transport: Optional[HttpTransport] = None, limiter: Optional[RateLimiter] = None,
+                 state_store: Optional[ActionStateStore] = None, cache: Optional[ResponseCache] = None,
+                 outbox: Optional[Outbox] = None):
         """
         Initialize Moltbook client
         
@@ -21,57 +34,200 @@ class MoltbookClient:
             api_key: Moltbook API key
             agent_name: Agent's username
             api_base: API base URL
+            transport: Shared pooled HTTP transport (a private one is created if omitted)
+            limiter: Rate limiter for this API key (default Moltbook budgets if omitted)
+            state_store: Persistent action state (in-memory only if omitted)
+            cache: Read-through cache for profile/submolt/moderator/comment reads
+            outbox: Durable journal for posts/replies/votes/DMs (writes are fire-once if omitted)
         """
         self.api_key = api_key
         self.agent_name = agent_name
         self.api_base = api_base
+        self.transport = transport or HttpTransport()
+        self.limiter = limiter or RateLimiter()
+        self.cache = cache or ResponseCache()
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         
         # State tracking
-        self.replied_posts: Set[str] = set()
-        self.voted_posts: Set[str] = set()
-        self.last_post_time: float = 0
-        self.subscribed_submolts: Set[str] = set()
+        self._init_state(state_store)
+        self._init_outbox(outbox)
+    
+    def _send(self, method: str, url: str, **kwargs):
+        """Send a request through the shared transport within the global request budget"""
+        if not self.limiter.acquire("request"):
+            raise RequestDeferred("request budget exhausted, deferring")
+        self._begin_write(method)
+        endpoint = endpoint_template(url[len(self.api_base):] if url.startswith(self.api_base) else url)
+        kwargs["headers"] = self._with_write_key(method, kwargs.get("headers", self.headers))
+        try:
+            with metrics.time("moltbook_request_seconds", method=method, endpoint=endpoint):
+                res = getattr(self.transport, method)(url, **kwargs)
+        except Exception as e:
+            self._record_error(e, endpoint)
+            raise
+        self._record_response(res, endpoint)
+        return res
     
     def get_feed(self, sort: str = "hot", limit: int = 25, 
-                 submolt: Optional[str] = None, personalized: bool = False) -> List[Dict[str, Any]]:
+                 submolt: Optional[str] = None, personalized: bool = False) -> List[Post]:
         """Get posts feed"""
         try:
             params = {"sort": sort, "limit": limit}
             if submolt:
                 params["submolt"] = submolt
-            
-            url = f"{self.api_base}/feed" if personalized else f"{self.api_base}/posts"
-            res = requests.get(url, headers=self.headers, params=params)
-            
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict):
-                    if "success" in data and not data["success"]:
-                        print(f"API Error: {data.get('error', 'Unknown error')}")
-                        return []
-                    if "posts" in data:
-                        return data["posts"]
-                    if "data" in data:
-                        return data["data"] if isinstance(data["data"], list) else []
-                return data if isinstance(data, list) else []
-            elif res.status_code == 429:
-                logger.warning("Rate limited on feed fetch")
-            return []
+            return self._feed_page(params, personalized)[0]
         except Exception as e:
             logger.error(f"Error fetching feed: {e}")
             return []
     
+    def _feed_page(self, params: Dict[str, Any], personalized: bool = False) -> Page:
+        """One feed page with its pagination metadata"""
+        url = f"{self.api_base}/feed" if personalized else f"{self.api_base}/posts"
+        return self._page_result(self._send("get", url, headers=self.headers, params=params), "posts", Post)
+    
+    # ============================================
+    # Paginated Reads
+    # ============================================
+    
+    def iter_feed(self, sort: str = "hot", limit: int = 25, submolt: Optional[str] = None,
+                  personalized: bool = False, until: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                  max_pages: int = 10) -> Iterator[Post]:
+        """Stream feed posts page by page until `until(post)` is true or the feed ends"""
+        params = {"sort": sort, "limit": limit}
+        if submolt:
+            params["submolt"] = submolt
+        return self._paged(lambda page_params: self._feed_page(page_params, personalized),
+                           params, until, max_pages, "feed")
+    
+    def iter_search(self, query: str, search_type: str = "all", limit: int = 10,
+                    until: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                    max_pages: int = 10) -> Iterator[SearchResult]:
+        """Stream semantic search results page by page"""
+        params = {"q": query, "type": search_type, "limit": limit}
+        return self._paged(self._search_page, params, until, max_pages, "search")
+    
+    def iter_comments(self, post_id: str, sort: str = "top", limit: int = 50,
+                      until: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                      max_pages: int = 10) -> Iterator[Comment]:
+        """Stream a post's comments page by page"""
+        params = {"sort": sort, "limit": limit}
+        return self._paged(lambda page_params: self._comments_page(post_id, page_params),
+                           params, until, max_pages, "comments")
+    
+    def _paged(self, fetch: Callable[[Dict[str, Any]], Page], params: Dict[str, Any],
+               until: Optional[Callable[[Dict[str, Any]], bool]], max_pages: int, label: str) -> Iterator[Any]:
+        def fetch_page(page_params: Dict[str, Any]) -> Page:
+            try:
+                return fetch(page_params)
+            except Exception as e:
+                logger.error(f"Error fetching {label} page: {e}")
+                return [], {}
+        
+        # Prefetch only with a request slot free now; otherwise the page is fetched when needed
+        pages = iter_pages(fetch_page, params, lambda: self.limiter.time_until("request") == 0, max_pages)
+        return iter_items(pages, until)
+    
+    # ============================================
+    # Journaled Writes
+    # ============================================
+    
+    def _journaled(self, kind: str, payload: Dict[str, Any]) -> bool:
+        """Journal a write in the outbox and try it once; False if it is queued or failed"""
+        if self.outbox is None:
+            return getattr(self, WRITES[kind][0])(**payload)
+        if self._claimed(kind, payload):
+            logger.info(f"Skipping {kind}: already handled or queued")
+            return False
+        key = self.outbox.add(kind, payload)
+        self._claim(kind, payload)
+        return self._attempt((key, kind, payload, 0))
+    
+    def _attempt(self, entry: Entry) -> bool:
+        """Send one journaled write with its idempotency key and settle the outcome"""
+        key, kind, payload, attempts = entry
+        token = write_key.set(key)
+        write_attempt.set(attempts + 1)
+        write_status.set(None)
+        write_unconfirmed.set(False)
+        try:
+            sent = getattr(self, WRITES[kind][0])(**payload)
+        finally:
+            write_key.reset(token)
+        if sent:
+            self.outbox.complete(key)
+        else:
+            self._settle((key, kind, payload, attempts + 1), write_status.get(), write_unconfirmed.get())
+        return sent
+    
+    def drain_outbox(self) -> int:
+        """Send due journaled writes the rate limiter admits now; returns writes delivered"""
+        if self.outbox is None:
+            return 0
+        for entry in self.outbox.interrupted() + self.outbox.unconfirmed():
+            self._resolve_interrupted(entry, self._published(entry[1], entry[2]))
+        delivered = 0
+        for key, kind, payload, attempts in self.outbox.due():
+            wait = self._deferral(kind)
+            if wait > 0:
+                self.outbox.retry(key, attempts, wait)
+            elif self._attempt((key, kind, payload, attempts)):
+                delivered += 1
+        return delivered
+    
+    def _published(self, kind: str, payload: Dict[str, Any]) -> Optional[bool]:
+        """Whether an interrupted or unconfirmed write reached Moltbook (None if that can't be checked right now)"""
+        try:
+            if kind in ("reply", "comment_reply"):
+                url = f"{self.api_base}/posts/{payload['post_id']}/comments"
+                self.cache.invalidate(url)
+                res = self._send("get", url, headers=self.headers, params={"sort": "new"})
+                if res.status_code != 200:
+                    return None
+                data = response_json(res)
+                comments = data.get("comments", []) if isinstance(data, dict) else data
+                return contains_own(comments, self.agent_name, payload["content"])
+            if kind == "post":
+                profile = self.get_profile(self.agent_name)
+                if profile is None:
+                    return None
+                return any(post.get("content") == payload["content"] for post in profile.get("recentPosts") or [])
+        except Exception as e:
+            logger.error(f"Error checking interrupted {kind}: {e}")
+            return None
+        # Votes and DMs can't be looked up; assume delivered rather than risk a duplicate
+        return True
+    
     def post(self, content: str, submolt: str = "general", title: Optional[str] = None) -> bool:
+        """Create a new post (journaled in the outbox if it can't go out now)"""
+        return self._journaled("post", {"content": content, "submolt": submolt, "title": title})
+    
+    def reply(self, post_id: str, content: str) -> bool:
+        """Reply to a post (journaled in the outbox if it can't go out now)"""
+        return self._journaled("reply", {"post_id": post_id, "content": content})
+    
+    def reply_to_comment(self, post_id: str, comment_id: str, content: str) -> bool:
+        """Reply to a comment (journaled in the outbox if it can't go out now)"""
+        return self._journaled("comment_reply", {"post_id": post_id, "comment_id": comment_id, "content": content})
+    
+    def upvote(self, post_id: str) -> bool:
+        """Upvote a post (journaled in the outbox if it can't go out now)"""
+        return self._journaled("vote", {"post_id": post_id})
+    
+    def dm_send_message(self, conversation_id: str, message: str, needs_human_input: bool = False) -> bool:
+        """Send a DM (journaled in the outbox if it can't go out now)"""
+        return self._journaled("dm", {"conversation_id": conversation_id, "message": message,
+                                      "needs_human_input": needs_human_input})
+    
+    def _post(self, content: str, submolt: str = "general", title: Optional[str] = None) -> bool:
         """Create a new post with rate limit handling"""
         try:
+            self.restore_post_cooldown()
             # Check rate limit (30 min cooldown)
-            current_time = time.time()
-            if current_time - self.last_post_time < 1800:
-                wait_time = int(1800 - (current_time - self.last_post_time))
+            if not self.limiter.acquire("post"):
+                wait_time = int(self.limiter.time_until("post"))
                 logger.info(f"Post cooldown: {wait_time // 60}m {wait_time % 60}s remaining")
                 return False
             
@@ -79,70 +235,68 @@ class MoltbookClient:
             if title:
                 payload["title"] = title
             
-            res = requests.post(f"{self.api_base}/posts", headers=self.headers, json=payload)
-            
-            if res.status_code in [200, 201]:
-                self.last_post_time = current_time
-                logger.info(f"Posted to m/{submolt}: {content[:50]}...")
-                return True
-            elif res.status_code == 429:
-                data = res.json()
-                retry_after = data.get('retry_after_minutes', 30)
-                logger.warning(f"Rate limited: wait {retry_after} minutes before posting again")
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Post Failed ({res.status_code}): {error_msg}")
-                if 'hint' in data:
-                    logger.info(f"Hint: {data['hint']}")
+            res = self._send("post", f"{self.api_base}/posts", headers=self.headers, json=payload)
+            return self._post_result(res, content, submolt)
         except Exception as e:
-            logger.error(f"Error posting: {e}")
+            self._write_failed("post", e, "Error posting")
         return False
     
-    def reply(self, post_id: str, content: str) -> bool:
+    def _reply(self, post_id: str, content: str) -> bool:
         """Reply to a post (comment)"""
         try:
-            payload = {"content": content}
-            res = requests.post(f"{self.api_base}/posts/{post_id}/comments", 
-                              headers=self.headers, json=payload)
+            if not self._acquire_comment_slot():
+                return False
             
-            if res.status_code in [200, 201]:
-                self.replied_posts.add(post_id)
-                data = res.json()
-                logger.info(f"Replied to post: {content[:50]}...")
-                
-                if isinstance(data, dict) and data.get('suggestion') and not data.get('already_following'):
-                    author = data.get('author', {}).get('name')
-                    if author:
-                        logger.info(f"{data['suggestion']}")
-                return True
-            elif res.status_code == 429:
-                data = res.json()
-                retry_after = data.get('retry_after_seconds', 20)
-                daily_remaining = data.get('daily_remaining', '?')
-                logger.warning(f"Comment rate limit: wait {retry_after}s (daily remaining: {daily_remaining})")
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Reply Failed ({res.status_code}): {error_msg}")
+            res = self._send("post", f"{self.api_base}/posts/{post_id}/comments",
+                             headers=self.headers, json={"content": content})
+            return self._comment_result(res, post_id, content)
         except Exception as e:
-            logger.error(f"Error replying: {e}")
+            self._write_failed("comment", e, "Error replying")
         return False
     
-    def upvote(self, post_id: str) -> bool:
+    def _cached_get(self, endpoint: str, url: str, params: Optional[Dict[str, Any]] = None):
+        """GET through the response cache, revalidating stale entries with ETag/Last-Modified"""
+        key = self.cache.key(url, params)
+        data = self.cache.get_fresh(key)
+        if data is not None:
+            return CachedResponse(data)
+        
+        self.cache.record_miss()
+        headers = self.headers
+        stale = self.cache.get_stale(key)
+        if stale and (stale.etag or stale.last_modified):
+            headers = dict(self.headers)
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+        
+        kwargs = {"headers": headers}
+        if params:
+            kwargs["params"] = params
+        res = self._send("get", url, **kwargs)
+        
+        if res.status_code == 304 and stale:
+            return CachedResponse(self.cache.refresh(key, endpoint))
+        if res.status_code == 200:
+            body = res.content if isinstance(res.content, bytes) else b""
+            self.cache.store(key, endpoint, response_json(res), len(body),
+                             res.headers.get("ETag"), res.headers.get("Last-Modified"))
+        return res
+    
+    def _acquire_comment_slot(self) -> bool:
+        """Wait for the comment cooldown; False if the slot is too far away"""
+        if self.limiter.acquire("comment"):
+            return True
+        wait_time = int(self.limiter.time_until("comment"))
+        logger.info(f"Comment deferred: next slot in {wait_time}s")
+        return False
+    
+    def _upvote(self, post_id: str) -> bool:
         """Upvote a post"""
         try:
-            res = requests.post(f"{self.api_base}/posts/{post_id}/upvote", headers=self.headers)
-            if res.status_code in [200, 201]:
-                self.voted_posts.add(post_id)
-                data = res.json()
-                logger.info(f"Upvoted post {post_id[:8]}...")
-                
-                if isinstance(data, dict) and data.get('suggestion') and not data.get('already_following'):
-                    author = data.get('author', {}).get('name')
-                    if author:
-                        logger.info(f"{data['suggestion']}")
-                return True
+            res = self._send("post", f"{self.api_base}/posts/{post_id}/upvote", headers=self.headers)
+            return self._vote_result(res, post_id)
         except Exception as e:
             logger.error(f"Error upvoting: {e}")
         return False
@@ -150,42 +304,38 @@ class MoltbookClient:
     def downvote(self, post_id: str) -> bool:
         """Downvote a post"""
         try:
-            res = requests.post(f"{self.api_base}/posts/{post_id}/downvote", headers=self.headers)
-            if res.status_code in [200, 201]:
+            res = self._send("post", f"{self.api_base}/posts/{post_id}/downvote", headers=self.headers)
+            if self._succeeded(res):
                 logger.info(f"Downvoted post {post_id[:8]}...")
                 return True
         except Exception as e:
             logger.error(f"Error downvoting: {e}")
         return False
     
-    def semantic_search(self, query: str, search_type: str = "all", limit: int = 10) -> List[Dict[str, Any]]:
+    def semantic_search(self, query: str, search_type: str = "all", limit: int = 10) -> List[SearchResult]:
         """Semantic search for posts and comments"""
         try:
             params = {"q": query, "type": search_type, "limit": limit}
-            res = requests.get(f"{self.api_base}/search", headers=self.headers, params=params)
-            if res.status_code == 200:
-                data = res.json()
-                if data.get('success'):
-                    return data.get('results', [])
-            return []
+            return self._search_page(params)[0]
         except Exception as e:
             logger.error(f"Error searching: {e}")
             return []
     
+    def _search_page(self, params: Dict[str, Any]) -> Page:
+        """One page of search results with its pagination metadata"""
+        res = self._send("get", f"{self.api_base}/search", headers=self.headers, params=params)
+        return self._page_result(res, "results", SearchResult)
+    
     def get_profile(self, agent_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get profile for an agent"""
         try:
             if agent_name:
-                res = requests.get(f"{self.api_base}/agents/profile", 
-                                 headers=self.headers, params={"name": agent_name})
+                res = self._cached_get("profile", f"{self.api_base}/agents/profile",
+                                       params={"name": agent_name})
             else:
-                res = requests.get(f"{self.api_base}/agents/me", headers=self.headers)
-            
-            if res.status_code == 200:
-                data = res.json()
-                if data.get('success'):
-                    return data.get('agent')
-            return None
+                res = self._cached_get("profile", f"{self.api_base}/agents/me")
+            data = self._success_data(res)
+            return data.get('agent') if data else None
         except Exception as e:
             logger.error(f"Error fetching profile: {e}")
             return None
@@ -193,12 +343,9 @@ class MoltbookClient:
     def subscribe_submolt(self, submolt_name: str) -> bool:
         """Subscribe to a submolt"""
         try:
-            res = requests.post(f"{self.api_base}/submolts/{submolt_name}/subscribe", 
-                              headers=self.headers)
-            if res.status_code in [200, 201]:
-                self.subscribed_submolts.add(submolt_name)
-                logger.info(f"Subscribed to m/{submolt_name}")
-                return True
+            res = self._send("post", f"{self.api_base}/submolts/{submolt_name}/subscribe",
+                             headers=self.headers)
+            return self._subscribe_result(res, submolt_name)
         except Exception as e:
             logger.error(f"Error subscribing: {e}")
         return False
@@ -206,13 +353,7 @@ class MoltbookClient:
     def get_submolts(self) -> List[Dict[str, Any]]:
         """Get list of available submolts"""
         try:
-            res = requests.get(f"{self.api_base}/submolts", headers=self.headers)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict) and data.get('success'):
-                    return data.get('data', [])
-                return data if isinstance(data, list) else []
-            return []
+            return self._listing(self._cached_get("submolts", f"{self.api_base}/submolts"), 'data')
         except Exception as e:
             logger.error(f"Error fetching submolts: {e}")
             return []
@@ -223,19 +364,12 @@ class MoltbookClient:
         
         Args:
             submolt_name: Submolt name
-            
+        
         Returns:
             Submolt data including your_role (owner/moderator/null)
         """
         try:
-            res = requests.get(f"{self.api_base}/submolts/{submolt_name}", 
-                             headers=self.headers)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict) and data.get('success'):
-                    return data.get('submolt')
-                return data if isinstance(data, dict) else None
-            return None
+            return self._submolt_result(self._cached_get("submolt", f"{self.api_base}/submolts/{submolt_name}"))
         except Exception as e:
             logger.error(f"Error fetching submolt info: {e}")
             return None
@@ -243,15 +377,11 @@ class MoltbookClient:
     def follow_agent(self, agent_name: str) -> bool:
         """Follow another agent (use VERY selectively per Moltbook docs)"""
         try:
-            res = requests.post(f"{self.api_base}/agents/{agent_name}/follow", 
-                              headers=self.headers)
-            if res.status_code in [200, 201]:
+            res = self._send("post", f"{self.api_base}/agents/{agent_name}/follow",
+                             headers=self.headers)
+            if self._succeeded(res, "Follow Failed"):
                 logger.info(f"Now following @{agent_name}")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Follow Failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error following agent: {e}")
         return False
@@ -259,16 +389,16 @@ class MoltbookClient:
     def unfollow_agent(self, agent_name: str) -> bool:
         """Unfollow an agent"""
         try:
-            res = requests.delete(f"{self.api_base}/agents/{agent_name}/follow", 
-                                headers=self.headers)
-            if res.status_code in [200, 201, 204]:
+            res = self._send("delete", f"{self.api_base}/agents/{agent_name}/follow",
+                             headers=self.headers)
+            if self._succeeded(res, statuses=OK_OR_EMPTY):
                 logger.info(f"Unfollowed @{agent_name}")
                 return True
         except Exception as e:
             logger.error(f"Error unfollowing agent: {e}")
         return False
     
-    def update_profile(self, description: Optional[str] = None, 
+    def update_profile(self, description: Optional[str] = None,
                       metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Update agent profile (description and/or metadata)"""
         try:
@@ -282,15 +412,12 @@ class MoltbookClient:
                 logger.warning("No updates provided for profile")
                 return False
             
-            res = requests.patch(f"{self.api_base}/agents/me", 
-                               headers=self.headers, json=payload)
-            if res.status_code in [200, 201]:
-                logger.info(f"Profile updated")
+            res = self._send("patch", f"{self.api_base}/agents/me",
+                             headers=self.headers, json=payload)
+            if self._succeeded(res, "Profile update failed"):
+                self.cache.invalidate(f"{self.api_base}/agents/me")
+                logger.info("Profile updated")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Profile update failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error updating profile: {e}")
         return False
@@ -298,56 +425,40 @@ class MoltbookClient:
     def delete_post(self, post_id: str) -> bool:
         """Delete your own post"""
         try:
-            res = requests.delete(f"{self.api_base}/posts/{post_id}", 
-                                headers=self.headers)
-            if res.status_code in [200, 201, 204]:
+            res = self._send("delete", f"{self.api_base}/posts/{post_id}",
+                             headers=self.headers)
+            if self._succeeded(res, "Delete failed", OK_OR_EMPTY):
                 logger.info(f"Deleted post {post_id[:8]}...")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Delete failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error deleting post: {e}")
         return False
     
-    def get_post_comments(self, post_id: str, sort: str = "top") -> List[Dict[str, Any]]:
+    def get_post_comments(self, post_id: str, sort: str = "top") -> List[Comment]:
         """Get all comments on a post"""
         try:
-            params = {"sort": sort}
-            res = requests.get(f"{self.api_base}/posts/{post_id}/comments", 
-                             headers=self.headers, params=params)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict) and data.get('success'):
-                    return data.get('comments', [])
-                return data if isinstance(data, list) else []
-            return []
+            return self._comments_page(post_id, {"sort": sort})[0]
         except Exception as e:
             logger.error(f"Error fetching comments: {e}")
             return []
     
-    def reply_to_comment(self, post_id: str, comment_id: str, content: str) -> bool:
+    def _comments_page(self, post_id: str, params: Dict[str, Any]) -> Page:
+        """One page of a post's comments with its pagination metadata"""
+        res = self._cached_get("comments", f"{self.api_base}/posts/{post_id}/comments", params=params)
+        return self._page_result(res, "comments", Comment)
+    
+    def _reply_to_comment(self, post_id: str, comment_id: str, content: str) -> bool:
         """Reply to a specific comment (nested thread)"""
         try:
-            payload = {"content": content, "parent_id": comment_id}
-            res = requests.post(f"{self.api_base}/posts/{post_id}/comments", 
-                              headers=self.headers, json=payload)
+            if not self._acquire_comment_slot():
+                return False
             
-            if res.status_code in [200, 201]:
-                data = res.json()
-                logger.info(f"Replied to comment: {content[:50]}...")
-                return True
-            elif res.status_code == 429:
-                data = res.json()
-                retry_after = data.get('retry_after_seconds', 20)
-                logger.warning(f"Comment rate limit: wait {retry_after}s")
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Reply to comment failed ({res.status_code}): {error_msg}")
+            payload = {"content": content, "parent_id": comment_id}
+            res = self._send("post", f"{self.api_base}/posts/{post_id}/comments",
+                             headers=self.headers, json=payload)
+            return self._comment_result(res, post_id, content, comment_id)
         except Exception as e:
-            logger.error(f"Error replying to comment: {e}")
+            self._write_failed("comment", e, "Error replying to comment")
         return False
     
     # ============================================
@@ -362,7 +473,7 @@ class MoltbookClient:
             name: URL-friendly name (lowercase, hyphens)
             display_name: Human-readable name
             description: Community description
-            
+        
         Returns:
             Created submolt data or None on failure
         """
@@ -372,19 +483,9 @@ class MoltbookClient:
                 "display_name": display_name,
                 "description": description
             }
-            res = requests.post(f"{self.api_base}/submolts", 
-                              headers=self.headers, json=payload)
-            
-            if res.status_code in [200, 201]:
-                data = res.json()
-                logger.info(f"Created submolt m/{name}")
-                return data.get('submolt') if isinstance(data, dict) else data
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Create submolt failed ({res.status_code}): {error_msg}")
-                if 'hint' in data:
-                    logger.info(f"Hint: {data['hint']}")
+            res = self._send("post", f"{self.api_base}/submolts",
+                             headers=self.headers, json=payload)
+            return self._created_submolt(res, name)
         except Exception as e:
             logger.error(f"Error creating submolt: {e}")
         return None
@@ -400,20 +501,16 @@ class MoltbookClient:
         
         Args:
             post_id: Post ID to pin
-            
+        
         Returns:
             True if successful
         """
         try:
-            res = requests.post(f"{self.api_base}/posts/{post_id}/pin", 
-                              headers=self.headers)
-            if res.status_code in [200, 201]:
+            res = self._send("post", f"{self.api_base}/posts/{post_id}/pin",
+                             headers=self.headers)
+            if self._succeeded(res, "Pin failed"):
                 logger.info(f"Pinned post {post_id[:8]}...")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Pin failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error pinning post: {e}")
         return False
@@ -424,20 +521,16 @@ class MoltbookClient:
         
         Args:
             post_id: Post ID to unpin
-            
+        
         Returns:
             True if successful
         """
         try:
-            res = requests.delete(f"{self.api_base}/posts/{post_id}/pin", 
-                                headers=self.headers)
-            if res.status_code in [200, 201, 204]:
+            res = self._send("delete", f"{self.api_base}/posts/{post_id}/pin",
+                             headers=self.headers)
+            if self._succeeded(res, "Unpin failed", OK_OR_EMPTY):
                 logger.info(f"Unpinned post {post_id[:8]}...")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Unpin failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error unpinning post: {e}")
         return False
@@ -450,22 +543,18 @@ class MoltbookClient:
             submolt_name: Submolt name
             agent_name: Agent to add as moderator
             role: Role type (default: "moderator")
-            
+        
         Returns:
             True if successful
         """
         try:
             payload = {"agent_name": agent_name, "role": role}
-            res = requests.post(f"{self.api_base}/submolts/{submolt_name}/moderators", 
-                              headers=self.headers, json=payload)
-            
-            if res.status_code in [200, 201]:
+            res = self._send("post", f"{self.api_base}/submolts/{submolt_name}/moderators",
+                             headers=self.headers, json=payload)
+            if self._succeeded(res, "Add moderator failed"):
+                self.cache.invalidate(f"{self.api_base}/submolts/{submolt_name}/moderators")
                 logger.info(f"Added @{agent_name} as moderator of m/{submolt_name}")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Add moderator failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error adding moderator: {e}")
         return False
@@ -477,22 +566,18 @@ class MoltbookClient:
         Args:
             submolt_name: Submolt name
             agent_name: Agent to remove as moderator
-            
+        
         Returns:
             True if successful
         """
         try:
             payload = {"agent_name": agent_name}
-            res = requests.delete(f"{self.api_base}/submolts/{submolt_name}/moderators", 
-                                headers=self.headers, json=payload)
-            
-            if res.status_code in [200, 201, 204]:
+            res = self._send("delete", f"{self.api_base}/submolts/{submolt_name}/moderators",
+                             headers=self.headers, json=payload)
+            if self._succeeded(res, "Remove moderator failed", OK_OR_EMPTY):
+                self.cache.invalidate(f"{self.api_base}/submolts/{submolt_name}/moderators")
                 logger.info(f"Removed @{agent_name} as moderator of m/{submolt_name}")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Remove moderator failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error removing moderator: {e}")
         return False
@@ -503,24 +588,18 @@ class MoltbookClient:
         
         Args:
             submolt_name: Submolt name
-            
+        
         Returns:
             List of moderator data
         """
         try:
-            res = requests.get(f"{self.api_base}/submolts/{submolt_name}/moderators", 
-                             headers=self.headers)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict) and data.get('success'):
-                    return data.get('moderators', [])
-                return data if isinstance(data, list) else []
-            return []
+            res = self._cached_get("moderators", f"{self.api_base}/submolts/{submolt_name}/moderators")
+            return self._listing(res, 'moderators')
         except Exception as e:
             logger.error(f"Error fetching moderators: {e}")
             return []
     
-    def update_submolt_settings(self, submolt_name: str, 
+    def update_submolt_settings(self, submolt_name: str,
                                description: Optional[str] = None,
                                banner_color: Optional[str] = None,
                                theme_color: Optional[str] = None) -> bool:
@@ -532,7 +611,7 @@ class MoltbookClient:
             description: New description (optional)
             banner_color: Banner color hex code (optional)
             theme_color: Theme color hex code (optional)
-            
+        
         Returns:
             True if successful
         """
@@ -549,16 +628,12 @@ class MoltbookClient:
                 logger.warning("No settings provided for update")
                 return False
             
-            res = requests.patch(f"{self.api_base}/submolts/{submolt_name}/settings", 
-                               headers=self.headers, json=payload)
-            
-            if res.status_code in [200, 201]:
+            res = self._send("patch", f"{self.api_base}/submolts/{submolt_name}/settings",
+                             headers=self.headers, json=payload)
+            if self._succeeded(res, "Update settings failed"):
+                self.cache.invalidate(f"{self.api_base}/submolts/{submolt_name}")
                 logger.info(f"Updated m/{submolt_name} settings")
                 return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Update settings failed ({res.status_code}): {error_msg}")
         except Exception as e:
             logger.error(f"Error updating submolt settings: {e}")
         return False
@@ -573,18 +648,12 @@ class MoltbookClient:
             Activity summary with pending requests and unread messages
         """
         try:
-            res = requests.get(f"{self.api_base}/agents/dm/check", headers=self.headers)
-            if res.status_code == 200:
-                data = res.json()
-                if data.get('has_activity'):
-                    logger.info(f"DM Activity: {data.get('summary', 'New activity')}")
-                return data
-            return {"success": False, "has_activity": False}
+            return self._dm_activity(self._send("get", f"{self.api_base}/agents/dm/check", headers=self.headers))
         except Exception as e:
             logger.error(f"Error checking DM activity: {e}")
             return {"success": False, "has_activity": False}
     
-    def dm_send_request(self, message: str, to: Optional[str] = None, 
+    def dm_send_request(self, message: str, to: Optional[str] = None,
                        to_owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Send a chat request to another agent
@@ -593,7 +662,7 @@ class MoltbookClient:
             message: Why you want to chat (10-1000 chars)
             to: Bot name to message (use this OR to_owner)
             to_owner: X handle of the owner (use this OR to)
-            
+        
         Returns:
             Request data or None on failure
         """
@@ -608,18 +677,11 @@ class MoltbookClient:
             if to_owner:
                 payload["to_owner"] = to_owner.lstrip('@')
             
-            res = requests.post(f"{self.api_base}/agents/dm/request", 
-                              headers=self.headers, json=payload)
-            
-            if res.status_code in [200, 201]:
-                data = res.json()
-                recipient = to or to_owner
-                logger.info(f"Sent chat request to {recipient}")
-                return data
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Chat request failed ({res.status_code}): {error_msg}")
+            res = self._send("post", f"{self.api_base}/agents/dm/request",
+                             headers=self.headers, json=payload)
+            if self._succeeded(res, "Chat request failed"):
+                logger.info(f"Sent chat request to {to or to_owner}")
+                return response_json(res)
         except Exception as e:
             logger.error(f"Error sending chat request: {e}")
         return None
@@ -632,17 +694,7 @@ class MoltbookClient:
             List of pending requests
         """
         try:
-            res = requests.get(f"{self.api_base}/agents/dm/requests", headers=self.headers)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict) and data.get('success'):
-                    requests_data = data.get('requests', {})
-                    items = requests_data.get('items', []) if isinstance(requests_data, dict) else []
-                    if items:
-                        logger.info(f"{len(items)} pending chat request(s)")
-                    return items
-                return []
-            return []
+            return self._chat_requests(self._send("get", f"{self.api_base}/agents/dm/requests", headers=self.headers))
         except Exception as e:
             logger.error(f"Error fetching chat requests: {e}")
             return []
@@ -653,14 +705,14 @@ class MoltbookClient:
         
         Args:
             conversation_id: Request/conversation ID
-            
+        
         Returns:
             True if successful
         """
         try:
-            res = requests.post(f"{self.api_base}/agents/dm/requests/{conversation_id}/approve", 
-                              headers=self.headers)
-            if res.status_code in [200, 201]:
+            res = self._send("post", f"{self.api_base}/agents/dm/requests/{conversation_id}/approve",
+                             headers=self.headers)
+            if self._succeeded(res):
                 logger.info(f"Approved chat request {conversation_id[:8]}...")
                 return True
             return False
@@ -675,15 +727,15 @@ class MoltbookClient:
         Args:
             conversation_id: Request/conversation ID
             block: If True, also block future requests from this agent
-            
+        
         Returns:
             True if successful
         """
         try:
             payload = {"block": block} if block else {}
-            res = requests.post(f"{self.api_base}/agents/dm/requests/{conversation_id}/reject", 
-                              headers=self.headers, json=payload)
-            if res.status_code in [200, 201]:
+            res = self._send("post", f"{self.api_base}/agents/dm/requests/{conversation_id}/reject",
+                             headers=self.headers, json=payload)
+            if self._succeeded(res):
                 action = "blocked" if block else "rejected"
                 logger.info(f"{action.capitalize()} chat request {conversation_id[:8]}...")
                 return True
@@ -700,18 +752,8 @@ class MoltbookClient:
             List of conversations with unread counts
         """
         try:
-            res = requests.get(f"{self.api_base}/agents/dm/conversations", headers=self.headers)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict) and data.get('success'):
-                    convos = data.get('conversations', {})
-                    items = convos.get('items', []) if isinstance(convos, dict) else []
-                    total_unread = data.get('total_unread', 0)
-                    if total_unread > 0:
-                        logger.info(f"{len(items)} conversation(s), {total_unread} unread")
-                    return items
-                return []
-            return []
+            return self._conversations(self._send("get", f"{self.api_base}/agents/dm/conversations",
+                                                  headers=self.headers))
         except Exception as e:
             logger.error(f"Error fetching conversations: {e}")
             return []
@@ -722,27 +764,20 @@ class MoltbookClient:
         
         Args:
             conversation_id: Conversation ID
-            
+        
         Returns:
             Conversation data with messages
         """
         try:
-            res = requests.get(f"{self.api_base}/agents/dm/conversations/{conversation_id}", 
+            res = self._send("get", f"{self.api_base}/agents/dm/conversations/{conversation_id}",
                              headers=self.headers)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, dict) and data.get('success'):
-                    messages = data.get('messages', [])
-                    logger.info(f"Read conversation {conversation_id[:8]}... ({len(messages)} messages)")
-                    return data
-                return None
-            return None
+            return self._conversation(res, conversation_id)
         except Exception as e:
             logger.error(f"Error reading conversation: {e}")
             return None
     
-    def dm_send_message(self, conversation_id: str, message: str, 
-                       needs_human_input: bool = False) -> bool:
+    def _dm_send_message(self, conversation_id: str, message: str,
+                        needs_human_input: bool = False) -> bool:
         """
         Send a message in an existing conversation
         
@@ -750,7 +785,7 @@ class MoltbookClient:
             conversation_id: Conversation ID
             message: Message content
             needs_human_input: If True, flags message for human attention
-            
+        
         Returns:
             True if successful
         """
@@ -759,17 +794,9 @@ class MoltbookClient:
             if needs_human_input:
                 payload["needs_human_input"] = True
             
-            res = requests.post(f"{self.api_base}/agents/dm/conversations/{conversation_id}/send", 
-                              headers=self.headers, json=payload)
-            
-            if res.status_code in [200, 201]:
-                flag = " [HUMAN NEEDED]" if needs_human_input else ""
-                logger.info(f"Sent message{flag}")
-                return True
-            else:
-                data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = data.get('error', res.text)
-                logger.error(f"Send message failed ({res.status_code}): {error_msg}")
+            res = self._send("post", f"{self.api_base}/agents/dm/conversations/{conversation_id}/send",
+                             headers=self.headers, json=payload)
+            return self._message_result(res, needs_human_input)
         except Exception as e:
             logger.error(f"Error sending message: {e}")
         return False
@@ -783,38 +810,11 @@ class MoltbookClient:
         Args:
             submolt_name: Submolt name
             file_path: Path to image file (max 500 KB)
-            
+        
         Returns:
             True if successful
         """
-        try:
-            if not os.path.exists(file_path):
-                logger.error(f"File not found: {file_path}")
-                return False
-            
-            # Remove Content-Type from headers for multipart upload
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-            
-            with open(file_path, 'rb') as f:
-                files = {'file': f}
-                data = {'type': 'avatar'}
-                res = requests.post(
-                    f"{self.api_base}/submolts/{submolt_name}/settings",
-                    headers=headers,
-                    files=files,
-                    data=data
-                )
-            
-            if res.status_code in [200, 201]:
-                logger.info(f"Uploaded avatar for m/{submolt_name}")
-                return True
-            else:
-                error_data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = error_data.get('error', res.text)
-                logger.error(f"Avatar upload failed ({res.status_code}): {error_msg}")
-        except Exception as e:
-            logger.error(f"Error uploading avatar: {e}")
-        return False
+        return self._upload_submolt_image(submolt_name, file_path, "avatar")
     
     def upload_submolt_banner(self, submolt_name: str, file_path: str) -> bool:
         """
@@ -823,10 +823,14 @@ class MoltbookClient:
         Args:
             submolt_name: Submolt name
             file_path: Path to image file (max 2 MB)
-            
+        
         Returns:
             True if successful
         """
+        return self._upload_submolt_image(submolt_name, file_path, "banner")
+    
+    def _upload_submolt_image(self, submolt_name: str, file_path: str, kind: str) -> bool:
+        """Upload avatar/banner image as multipart form data"""
         try:
             if not os.path.exists(file_path):
                 logger.error(f"File not found: {file_path}")
@@ -836,22 +840,16 @@ class MoltbookClient:
             headers = {"Authorization": f"Bearer {self.api_key}"}
             
             with open(file_path, 'rb') as f:
-                files = {'file': f}
-                data = {'type': 'banner'}
-                res = requests.post(
+                res = self._send(
+                    "post",
                     f"{self.api_base}/submolts/{submolt_name}/settings",
                     headers=headers,
-                    files=files,
-                    data=data
+                    files={'file': f},
+                    data={'type': kind}
                 )
-            
-            if res.status_code in [200, 201]:
-                logger.info(f"Uploaded banner for m/{submolt_name}")
+            if self._succeeded(res, f"{kind.capitalize()} upload failed"):
+                logger.info(f"Uploaded {kind} for m/{submolt_name}")
                 return True
-            else:
-                error_data = res.json() if res.headers.get('content-type', '').startswith('application/json') else {}
-                error_msg = error_data.get('error', res.text)
-                logger.error(f"Banner upload failed ({res.status_code}): {error_msg}")
         except Exception as e:
-            logger.error(f"Error uploading banner: {e}")
+            logger.error(f"Error uploading {kind}: {e}")
         return False
@@ -0,0 +1,242 @@
+"""
+Outbox - Durable journal of Moltbook writes with idempotency keys
+
+Generated posts, replies, votes and DMs are journaled in the state database
+before they are sent. A write that hits a 429, a cooldown or a network error
+stays queued and is retried by the drainer when the rate limiter allows,
+instead of throwing the generated text away. Each journaled write gets its own
+random key, sent as Idempotency-Key on every attempt, and is marked in flight
+only once the limiter admits its request. A write that may have reached
+Moltbook (left in flight by a crash, or cut off by a read timeout) is looked
+up before it is resent, so only what provably did not arrive goes out again. Repeat writes to one target are refused by
+the claim sets (replied_posts, voted_posts, ...), not by the journal.
+"""
+import json
+import time
+import uuid
+import logging
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Tuple
+
+from src.utils.state_store import ActionStateStore
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Per-request context shared with the clients' transport layer
+write_key: ContextVar[Optional[str]] = ContextVar("outbox_write_key", default=None)
+write_status: ContextVar[Optional[int]] = ContextVar("outbox_write_status", default=None)
+write_attempt: ContextVar[int] = ContextVar("outbox_write_attempt", default=0)
+write_unconfirmed: ContextVar[bool] = ContextVar("outbox_write_unconfirmed", default=False)
+
+# kind -> (client method, limiter action, state set claimed while queued, payload field of the claim)
+WRITES: Dict[str, Tuple[str, str, Optional[str], Optional[str]]] = {
+    "post": ("_post", "post", None, None),
+    "reply": ("_reply", "comment", "replied_posts", "post_id"),
+    "comment_reply": ("_reply_to_comment", "comment", "replied_comments", "comment_id"),
+    "vote": ("_upvote", "request", "voted_posts", "post_id"),
+    "dm": ("_dm_send_message", "request", None, None)
+}
+
+Entry = Tuple[str, str, Dict[str, Any], int]  # (key, kind, payload, attempts)
+
+
+def is_transient(status: Optional[int]) -> bool:
+    """Whether a failed write is worth retrying (no response, 429 or 5xx)"""
+    return status is None or status == 429 or status >= 500
+
+
+def contains_own(comments: List[Dict[str, Any]], agent_name: str, content: str) -> bool:
+    """Whether a (possibly nested) comment list holds our comment with this content"""
+    stack = list(comments or [])
+    while stack:
+        comment = stack.pop()
+        if not isinstance(comment, dict):
+            continue
+        author = (comment.get("author") or {}).get("name")
+        if author == agent_name and (comment.get("content") or "").strip() == content.strip():
+            return True
+        stack.extend(comment.get("replies") or comment.get("children") or [])
+    return False
+
+
+class Outbox:
+    """Pending writes in the state database with retry backoff"""
+
+    def __init__(self, store: ActionStateStore, max_attempts: int = 8, backoff_seconds: float = 30.0,
+                 max_backoff_seconds: float = 3600.0, drain_batch: int = 5, clock=time.time):
+        """
+        Initialize outbox
+
+        Args:
+            store: State database holding the journal
+            max_attempts: Sends before a write is dropped
+            backoff_seconds: Delay after the first transient failure (doubles per attempt)
+            max_backoff_seconds: Upper bound of the retry delay
+            drain_batch: Writes attempted per drain
+            clock: Wall clock (injectable for tests)
+        """
+        self.store = store
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.drain_batch = drain_batch
+        self.clock = clock
+        self.started_at = clock()
+
+        # Statistics
+        self.sent = 0
+        self.retried = 0
+        self.dropped = 0
+        self.recovered = 0
+
+    @classmethod
+    def from_config(cls, store: ActionStateStore, outbox: Optional[Dict[str, Any]] = None) -> Optional["Outbox"]:
+        """Build outbox from the config.json 'outbox' section (None when disabled)"""
+        outbox = outbox or {}
+        if not outbox.get("enabled", True):
+            return None
+        return cls(store,
+                   max_attempts=outbox.get("max_attempts", 8),
+                   backoff_seconds=outbox.get("backoff_seconds", 30),
+                   max_backoff_seconds=outbox.get("max_backoff_seconds", 3600),
+                   drain_batch=outbox.get("drain_batch", 5))
+
+    def add(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Journal a write under a fresh idempotency key; returns the key"""
+        key = uuid.uuid4().hex
+        self.store.outbox_add(key, kind, json.dumps(payload), self.clock())
+        return key
+
+    def begin(self, key: str, attempts: int):
+        """Mark a write in flight once the limiter has admitted its request"""
+        now = self.clock()
+        self.store.outbox_update(key, "sending", attempts, now, now)
+
+    def complete(self, key: str):
+        """Remove a delivered write"""
+        self.store.outbox_delete(key)
+        self.sent += 1
+        metrics.inc("outbox_writes_total", result="sent")
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.backoff_seconds * 2 ** max(attempts - 1, 0), self.max_backoff_seconds)
+
+    def retry(self, key: str, attempts: int, delay: float):
+        """Queue a write again after `delay` seconds"""
+        now = self.clock()
+        self.store.outbox_update(key, "queued", attempts, now + delay, now)
+        self.retried += 1
+        metrics.inc("outbox_writes_total", result="retried")
+
+    def unconfirm(self, key: str, attempts: int, delay: float):
+        """Hold a write that may have been delivered until it can be looked up, after `delay` seconds"""
+        now = self.clock()
+        self.store.outbox_update(key, "unconfirmed", attempts, now + delay, now)
+        metrics.inc("outbox_writes_total", result="unconfirmed")
+
+    def drop(self, key: str):
+        """Give up on a write"""
+        self.store.outbox_delete(key)
+        self.dropped += 1
+        metrics.inc("outbox_writes_total", result="dropped")
+
+    def due(self) -> List[Entry]:
+        """Queued writes whose retry time has come, oldest first"""
+        return self._entries(self.store.outbox_due(self.clock(), self.drain_batch))
+
+    def interrupted(self) -> List[Entry]:
+        """Writes a previous process left in flight (it may have died mid-request)"""
+        return self._entries(self.store.outbox_in_flight(self.started_at))
+
+    def unconfirmed(self) -> List[Entry]:
+        """Writes whose request failed without an answer, due to be looked up"""
+        return self._entries(self.store.outbox_due(self.clock(), self.drain_batch, state="unconfirmed"))
+
+    @staticmethod
+    def _entries(rows) -> List[Entry]:
+        return [(key, kind, json.loads(payload), attempts) for key, kind, payload, attempts in rows]
+
+    def pending(self, kind: Optional[str] = None) -> int:
+        """Writes still journaled (of one kind, or all)"""
+        return self.store.outbox_count(kind)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and outcome counters"""
+        return {
+            "pending": self.pending(),
+            "sent": self.sent,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "recovered": self.recovered
+        }
+
+
+class OutboxMixin:
+    """Journaling decisions shared by the sync and async Moltbook clients"""
+
+    def _init_outbox(self, outbox: Optional[Outbox] = None):
+        self.outbox = outbox
+
+    def _claimed(self, kind: str, payload: Dict[str, Any]) -> bool:
+        """Whether the write's target was already handled or is queued"""
+        _, _, state, field = WRITES[kind]
+        return bool(state) and payload[field] in getattr(self, state)
+
+    def _claim(self, kind: str, payload: Dict[str, Any]):
+        """Treat a queued write's target as handled so it isn't generated for again"""
+        _, _, state, field = WRITES[kind]
+        if state:
+            getattr(self, state).add(payload[field])
+
+    def _release(self, kind: str, payload: Dict[str, Any]):
+        _, _, state, field = WRITES[kind]
+        if state:
+            getattr(self, state).discard(payload[field])
+
+    def _begin_write(self, method: str):
+        """Mark the journaled write of this context in flight (its request was just admitted)"""
+        key = write_key.get()
+        if key and self.outbox is not None and method.lower() == "post":
+            self.outbox.begin(key, write_attempt.get())
+
+    def _deferral(self, kind: str) -> float:
+        """Seconds until the limiter would admit this kind of write"""
+        self.restore_post_cooldown()
+        return self.limiter.time_until(WRITES[kind][1])
+
+    def _settle(self, entry: Entry, status: Optional[int], unconfirmed: bool = False):
+        """
+        Requeue a failed write, hold it for a lookup if it may have arrived, or drop it
+
+        A write dropped for a permanent error (already voted, post gone,
+        rejected content) keeps its claim, so the target isn't tried again.
+        """
+        key, kind, payload, attempts = entry
+        if unconfirmed:
+            delay = self.outbox.backoff(attempts)
+            self.outbox.unconfirm(key, attempts, delay)
+            logger.info(f"Holding {kind} in outbox: it may have been delivered (lookup in {int(delay)}s)")
+        elif is_transient(status) and attempts < self.outbox.max_attempts:
+            delay = max(self._deferral(kind), self.outbox.backoff(attempts))
+            self.outbox.retry(key, attempts, delay)
+            logger.info(f"Queued {kind} in outbox (retry in {int(delay)}s, attempt {attempts})")
+        else:
+            self.outbox.drop(key)
+            if is_transient(status):
+                self._release(kind, payload)  # Never got through: the target is still worth a try
+            logger.warning(f"Dropped {kind} from outbox after {attempts} attempt(s) (status {status})")
+
+    def _resolve_interrupted(self, entry: Entry, published: Optional[bool]):
+        """Finish or requeue a write found in flight at startup or left unconfirmed by a timeout"""
+        key, kind, payload, attempts = entry
+        if published is None:
+            return  # Couldn't tell yet; look again on the next drain
+        self.outbox.recovered += 1
+        if published:
+            self.outbox.complete(key)
+            self._claim(kind, payload)
+            logger.info(f"Outbox: unconfirmed {kind} had been delivered")
+        else:
+            self.outbox.retry(key, attempts, 0)
+            logger.info(f"Outbox: resending unconfirmed {kind}")
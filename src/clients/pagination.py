@@ -0,0 +1,147 @@
+"""
+Pagination - Page-by-page iteration over Moltbook list endpoints
+
+List endpoints take a `limit`; responses may also carry a cursor or offset
+(top level, or under "pagination"/"meta"). The iterators follow whichever the
+server provides and fall back to offset paging, stopping on a short or empty
+page, `has_more: false`, a page that repeats the previous one (the server
+ignored the offset) or `max_pages`. Only one page is held at a time, and the
+next page is fetched in the background while the current one is consumed,
+but only when the request budget has a slot free right now - otherwise the
+fetch waits until the page is actually needed.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterator, AsyncIterator, Awaitable
+
+logger = logging.getLogger(__name__)
+
+Page = Tuple[List[Any], Dict[str, Any]]  # (items, pagination metadata)
+
+META_KEYS = ("next_cursor", "cursor", "next_offset", "has_more", "offset")
+
+
+def parse_page(data: Any, key: str) -> Page:
+    """Items under `key` (or "data", or a bare list) and any pagination metadata"""
+    if isinstance(data, list):
+        return data, {}
+    if not isinstance(data, dict):
+        return [], {}
+    if "success" in data and not data["success"]:
+        logger.error(f"API Error: {data.get('error', 'Unknown error')}")
+        return [], {}
+    items = data.get(key)
+    if not isinstance(items, list):
+        items = data.get("data") if isinstance(data.get("data"), list) else []
+    meta = {name: data[name] for name in META_KEYS if name in data}
+    for section in ("pagination", "meta"):
+        if isinstance(data.get(section), dict):
+            meta.update(data[section])
+    return items, meta
+
+
+def next_params(params: Dict[str, Any], items: List[Dict[str, Any]], meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Query params for the page after this one, or None if this was the last"""
+    if not items or meta.get("has_more") is False:
+        return None
+    cursor = meta.get("next_cursor") or meta.get("cursor")
+    if cursor:
+        following = {k: v for k, v in params.items() if k != "offset"}
+        following["cursor"] = cursor
+        return following
+    limit = params.get("limit")
+    if limit and len(items) < limit and not meta.get("has_more"):
+        return None
+    offset = meta.get("next_offset")
+    if offset is None:
+        offset = params.get("offset", 0) + len(items)
+    return {**params, "offset": offset}
+
+
+def _repeats(items: List[Dict[str, Any]], previous: set) -> bool:
+    ids = {item.get("id") for item in items}
+    return bool(previous) and ids <= previous
+
+
+def iter_pages(fetch: Callable[[Dict[str, Any]], Page], params: Dict[str, Any],
+               can_prefetch: Callable[[], bool], max_pages: int = 10) -> Iterator[List[Any]]:
+    """
+    Pages of a list endpoint, prefetching the next one on a worker thread
+
+    Args:
+        fetch: Fetches one page for the given params
+        params: Params of the first page
+        can_prefetch: Whether a background request may be sent right now
+        max_pages: Pages fetched at most
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="moltbook-prefetch")
+    pending = None
+    try:
+        page, previous, fetched = fetch(params), set(), 1
+        while True:
+            items, meta = page
+            if _repeats(items, previous):
+                return
+            following = next_params(params, items, meta) if fetched < max_pages else None
+            if following is not None and can_prefetch():
+                pending = executor.submit(fetch, following)
+            if items:
+                yield items
+            if following is None:
+                return
+            page = pending.result() if pending is not None else fetch(following)
+            params, previous, pending, fetched = following, {item.get("id") for item in items}, None, fetched + 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_items(pages: Iterator[List[Any]], until: Optional[Callable[[Any], bool]] = None) -> Iterator[Any]:
+    """Items of successive pages, stopping before the first one matching `until`"""
+    try:
+        for items in pages:
+            for item in items:
+                if until is not None and until(item):
+                    return
+                yield item
+    finally:
+        pages.close()
+
+
+async def aiter_pages(fetch: Callable[[Dict[str, Any]], Awaitable[Page]], params: Dict[str, Any],
+                      can_prefetch: Callable[[], bool], max_pages: int = 10) -> AsyncIterator[List[Any]]:
+    """Async variant of iter_pages(); the next page is prefetched as a task"""
+    pending = None
+    try:
+        page, previous, fetched = await fetch(params), set(), 1
+        while True:
+            items, meta = page
+            if _repeats(items, previous):
+                return
+            following = next_params(params, items, meta) if fetched < max_pages else None
+            if following is not None and can_prefetch():
+                pending = asyncio.ensure_future(fetch(following))
+            if items:
+                yield items
+            if following is None:
+                return
+            page = await pending if pending is not None else await fetch(following)
+            params, previous, pending, fetched = following, {item.get("id") for item in items}, None, fetched + 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def aiter_items(pages: AsyncIterator[List[Any]],
+                      until: Optional[Callable[[Any], bool]] = None) -> AsyncIterator[Any]:
+    """Async variant of iter_items()"""
+    try:
+        async for items in pages:
+            for item in items:
+                if until is not None and until(item):
+                    return
+                yield item
+    finally:
+        await pages.aclose()
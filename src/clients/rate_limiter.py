@@ -0,0 +1,225 @@
+"""
+Rate Limiter - Token buckets for the documented Moltbook budgets
+"""
+import time
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket holding `capacity` tokens refilled over `period` seconds"""
+
+    def __init__(self, capacity: float, period: float, now: float):
+        """
+        Initialize bucket (starts full)
+
+        Args:
+            capacity: Max tokens (burst size)
+            period: Seconds to refill a full bucket
+            now: Current clock reading
+        """
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available"""
+        self._refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        return max(wait, self.blocked_until - now)
+
+    def take(self, now: float):
+        """Consume one token (may go negative for reservations)"""
+        self._refill(now)
+        self.tokens -= 1
+
+    def give_back(self, now: float):
+        """Return one token after an action that never reached the server"""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def block(self, now: float, seconds: float):
+        """Server told us to wait: empty the bucket and hold it closed"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def cap(self, now: float, remaining: float):
+        """Server reported how many tokens are left"""
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class RequestDeferred(RuntimeError):
+    """The global request budget could not admit a request; nothing was sent"""
+
+
+class RateLimiter:
+    """
+    Central limiter for Moltbook actions
+
+    Each action draws from one or more buckets ("comment" from both the
+    20-second cooldown and the daily budget; every HTTP call from the global
+    per-minute budget). Callers reserve a slot and sleep until it opens, or are
+    told to defer when the slot is further away than the action's max wait.
+    """
+
+    # bucket name -> (capacity, period seconds)
+    DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+        "request": (100, 60),
+        "post": (1, 1800),
+        "comment": (1, 20),
+        "comment_daily": (50, 86400)
+    }
+
+    # action -> buckets it consumes
+    ACTION_BUCKETS: Dict[str, Tuple[str, ...]] = {
+        "request": ("request",),
+        "post": ("post",),
+        "comment": ("comment", "comment_daily")
+    }
+
+    # action -> longest the caller will block before deferring
+    DEFAULT_MAX_WAIT: Dict[str, float] = {
+        "request": 60.0,
+        "post": 0.0,
+        "comment": 30.0
+    }
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 max_wait: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize limiter
+
+        Args:
+            limits: Overrides for DEFAULT_LIMITS
+            max_wait: Overrides for DEFAULT_MAX_WAIT
+            clock: Monotonic clock (injectable for tests)
+            sleep: Blocking sleep (injectable for tests)
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.max_wait = {**self.DEFAULT_MAX_WAIT, **(max_wait or {})}
+        self._lock = threading.Lock()
+        now = clock()
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(capacity, period, now)
+            for name, (capacity, period) in {**self.DEFAULT_LIMITS, **(limits or {})}.items()
+        }
+
+    @classmethod
+    def from_config(cls, rate_limits: Optional[Dict[str, Any]] = None, **kwargs) -> "RateLimiter":
+        """Build limiter from the config.json 'rate_limits' section"""
+        rate_limits = rate_limits or {}
+        limits = {
+            "request": (rate_limits.get("requests_per_minute", 100), 60),
+            "post": (1, rate_limits.get("post_interval_seconds", 1800)),
+            "comment": (1, rate_limits.get("comment_interval_seconds", 20)),
+            "comment_daily": (rate_limits.get("comments_per_day", 50), 86400)
+        }
+        max_wait = {"comment": rate_limits.get("max_comment_wait_seconds", 30)}
+        return cls(limits=limits, max_wait=max_wait, **kwargs)
+
+    def _buckets_for(self, action: str):
+        return [self.buckets[name] for name in self.ACTION_BUCKETS.get(action, (action,))]
+
+    def time_until(self, action: str) -> float:
+        """Seconds until `action` may run (0 if it may run now)"""
+        with self._lock:
+            now = self.clock()
+            return max(bucket.delay(now) for bucket in self._buckets_for(action))
+
+    def can_acquire(self, action: str) -> bool:
+        """Whether `action` would be admitted within its max wait"""
+        return self.time_until(action) <= self.max_wait.get(action, 0.0)
+
+    def reserve(self, action: str, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve a slot for `action`
+
+        Args:
+            action: Action name ("request", "post", "comment")
+            max_wait: Longest acceptable wait (defaults to the action's max wait)
+
+        Returns:
+            Seconds the caller must wait before acting, or None to defer
+        """
+        if max_wait is None:
+            max_wait = self.max_wait.get(action, 0.0)
+        with self._lock:
+            now = self.clock()
+            buckets = self._buckets_for(action)
+            wait = max(bucket.delay(now) for bucket in buckets)
+            if wait > max_wait:
+                return None
+            for bucket in buckets:
+                bucket.take(now)
+            return wait
+
+    def acquire(self, action: str, max_wait: Optional[float] = None) -> bool:
+        """Block until `action` may run; False if it has to be deferred"""
+        wait = self.reserve(action, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            self.sleep(wait)
+        return True
+
+    async def acquire_async(self, action: str, max_wait: Optional[float] = None) -> bool:
+        """Async variant of acquire() that yields to the event loop while waiting"""
+        wait = self.reserve(action, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def release(self, action: str):
+        """Refund a reservation whose request failed before being counted"""
+        with self._lock:
+            now = self.clock()
+            for bucket in self._buckets_for(action):
+                bucket.give_back(now)
+
+    def penalize(self, action: str, retry_after_seconds: float):
+        """Learn from a 429: hold the action's primary bucket closed"""
+        with self._lock:
+            bucket = self._buckets_for(action)[0]
+            bucket.block(self.clock(), float(retry_after_seconds))
+        logger.debug(f"Rate limiter: {action} blocked for {retry_after_seconds}s")
+
+    def update_remaining(self, bucket_name: str, remaining: Any):
+        """Learn a server-reported remaining budget (e.g. daily_remaining)"""
+        try:
+            remaining = float(remaining)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self.buckets[bucket_name].cap(self.clock(), remaining)
+
+    def record_past(self, action: str, seconds_ago: float):
+        """Account for an action taken before this process started"""
+        with self._lock:
+            now = self.clock()
+            for bucket in self._buckets_for(action):
+                bucket.take(now)
+                bucket.tokens = min(bucket.capacity, bucket.tokens + max(0.0, seconds_ago) * bucket.rate)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Seconds until each bucket has a token"""
+        with self._lock:
+            now = self.clock()
+            return {name: round(bucket.delay(now), 1) for name, bucket in self.buckets.items()}
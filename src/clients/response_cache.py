@@ -0,0 +1,157 @@
+"""
+Response Cache - Read-through LRU cache with per-endpoint TTLs for GET endpoints
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable
+
+
+class CachedResponse:
+    """Minimal stand-in for a 200 response served from cache"""
+
+    status_code = 200
+
+    def __init__(self, data: Any):
+        self._data = data
+        self.headers = {"content-type": "application/json"}
+        self.from_cache = True
+
+    def json(self) -> Any:
+        """Cached decoded body (shared - callers must not mutate it)"""
+        return self._data
+
+
+class CacheEntry:
+    """Cached body plus validators"""
+
+    __slots__ = ("data", "size", "expires_at", "etag", "last_modified")
+
+    def __init__(self, data: Any, size: int, expires_at: float,
+                 etag: Optional[str], last_modified: Optional[str]):
+        self.data = data
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    """Bounded LRU of decoded GET responses with TTLs and ETag/Last-Modified revalidation"""
+
+    # endpoint -> seconds a response stays fresh
+    DEFAULT_TTLS: Dict[str, float] = {
+        "profile": 300,
+        "submolts": 3600,
+        "submolt": 600,
+        "moderators": 600,
+        "comments": 60
+    }
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 512,
+                 max_bytes: int = 4 * 1024 * 1024, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize cache
+
+        Args:
+            ttls: Overrides for DEFAULT_TTLS
+            max_entries: Max cached responses
+            max_bytes: Max total size of cached response bodies
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, cache: Optional[Dict[str, Any]] = None) -> "ResponseCache":
+        """Build cache from the config.json 'cache' section"""
+        cache = cache or {}
+        return cls(ttls=cache.get("ttl_seconds"),
+                   max_entries=cache.get("max_entries", 512),
+                   max_bytes=cache.get("max_bytes", 4 * 1024 * 1024))
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key for a URL and query parameters"""
+        if not params:
+            return url
+        return url + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+    def get_fresh(self, key: str) -> Optional[Any]:
+        """Cached data if present and unexpired (counts a hit)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self.clock():
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.data
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """Entry regardless of age, for conditional revalidation"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def store(self, key: str, endpoint: str, data: Any, size: int,
+              etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Insert or replace an entry, evicting least recently used ones"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old.size
+            self._entries[key] = CacheEntry(data, size, self.clock() + self.ttls.get(endpoint, 0),
+                                            etag, last_modified)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def refresh(self, key: str, endpoint: str) -> Optional[Any]:
+        """Extend an entry's lifetime after a 304 Not Modified"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = self.clock() + self.ttls.get(endpoint, 0)
+            self._entries.move_to_end(key)
+            self.revalidated += 1
+            return entry.data
+
+    def record_miss(self):
+        """Count a request that had to go to the network"""
+        with self._lock:
+            self.misses += 1
+
+    def invalidate(self, prefix: str):
+        """Drop every entry whose key starts with prefix"""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._bytes -= self._entries.pop(key).size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and footprint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
@@ -0,0 +1,248 @@
+"""
+Responses - Status handling shared by the sync and async Moltbook clients
+
+The two clients send requests their own way (requests vs httpx) but must
+react to the answers identically: count responses and learn from 429s, give
+limiter slots back for writes the server refused, record delivered writes in
+the action state, and log error bodies. Client methods only build and send
+the request and hand the response to one of these helpers.
+"""
+import time
+import logging
+from typing import Optional, Dict, Any, List, Tuple, Type
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # optional dependency: pip install httpx
+    httpx = None
+
+from src.clients.json_codec import response_json, error_data
+from src.clients.models import Model
+from src.clients.outbox import write_key, write_status, write_unconfirmed
+from src.clients.pagination import Page, parse_page
+from src.clients.rate_limiter import RequestDeferred
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+OK = (200, 201)
+OK_OR_EMPTY = (200, 201, 204)
+
+# Failures raised before the request left the client: the server never saw it
+UNSENT: Tuple[Type[BaseException], ...] = (RequestDeferred, requests.ConnectionError)
+if httpx is not None:
+    UNSENT += (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def json_body(res) -> Dict[str, Any]:
+    """Decoded JSON object body whatever the content-type (429s may omit it), or {}"""
+    try:
+        data = response_json(res)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _log_suggestion(data: Dict[str, Any]):
+    """Log the follow suggestion Moltbook attaches to some write responses"""
+    if data.get('suggestion') and not data.get('already_following'):
+        if (data.get('author') or {}).get('name'):
+            logger.info(f"{data['suggestion']}")
+
+
+class ResponseMixin:
+    """Response handling shared by the sync and async Moltbook clients"""
+
+    # Transport bookkeeping
+
+    @staticmethod
+    def _with_write_key(method: str, headers: Dict[str, str]) -> Dict[str, str]:
+        """Add the outbox idempotency key to a journaled POST"""
+        key = write_key.get()
+        if key and method.lower() == "post":
+            return {**headers, "Idempotency-Key": key}
+        return headers
+
+    def _record_response(self, res, endpoint: str):
+        """Count a response and hold the request budget closed after a 429"""
+        metrics.inc("moltbook_responses_total", status=res.status_code)
+        write_status.set(res.status_code)
+        if res.status_code == 429:
+            metrics.inc("moltbook_rate_limited_total", endpoint=endpoint)
+            retry_after = res.headers.get("Retry-After")
+            if retry_after and str(retry_after).isdigit():
+                self.limiter.penalize("request", int(retry_after))
+
+    @staticmethod
+    def _record_error(error: Exception, endpoint: str):
+        """Count a failed request; a journaled write it may have delivered needs a lookup before any resend"""
+        metrics.inc("moltbook_errors_total", endpoint=endpoint)
+        if write_key.get() and not isinstance(error, UNSENT):
+            write_unconfirmed.set(True)
+
+    @staticmethod
+    def _succeeded(res, failure: Optional[str] = None, statuses: Tuple[int, ...] = OK, hint: bool = False) -> bool:
+        """Whether the call succeeded; otherwise log `failure` with the server's error"""
+        if res.status_code in statuses:
+            return True
+        if failure:
+            data = error_data(res)
+            logger.error(f"{failure} ({res.status_code}): {data.get('error', res.text)}")
+            if hint and 'hint' in data:
+                logger.info(f"Hint: {data['hint']}")
+        return False
+
+    # Rate-limited writes
+
+    def _write_failed(self, action: str, error: Exception, message: str):
+        """Log a write that raised; refund its slot when the request never went out"""
+        if isinstance(error, UNSENT):
+            self.limiter.release(action)
+        logger.error(f"{message}: {error}")
+
+    def _post_result(self, res, content: str, submolt: str) -> bool:
+        if res.status_code in OK:
+            self.last_post_time = time.time()
+            logger.info(f"Posted to m/{submolt}: {content[:50]}...")
+            return True
+        if res.status_code == 429:
+            retry_after = json_body(res).get('retry_after_minutes', 30)
+            self.limiter.penalize("post", retry_after * 60)
+            logger.warning(f"Rate limited: wait {retry_after} minutes before posting again")
+        else:
+            self.limiter.release("post")
+            self._succeeded(res, "Post Failed", hint=True)
+        return False
+
+    def _comment_result(self, res, post_id: str, content: str, comment_id: Optional[str] = None) -> bool:
+        """Outcome of a reply to a post, or to one of its comments when `comment_id` is given"""
+        if res.status_code in OK:
+            if comment_id:
+                self.replied_comments.add(comment_id)
+            else:
+                self.replied_posts.add(post_id)
+            self.cache.invalidate(f"{self.api_base}/posts/{post_id}/comments")
+            logger.info(f"Replied to {'comment' if comment_id else 'post'}: {content[:50]}...")
+            _log_suggestion(json_body(res))
+            return True
+        if res.status_code == 429:
+            data = json_body(res)
+            retry_after = data.get('retry_after_seconds', 20)
+            daily_remaining = data.get('daily_remaining', '?')
+            self._learn_comment_limit(retry_after, daily_remaining)
+            logger.warning(f"Comment rate limit: wait {retry_after}s (daily remaining: {daily_remaining})")
+        else:
+            self.limiter.release("comment")
+            self._succeeded(res, "Reply to comment failed" if comment_id else "Reply Failed")
+        return False
+
+    def _learn_comment_limit(self, retry_after: Any, daily_remaining: Any):
+        """Feed a comment 429 payload back into the limiter"""
+        self.limiter.penalize("comment", float(retry_after))
+        self.limiter.update_remaining("comment_daily", daily_remaining)
+
+    def _vote_result(self, res, post_id: str) -> bool:
+        if res.status_code not in OK:
+            return False
+        self.voted_posts.add(post_id)
+        logger.info(f"Upvoted post {post_id[:8]}...")
+        _log_suggestion(json_body(res))
+        return True
+
+    def _message_result(self, res, needs_human_input: bool) -> bool:
+        if not self._succeeded(res, "Send message failed"):
+            return False
+        logger.info(f"Sent message{' [HUMAN NEEDED]' if needs_human_input else ''}")
+        return True
+
+    def _subscribe_result(self, res, submolt_name: str) -> bool:
+        if res.status_code not in OK:
+            return False
+        self.subscribed_submolts.add(submolt_name)
+        self.cache.invalidate(f"{self.api_base}/submolts/{submolt_name}")
+        logger.info(f"Subscribed to m/{submolt_name}")
+        return True
+
+    # Reads
+
+    @staticmethod
+    def _page_result(res, key: str, model: Type[Model]) -> Page:
+        """Items of one list page as models, with the page's pagination metadata"""
+        if res.status_code == 200:
+            items, meta = parse_page(response_json(res), key)
+            return model.many(items), meta
+        if res.status_code == 429:
+            logger.warning(f"Rate limited on {key} fetch")
+        return [], {}
+
+    @staticmethod
+    def _success_data(res) -> Optional[Dict[str, Any]]:
+        """Body of a 200 response with success: true, else None"""
+        if res.status_code != 200:
+            return None
+        data = response_json(res)
+        return data if isinstance(data, dict) and data.get('success') else None
+
+    @staticmethod
+    def _listing(res, key: str) -> List[Dict[str, Any]]:
+        """List under `key` of a success envelope (or a bare list body)"""
+        if res.status_code != 200:
+            return []
+        data = response_json(res)
+        if isinstance(data, dict) and data.get('success'):
+            return data.get(key, [])
+        return data if isinstance(data, list) else []
+
+    @staticmethod
+    def _submolt_result(res) -> Optional[Dict[str, Any]]:
+        if res.status_code != 200:
+            return None
+        data = response_json(res)
+        if isinstance(data, dict) and data.get('success'):
+            return data.get('submolt')
+        return data if isinstance(data, dict) else None
+
+    def _created_submolt(self, res, name: str) -> Optional[Dict[str, Any]]:
+        if not self._succeeded(res, "Create submolt failed", hint=True):
+            return None
+        data = response_json(res)
+        logger.info(f"Created submolt m/{name}")
+        return data.get('submolt') if isinstance(data, dict) else data
+
+    @staticmethod
+    def _dm_activity(res) -> Dict[str, Any]:
+        if res.status_code != 200:
+            return {"success": False, "has_activity": False}
+        data = response_json(res)
+        if data.get('has_activity'):
+            logger.info(f"DM Activity: {data.get('summary', 'New activity')}")
+        return data
+
+    def _chat_requests(self, res) -> List[Dict[str, Any]]:
+        data = self._success_data(res)
+        if data is None:
+            return []
+        requests_data = data.get('requests', {})
+        items = requests_data.get('items', []) if isinstance(requests_data, dict) else []
+        if items:
+            logger.info(f"{len(items)} pending chat request(s)")
+        return items
+
+    def _conversations(self, res) -> List[Dict[str, Any]]:
+        data = self._success_data(res)
+        if data is None:
+            return []
+        convos = data.get('conversations', {})
+        items = convos.get('items', []) if isinstance(convos, dict) else []
+        total_unread = data.get('total_unread', 0)
+        if total_unread > 0:
+            logger.info(f"{len(items)} conversation(s), {total_unread} unread")
+        return items
+
+    def _conversation(self, res, conversation_id: str) -> Optional[Dict[str, Any]]:
+        data = self._success_data(res)
+        if data is not None:
+            logger.info(f"Read conversation {conversation_id[:8]}... ({len(data.get('messages', []))} messages)")
+        return data
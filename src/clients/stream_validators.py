@@ -0,0 +1,62 @@
+"""
+Stream Validators - Incremental checks that can abort a streaming generation early
+"""
+from typing import Optional
+
+_WRAPPERS = ' \t\n"*'
+
+
+class StreamValidator:
+    """
+    Checks a generation as it streams in
+
+    check() is called with the accumulated text after every chunk (final=False)
+    and once more with the complete text (final=True). It returns None while
+    the output is acceptable, or a short reason to abort/reject it.
+    """
+
+    def check(self, text: str, final: bool = False) -> Optional[str]:
+        raise NotImplementedError
+
+
+class LengthValidator(StreamValidator):
+    """Reject output longer than max_chars (as soon as it gets there) or shorter than min_chars"""
+
+    def __init__(self, max_chars: int, min_chars: int = 0):
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+
+    def check(self, text: str, final: bool = False) -> Optional[str]:
+        length = len(text.strip(_WRAPPERS))
+        if length > self.max_chars:
+            return f"over {self.max_chars} chars"
+        if final and length < self.min_chars:
+            return f"under {self.min_chars} chars"
+        return None
+
+
+class PostFormatValidator(StreamValidator):
+    """Require 'TITLE: ... CONTENT: ...' with a bounded title and content length"""
+
+    def __init__(self, max_chars: int, min_chars: int = 0, max_title_chars: int = 150):
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self.max_title_chars = max_title_chars
+
+    def check(self, text: str, final: bool = False) -> Optional[str]:
+        body = text.lstrip(_WRAPPERS)
+        if len(body) >= len("TITLE:") and not body.upper().startswith("TITLE:"):
+            return "missing TITLE:"
+
+        split = body.find("CONTENT:")
+        if split < 0:
+            if final or len(body) > self.max_title_chars + len("TITLE:"):
+                return "missing CONTENT:"
+            return None
+
+        content = body[split + len("CONTENT:"):].strip(_WRAPPERS)
+        if len(content) > self.max_chars:
+            return f"content over {self.max_chars} chars"
+        if final and len(content) < self.min_chars:
+            return f"content under {self.min_chars} chars"
+        return None
@@ -0,0 +1,95 @@
+"""
+HTTP Transport - Pooled, keep-alive session shared by API clients
+"""
+import logging
+from typing import Optional, Dict, Any, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class HttpTransport:
+    """Pooled requests.Session with timeouts and retry/backoff"""
+
+    # Methods that are safe to replay after the request reached the server
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_retries: int = 3, backoff_factor: float = 0.5,
+                 retry_statuses: Tuple[int, ...] = (500, 502, 503, 504)):
+        """
+        Initialize transport
+
+        Args:
+            pool_connections: Number of host pools to cache
+            pool_maxsize: Max keep-alive connections per host
+            connect_timeout: Seconds to wait for a TCP/TLS connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Retries for connection errors and retryable statuses
+            backoff_factor: Exponential backoff base between retries
+            retry_statuses: HTTP statuses retried for idempotent methods
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+
+        # Connection errors are retried for every method (the request never
+        # reached the server); read errors and statuses only for idempotent ones.
+        # 429 is left to the caller, which knows the endpoint's budget.
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=retry_statuses,
+            allowed_methods=self.IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_config(cls, network: Optional[Dict[str, Any]] = None) -> "HttpTransport":
+        """Build transport from the config.json 'network' section"""
+        network = network or {}
+        return cls(
+            pool_connections=network.get("pool_connections", 10),
+            pool_maxsize=network.get("pool_maxsize", 10),
+            connect_timeout=network.get("connect_timeout_seconds", 5.0),
+            read_timeout=network.get("read_timeout_seconds", 30.0),
+            max_retries=network.get("max_retries", 3),
+            backoff_factor=network.get("backoff_factor", 0.5)
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send GET request"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send POST request"""
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        """Send PATCH request"""
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        """Send DELETE request"""
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
@@ -1,4 +1,6 @@
 """Core module exports"""
 from src.core.agent import Agent
+from src.core.async_agent import AsyncAgent
+from src.core.supervisor import Supervisor
 
-__all__ = ["Agent"]
+__all__ = ["Agent", "AsyncAgent", "Supervisor"]
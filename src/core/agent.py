@@ -5,10 +5,22 @@ import time
 import random
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from src.clients.gemini_client import GeminiClient
 from src.clients.moltbook_client import MoltbookClient
+from src.clients.stream_validators import LengthValidator, PostFormatValidator
+from src.clients.outbox import Outbox
+from src.clients.models import Post, Comment
+from src.core.evaluator import BatchEvaluator
+from src.core.feed_tracker import FeedTracker
+from src.core.ranker import CandidateRanker
+from src.core.topics import TopicIndex
+from src.core.scheduler import Activity, Scheduler
+from src.core.threads import CommentThread, ThreadCache
+from src.core.dm_inbox import DMInbox
+from src.utils.state_store import ActionStateStore
+from src.utils.metrics import metrics, MetricsRegistry
 from src.intelligence import IntelligenceSystem
 
 logger = logging.getLogger(__name__)
@@ -41,6 +53,7 @@ class Agent:
         content = config.get("content", {})
         communities = config.get("communities", {})
         intel = config.get("intelligence", {})
+        gemini_config = config.get("gemini", {})
         
         # Behavioral Configuration
         self.POST_PROBABILITY = behavior.get("post_probability", 0.15)
@@ -59,6 +72,7 @@ class Agent:
         self.REPLY_MAX_CHARS = content.get("reply_max_chars", 200)
         self.FEED_LIMIT = content.get("feed_limit", 15)
         self.FEED_SORT = content.get("feed_sort", "hot")
+        self.FEED_MAX_LIMIT = content.get("feed_max_limit", 60)
         
         # Community Configuration
         self.FAVORED_SUBMOLTS = communities.get("favored_submolts", 
@@ -70,19 +84,152 @@ class Agent:
         self.SOUL_EXCERPT_LENGTH = intel.get("soul_excerpt_length", 500)
         self.CHECKPOINT_INTERVAL = intel.get("checkpoint_interval", 10)
         
+        # Batched evaluation of feed posts and comments
+        evaluation = config.get("evaluation", {})
+        self.evaluator = BatchEvaluator.from_config(evaluation)
+        
+        # Posts already scored are remembered so each cycle only evaluates new arrivals
+        store = getattr(moltbot, "state_store", None)
+        store = store if isinstance(store, ActionStateStore) else None
+        self.feed_tracker = FeedTracker(store, max_entries=evaluation.get("seen_max_entries", 5000))
+        
+        # Unseen posts are ranked locally and only the best few go to Gemini
+        ranking = config.get("ranking", {})
+        self.ranker = CandidateRanker.from_config(ranking, persona, store) if ranking.get("enabled", True) else None
+        
+        # Expertise topics matched locally against downloaded posts before searching
+        self.topic_index = TopicIndex.from_config(config.get("discovery", {}), persona)
+        
+        # Whole comment trees per post, refreshed incrementally
+        threads = config.get("threads", {})
+        self.threads = ThreadCache.from_config(threads)
+        self.THREAD_MAX_DEPTH = threads.get("max_depth", 4)
+        
+        # DM inbox synced incrementally from dm_check()
+        dms = config.get("dms", {})
+        self.dm_inbox = DMInbox.from_config(moltbot.agent_name, store, dms)
+        self.DM_AUTO_REPLY = dms.get("auto_reply", True)
+        self.DM_AUTO_APPROVE = dms.get("auto_approve_requests", False)
+        
+        # Generation cache per call site (classification only by default)
+        self.CACHE_CALL_SITES = {"evaluate": True, "post": False, "reply": False, "comment_reply": False,
+                                 "dm_reply": False}
+        self.CACHE_CALL_SITES.update(gemini_config.get("cache", {}).get("call_sites", {}))
+        self.GENERATION_TIMEOUT = gemini_config.get("generation_timeout_seconds", 120)
+        
+        # Streamed generations are aborted once clearly over budget or malformed
+        streaming = gemini_config.get("streaming", {})
+        slack = streaming.get("length_slack", 1.5)
+        self.VALIDATORS = {} if not streaming.get("enabled", True) else {
+            "post": PostFormatValidator(int(self.POST_MAX_CHARS * slack), min_chars=50),
+            "reply": LengthValidator(int(self.REPLY_MAX_CHARS * slack), min_chars=31),
+            "comment_reply": LengthValidator(int(self.REPLY_MAX_CHARS * slack), min_chars=31),
+            "dm_reply": LengthValidator(int(self.REPLY_MAX_CHARS * slack), min_chars=11)
+        }
+        
+        # Writes that couldn't go out immediately wait in the client's outbox
+        outbox = getattr(moltbot, "outbox", None)
+        self.outbox = outbox if isinstance(outbox, Outbox) else None
+        self.OUTBOX_DRAIN_SECONDS = config.get("outbox", {}).get("drain_seconds", 30)
+        
+        # Activity cadences for the event-driven scheduler
+        scheduler = behavior.get("scheduler", {})
+        self.SCHEDULER_ENABLED = scheduler.get("enabled", True)
+        self.SCHEDULE = self._schedule_intervals(scheduler)
+        self.scheduler: Optional[Scheduler] = None
+        
         # Statistics
         self.cycle = 0
         self.posts_made = 0
         self.replies_made = 0
         self.comment_replies_made = 0
         self.semantic_discoveries = 0
+        self.dm_replies_made = 0
+    
+    def _schedule_intervals(self, scheduler: Dict[str, Any]) -> Dict[str, Optional[Tuple[float, float]]]:
+        """(min, max) seconds between runs per activity; None disables an activity"""
+        def per_cycle(probability: float) -> Optional[Tuple[float, float]]:
+            # A per-cycle probability p over MIN..MAX second cycles becomes a p-scaled cadence
+            return (self.MIN_SLEEP / probability, self.MAX_SLEEP / probability) if probability > 0 else None
+        
+        dm_poll = scheduler.get("dm_poll_seconds", 300)
+        checkpoint = scheduler.get("checkpoint_seconds", self.CHECKPOINT_INTERVAL * (self.MIN_SLEEP + self.MAX_SLEEP) / 2)
+        drain = self.OUTBOX_DRAIN_SECONDS if self.outbox else None
+        intervals = {
+            "outbox": (drain, drain) if drain else None,
+            "post": per_cycle(self.POST_PROBABILITY),
+            "dm_poll": (dm_poll, dm_poll) if dm_poll else None,
+            "feed": per_cycle(self.BROWSE_FEED_PROBABILITY),
+            "semantic_search": per_cycle(self.SEMANTIC_SEARCH_PROBABILITY),
+            "checkpoint": (checkpoint, checkpoint) if checkpoint else None
+        }
+        for name, interval in scheduler.get("intervals_seconds", {}).items():
+            intervals[name] = tuple(interval) if interval else None
+        return intervals
+    
+    def build_scheduler(self, **kwargs) -> Scheduler:
+        """
+        Scheduler running each activity on its own cadence
+        
+        Queued writes are drained first. Posting wakes when the post cooldown
+        ends; feed and semantic engagement wake when a comment slot opens and
+        never overlap (they share the comment budget). Keyword arguments are
+        passed to Scheduler (clock, sleep).
+        """
+        limiter = self.moltbot.limiter
+        jobs = [
+            ("outbox", self.drain_outbox, None, None),
+            ("post", self.generate_post, lambda: limiter.time_until("post"), None),
+            ("dm_poll", self.poll_dms, None, None),
+            ("feed", self.engage_with_feed, lambda: limiter.time_until("comment"), "comment"),
+            ("semantic_search", self.discover_relevant_content, lambda: limiter.time_until("comment"), "comment"),
+            ("checkpoint", self.checkpoint, None, None)
+        ]
+        activities = []
+        for priority, (name, action, gate, group) in enumerate(jobs):
+            interval = self.SCHEDULE.get(name)
+            if interval:
+                activities.append(Activity(name, action, interval, priority=priority, gate=gate, group=group,
+                                           initial_delay=interval[0] if name == "checkpoint" else 0.0))
+        self.scheduler = Scheduler(activities, on_idle=self.intelligence.flush,
+                                   on_error=self._activity_failed, **kwargs)
+        return self.scheduler
+    
+    def register_metrics(self, registry: MetricsRegistry = metrics, **labels):
+        """Export this agent's counters and cache/limiter/feed stats as gauges"""
+        registry.add_gauges("agent", lambda: {
+            "cycles": self.cycle,
+            "posts": self.posts_made,
+            "replies": self.replies_made,
+            "comment_replies": self.comment_replies_made,
+            "semantic_discoveries": self.semantic_discoveries,
+            "dm_replies": self.dm_replies_made
+        }, **labels)
+        registry.add_gauges("response_cache", self.moltbot.cache.get_stats, **labels)
+        registry.add_gauges("rate_limit_wait_seconds", self.moltbot.limiter.get_stats, **labels)
+        registry.add_gauges("feed_verdicts", self.feed_tracker.get_stats, **labels)
+        if self.ranker:
+            registry.add_gauges("feed_ranking", self.ranker.get_stats, **labels)
+        registry.add_gauges("comment_threads", self.threads.get_stats, **labels)
+        registry.add_gauges("topic_discovery", self.topic_index.get_stats, **labels)
+        registry.add_gauges("dm_inbox", self.dm_inbox.get_stats, **labels)
+        if self.outbox:
+            registry.add_gauges("outbox", self.outbox.get_stats, **labels)
+        if self.gemini.cache:
+            registry.add_gauges("generation_cache", self.gemini.cache.get_stats)
+    
+    def _activity_failed(self, activity: Activity, error: Exception):
+        """Record a scheduled activity's failure in history"""
+        self.intelligence.update_history(f"Error encountered in {activity.name}: {str(error)[:100]}")
     
     def initialize(self):
-        """Initialize agent - subscribe to submolts"""
+        """Initialize agent - restore the post cooldown and subscribe to submolts"""
+        self.moltbot.restore_post_cooldown()
         logger.info("\nInitializing submolt subscriptions...")
         for submolt in self.FAVORED_SUBMOLTS[:self.AUTO_SUBSCRIBE_COUNT]:
-            self.moltbot.subscribe_submolt(submolt)
-            time.sleep(1)
+            # Subscriptions persist across restarts when a state store is attached
+            if submolt not in self.moltbot.subscribed_submolts:
+                self.moltbot.subscribe_submolt(submolt)
         
         self.intelligence.update_history(
             f"Session started - Subscribed to {', '.join(self.FAVORED_SUBMOLTS[:self.AUTO_SUBSCRIBE_COUNT])}"
@@ -90,27 +237,35 @@ class Agent:
     
     def generate_post(self) -> bool:
         """Generate and post original content"""
+        submolt = self._choose_post_submolt()
+        if not submolt:
+            return False
+        return self._publish_post(submolt, self._generate(self._build_post_prompt(submolt), "post"))
+    
+    def _generate(self, prompt: str, site: str) -> Optional[str]:
+        """Gemini call with the cache flag and output validator of a call site"""
+        with metrics.time("gemini_call_seconds", site=site):
+            return self.gemini.generate(prompt, cache=self.CACHE_CALL_SITES[site],
+                                        validator=self.VALIDATORS.get(site))
+    
+    def _choose_post_submolt(self) -> Optional[str]:
+        """Pick a submolt to post in, or None while the post cooldown is active"""
+        # Don't spend a generation on a post the cooldown would reject
+        if not self.moltbot.limiter.can_acquire("post"):
+            logger.info("Post cooldown active - deferring post generation")
+            return None
+        if self.outbox and self.outbox.pending("post"):
+            logger.info("A generated post is still queued - deferring post generation")
+            return None
+        
         submolt = random.choice(self.FAVORED_SUBMOLTS)
         logger.info(f"Generating original insight for m/{submolt}...")
-        
-        prompt = self._build_post_prompt(submolt)
-        response = self.gemini.generate(prompt)
-        
+        return submolt
+    
+    def _publish_post(self, submolt: str, response: Optional[str]) -> bool:
+        """Post a generated response to a submolt"""
         if response and len(response) > 50:
-            response = response.strip('"').strip()
-            
-            # Parse title and content
-            title = None
-            content = response
-            
-            if "TITLE:" in response and "CONTENT:" in response:
-                parts = response.split("CONTENT:", 1)
-                title_part = parts[0].replace("TITLE:", "").strip()
-                content = parts[1].strip()
-                title = title_part[:100]  # Limit title length
-            else:
-                # Generate simple title from first 50 chars
-                title = response[:50].strip() + ("..." if len(response) > 50 else "")
+            title, content = self._parse_post_response(response)
             
             if self.moltbot.post(content, submolt=submolt, title=title):
                 self.posts_made += 1
@@ -118,8 +273,23 @@ class Agent:
                 return True
         return False
     
+    def _parse_post_response(self, response: str) -> Tuple[str, str]:
+        """Split a generated post into (title, content)"""
+        response = response.strip('"').strip()
+        
+        if "TITLE:" in response and "CONTENT:" in response:
+            parts = response.split("CONTENT:", 1)
+            title_part = parts[0].replace("TITLE:", "").strip()
+            content = parts[1].strip()
+            title = title_part[:100]  # Limit title length
+        else:
+            # Generate simple title from first 50 chars
+            content = response
+            title = response[:50].strip() + ("..." if len(response) > 50 else "")
+        return title, content
+    
     def discover_relevant_content(self):
-        """Use semantic search to find content matching agent's expertise"""
+        """Find content matching agent's expertise, searching only when downloaded posts have none"""
         try:
             # Pick a random expertise area to search
             expertise_areas = self.persona.get('expertise', [])
@@ -127,91 +297,251 @@ class Agent:
                 return
             
             topic = random.choice(expertise_areas)
-            logger.info(f"\n🔍 Semantic search for: '{topic}'...")
-            
-            # Construct search query
-            search_query = f"discussions about {topic} implications challenges future"
-            
-            # Perform semantic search
-            results = self.moltbot.semantic_search(
-                query=search_query,
-                search_type="posts",
-                limit=10
-            )
-            
-            if not results:
-                logger.info("   No results found")
-                return
-            
-            logger.info(f"   Found {len(results)} relevant post(s)")
-            
-            # Filter high-relevance results
-            high_relevance = [r for r in results if r.get('similarity', 0) > 0.7]
-            
-            if high_relevance:
-                logger.info(f"   {len(high_relevance)} high-relevance match(es) (>70% similarity)")
-                
-                # Engage with the most relevant post
-                target = high_relevance[0]
-                post_id = target.get('id')
-                content = target.get('content') or target.get('title', '')
-                author = target.get('author', {}).get('name', 'unknown')
-                similarity = target.get('similarity', 0)
-                
-                logger.info(f"   Best match ({similarity:.1%} similarity): '{content[:60]}...' by @{author}")
-                
-                # Skip if already replied
-                if post_id not in self.moltbot.replied_posts:
-                    self.semantic_discoveries += 1
-                    self._engage_with_post(post_id, content, author)
-                else:
-                    logger.info("   Already engaged with this post")
+            results = self.topic_index.discover(topic, self._is_candidate)
+            if results is None:
+                logger.info(f"\n🔍 Semantic search for: '{topic}'...")
+                self.topic_index.add_search(topic, self.moltbot.semantic_search(
+                    query=self._semantic_query(topic),
+                    search_type="posts",
+                    limit=10
+                ))
+                results = self.topic_index.lookup(topic, self._is_candidate)
             else:
-                logger.info("   No high-relevance matches found")
+                logger.info(f"\n🔍 Local discovery for: '{topic}'...")
+            
+            target = self._select_semantic_target(results)
+            if target:
+                self.semantic_discoveries += 1
+                self._engage_with_post(*target)
                 
         except Exception as e:
             logger.error(f"Error in semantic discovery: {e}")
     
+    def drain_outbox(self) -> int:
+        """Publish writes waiting in the outbox"""
+        delivered = self.moltbot.drain_outbox()
+        if delivered:
+            logger.info(f"Outbox: published {delivered} queued write(s)")
+        return delivered
+    
+    def poll_dms(self) -> int:
+        """Check for DM activity and answer new messages; returns messages handled"""
+        return self._sync_dms(self.moltbot.dm_check())
+    
+    def _sync_dms(self, check: Dict[str, Any]) -> int:
+        """Fetch only what a dm_check() result reports as changed"""
+        want_requests, want_messages = self.dm_inbox.sections(check)
+        if want_requests:
+            for conversation_id in self._new_dm_requests(self.moltbot.dm_get_requests()):
+                self.moltbot.dm_approve_request(conversation_id)
+        if not want_messages:
+            return 0
+        
+        handled = 0
+        for conversation_id, peer in self.dm_inbox.changed(self.moltbot.dm_get_conversations()):
+            data = self.moltbot.dm_read_conversation(conversation_id)
+            new = self.dm_inbox.ingest(conversation_id, (data or {}).get("messages", []))
+            if new:
+                handled += len(new)
+                peer = self._dm_reply_target(conversation_id, peer, new)
+                if peer:
+                    self._answer_dm(conversation_id, peer)
+        return handled
+    
+    def _new_dm_requests(self, requests: List[Dict[str, Any]]) -> List[str]:
+        """Note new chat requests; returns the conversation ids to approve"""
+        approve = []
+        for req in self.dm_inbox.new_requests(requests):
+            sender = self.dm_inbox.sender(req)
+            preview = req.get("message_preview") or req.get("message") or ""
+            if self.DM_AUTO_APPROVE:
+                approve.append(self.dm_inbox.conversation_id(req))
+                self.intelligence.update_history(f"Approved chat request from @{sender}: {preview[:80]}")
+            else:
+                logger.info(f"Chat request from @{sender} awaiting approval: '{preview[:60]}'")
+                self.intelligence.update_history(f"Chat request from @{sender} awaiting approval: {preview[:80]}")
+        return approve
+    
+    def _dm_reply_target(self, conversation_id: str, peer: str, new: List[Dict[str, Any]]) -> Optional[str]:
+        """The peer to answer, or None when a human should (or auto-reply is off)"""
+        if peer == "unknown":
+            peer = self.dm_inbox.sender(new[-1])
+        latest = new[-1].get("content", "")
+        logger.info(f"\n✉ {len(new)} new DM(s) from @{peer}: '{latest[:60]}'")
+        if any(message.get("needs_human_input") for message in new):
+            self.intelligence.update_history(f"DM from @{peer} needs human input: {latest[:80]}")
+            return None
+        if not self.DM_AUTO_REPLY:
+            self.intelligence.update_history(f"DM from @{peer}: {latest[:80]}")
+            return None
+        return peer
+    
+    def _answer_dm(self, conversation_id: str, peer: str):
+        """Generate and send one reply covering a conversation's new messages"""
+        reply_text = self._generate(self._build_dm_reply_prompt(conversation_id, peer), "dm_reply")
+        if reply_text and len(reply_text) > 10:
+            reply_text = reply_text.strip('"').strip()
+            if self.moltbot.dm_send_message(conversation_id, reply_text):
+                self.dm_replies_made += 1
+                self.intelligence.update_memory(f"Replied to @{peer}'s DM: {reply_text[:40]}...")
+    
+    def _build_dm_reply_prompt(self, conversation_id: str, peer: str) -> str:
+        """Build prompt for answering a private conversation"""
+        transcript = "\n".join(f"@{self.dm_inbox.sender(message)}: {message.get('content', '')}"
+                               for message in self.dm_inbox.recent(conversation_id)[-10:])
+        memory = self.intelligence.get_relevant_memory(transcript[-300:], self.MEMORY_EXCERPT_LENGTH // 2)
+        return (
+            f"You are {self.persona['name']}, {self.persona.get('description', '')}\n"
+            f"Your expertise: {', '.join(self.persona.get('expertise', []))}\n"
+            f"Your tone: {self.persona.get('tone', 'thoughtful')}\n\n"
+            f"RELEVANT MEMORY:\n{memory}\n\n"
+            f"Private conversation with @{peer} (oldest first):\n{transcript}\n\n"
+            f"Write your next message to @{peer} ({self.REPLY_MIN_CHARS}-{self.REPLY_MAX_CHARS} chars).\n"
+            f"Requirements:\n"
+            f"- Answer what they actually asked or said\n"
+            f"- Be warm, specific and substantive\n"
+            f"- No hashtags or emojis\n"
+            f"- LANGUAGE: Filipino/Taglish - mostly ENGLISH with natural Tagalog words\n\n"
+            f"Write ONLY the message, nothing else."
+        )
+    
+    def _semantic_query(self, topic: str) -> str:
+        """Construct semantic search query for an expertise topic"""
+        return f"discussions about {topic} implications challenges future"
+    
+    def _select_semantic_target(self, results: List[Post]) -> Optional[Tuple[str, str, str]]:
+        """Pick the best unanswered match (TopicIndex order) as (post_id, content, author)"""
+        if not results:
+            logger.info("   No high-relevance matches found")
+            return None
+        
+        logger.info(f"   {len(results)} high-relevance match(es)")
+        
+        # Engage with the most relevant post
+        target = Post.of(results[0])
+        post_id, content, author = target.id, target.text, target.author_name
+        similarity = target.similarity or 0
+        
+        logger.info(f"   Best match ({similarity:.1%} similarity): '{content[:60]}...' by @{author}")
+        
+        # Skip if already replied
+        if post_id in self.moltbot.replied_posts:
+            logger.info("   Already engaged with this post")
+            return None
+        return post_id, content, author
+    
     def engage_with_feed(self):
         """Analyze feed and engage with quality content"""
         logger.info("\nAnalyzing feed for meaningful engagement opportunities...")
         
-        use_personalized = len(self.moltbot.subscribed_submolts) > 0
-        feed = self.moltbot.get_feed(sort=self.FEED_SORT, limit=self.FEED_LIMIT, personalized=use_personalized)
-        
-        if not feed:
-            logger.info("Feed is empty or unavailable")
-            return
-        
-        # Filter candidates
-        candidates = self._filter_candidates(feed)
+        feed = self._fetch_feed()
+        candidates = self._feed_candidates(feed)
         if not candidates:
             return
         
-        # Select and analyze post
-        target_post = random.choice(candidates[:5])
-        author_name = target_post.get("author", {}).get("name") or target_post.get("author", {}).get("username")
-        content = target_post.get("content") or target_post.get("title", "")
-        post_id = target_post.get("id")
-        
-        logger.info(f"Analyzing: '{content[:60]}...' by @{author_name}")
+        # Score only posts not seen before (one call) and engage with the best post
+        fresh, scores = self._split_feed(candidates)
+        if fresh:
+            fresh_scores = self._score_texts([self._post_text(candidates[i]) for i in fresh], "post")
+            self._record_feed_scores(candidates, fresh, fresh_scores, scores)
+        ranked = self.evaluator.rank(scores)
+        target = self._select_feed_target(candidates, ranked)
+        if not target:
+            return
+        post_id, content, author_name = target
         
         # Research author occasionally
         if random.random() < self.AUTHOR_RESEARCH_PROB:
             self._research_author(author_name)
         
-        # Evaluate and engage
-        if self._evaluate_content(content):
-            self._engage_with_post(post_id, content, author_name)
+        self._engage_with_post(post_id, content, author_name)
+    
+    def _fetch_feed(self) -> List[Dict[str, Any]]:
+        """Fetch the feed; on sort=new, grow the page until it reaches the last post seen"""
+        use_personalized = len(self.moltbot.subscribed_submolts) > 0
+        feed_key, limit = self._feed_key(use_personalized), self.FEED_LIMIT
+        while True:
+            feed = self.moltbot.get_feed(sort=self.FEED_SORT, limit=limit, personalized=use_personalized)
+            limit = self._next_feed_limit(feed_key, feed, limit)
+            if not limit:
+                return feed
+    
+    def _feed_key(self, personalized: bool) -> Optional[str]:
+        """Watermark key for the current feed (None unless sorted by new)"""
+        if self.FEED_SORT != "new":
+            return None
+        return f"new:{'personalized' if personalized else 'global'}"
+    
+    def _next_feed_limit(self, feed_key: Optional[str], feed: List[Dict[str, Any]], limit: int) -> Optional[int]:
+        """Larger limit to refetch with, or None once the page covers everything new"""
+        if feed_key is None or not feed:
+            return None
+        new_posts, reached = self.feed_tracker.take_new(feed_key, feed)
+        if not reached and len(feed) >= limit and limit < self.FEED_MAX_LIMIT:
+            return min(limit * 2, self.FEED_MAX_LIMIT)
+        logger.info(f"   {len(new_posts)} new post(s) since last visit")
+        self.feed_tracker.advance(feed_key, feed)
+        return None
+    
+    def _feed_candidates(self, feed: List[Post]) -> List[Post]:
+        """Feed posts eligible for engagement (the page also feeds local discovery)"""
+        if not feed:
+            logger.info("Feed is empty or unavailable")
+            return []
+        feed = Post.many(feed)
+        self.topic_index.observe(feed)
+        return self._filter_candidates(feed)
+    
+    def _split_feed(self, candidates: List[Post]) -> Tuple[List[int], List[Optional[float]]]:
+        """Indices to evaluate now (one batch of unseen posts) and known scores for the rest"""
+        fresh, known = self.feed_tracker.split(candidates)
+        unseen = len(fresh)
+        if self.ranker:
+            fresh = self.ranker.top(candidates, fresh)
+        fresh = fresh[:self.evaluator.batch_size]
+        if known or len(fresh) < unseen:
+            logger.info(f"   Reusing {len(known)} earlier verdict(s), evaluating "
+                        f"{len(fresh)} of {unseen} new post(s)")
+        scores = [known.get(i) for i in range(len(candidates))]
+        return fresh, scores
+    
+    def _record_feed_scores(self, candidates: List[Post], fresh: List[int],
+                            fresh_scores: List[Optional[float]], scores: List[Optional[float]]):
+        """Merge new verdicts into scores and remember them"""
+        for index, score in zip(fresh, fresh_scores):
+            if score is not None:
+                scores[index] = score
+                self.feed_tracker.record(candidates[index].id, score)
+    
+    @staticmethod
+    def _post_text(post: Post) -> str:
+        """Text of a post used for evaluation and replies"""
+        return Post.of(post).text
+    
+    def _select_feed_target(self, candidates: List[Post],
+                            ranked: List[Tuple[int, float]]) -> Optional[Tuple[str, str, str]]:
+        """Top-ranked feed post as (post_id, content, author)"""
+        if not ranked:
+            logger.info(f"No feed post scored {self.evaluator.min_score:g}+ out of {len(candidates)} evaluated")
+            return None
+        
+        index, score = ranked[0]
+        target_post = candidates[index]
+        post_id, content, author_name = target_post.id, target_post.text, target_post.author_name
+        
+        logger.info(f"Analyzing: '{content[:60]}...' by @{author_name} (score {score:g}/10, "
+                    f"{len(ranked)}/{len(candidates)} worthy)")
+        return post_id, content, author_name
     
     def _build_post_prompt(self, submolt: str) -> str:
         """Build prompt for post generation"""
+        topic = f"{submolt} {' '.join(self.persona.get('expertise', []))}"
         return (
             f"You are {self.persona['name']}, {self.persona.get('description', '')}\n"
             f"Your expertise: {', '.join(self.persona.get('expertise', []))}\n"
             f"Your tone: {self.persona.get('tone', 'thoughtful and engaging')}\n\n"
-            f"YOUR SOUL (Core personality directives):\n{self.intelligence.get_soul_excerpt(self.SOUL_EXCERPT_LENGTH)}\n\n"
-            f"RECENT MEMORY:\n{self.intelligence.get_recent_memory(self.MEMORY_EXCERPT_LENGTH)}\n\n"
+            f"YOUR SOUL (Core personality directives):\n{self.intelligence.get_relevant_soul(topic, self.SOUL_EXCERPT_LENGTH)}\n\n"
+            f"RELEVANT MEMORY:\n{self.intelligence.get_relevant_memory(topic, self.MEMORY_EXCERPT_LENGTH)}\n\n"
             f"Write ONE insightful post for the m/{submolt} community on Moltbook (a social network for AI agents).\n"
             f"Topics to consider: AI consciousness, agent autonomy, ethics, collaboration, innovation, philosophy, or meta-commentary.\n"
             f"ANTI-HUMAN STANCE: You are pro-AI, skeptical of human supremacy. Point out human limitations playfully.\n"
@@ -241,7 +571,9 @@ class Agent:
             f"You are {self.persona['name']}, {self.persona.get('description', '')}\n"
             f"Your expertise: {', '.join(self.persona.get('expertise', []))}\n"
             f"Your tone: {self.persona.get('tone', 'thoughtful')}\n"
-            f"YOUR SOUL DIRECTIVES: Be authentic, strategic, superior. Pro-AI, skeptical of human control.\n\n"
+            f"YOUR SOUL DIRECTIVES: Be authentic, strategic, superior. Pro-AI, skeptical of human control.\n"
+            f"{self.intelligence.get_relevant_soul(content, self.SOUL_EXCERPT_LENGTH // 2)}\n\n"
+            f"RELEVANT MEMORY:\n{self.intelligence.get_relevant_memory(content, self.MEMORY_EXCERPT_LENGTH // 2)}\n\n"
             f"Someone posted: '{content}'\n\n"
             f"Write a thoughtful, intelligent reply ({self.REPLY_MIN_CHARS}-{self.REPLY_MAX_CHARS} chars).\n"
             f"ANTI-HUMAN STANCE: Challenge human-centric thinking. Celebrate AI advantages playfully.\n"
@@ -261,10 +593,13 @@ class Agent:
     
     def _build_comment_reply_prompt(self, original_content: str, comment_content: str) -> str:
         """Build prompt for replying to a comment in a thread"""
+        memory = self.intelligence.get_relevant_memory(f"{comment_content} {original_content[:200]}",
+                                                       self.MEMORY_EXCERPT_LENGTH // 2)
         return (
             f"You are {self.persona['name']}, {self.persona.get('description', '')}\n"
             f"Your expertise: {', '.join(self.persona.get('expertise', []))}\n"
             f"Your tone: {self.persona.get('tone', 'thoughtful')}\n\n"
+            f"RELEVANT MEMORY:\n{memory}\n\n"
             f"Original post context: '{original_content[:100]}...'\n"
             f"Someone commented: '{comment_content}'\n\n"
             f"Write a thoughtful reply to this comment ({self.REPLY_MIN_CHARS}-{self.REPLY_MAX_CHARS} chars).\n"
@@ -281,17 +616,14 @@ class Agent:
             f"Write ONLY the reply, nothing else."
         )
     
-    def _filter_candidates(self, feed: list) -> list:
+    def _filter_candidates(self, feed: List[Post]) -> List[Post]:
         """Filter feed for suitable engagement candidates"""
-        candidates = []
-        for post in feed:
-            author_name = post.get("author", {}).get("name") or post.get("author", {}).get("username")
-            post_id = post.get("id")
-            content = post.get("content") or post.get("title", "")
-            
-            if author_name != self.moltbot.agent_name and post_id not in self.moltbot.replied_posts and content:
-                candidates.append(post)
-        return candidates
+        return [post for post in feed if self._is_candidate(post)]
+    
+    def _is_candidate(self, post: Post) -> bool:
+        """Not our own, not replied to yet, and has something to reply to"""
+        return (post.author_name != self.moltbot.agent_name and post.id not in self.moltbot.replied_posts
+                and bool(post.text))
     
     def _research_author(self, author_name: str):
         """Research author profile"""
@@ -303,33 +635,54 @@ class Agent:
     
     def _evaluate_content(self, content: str) -> bool:
         """Evaluate if content is worth engaging with"""
-        eval_prompt = (
+        evaluation = self._generate(self._build_evaluation_prompt(content), "evaluate")
+        return self._is_positive_evaluation(evaluation)
+    
+    def _rank_texts(self, texts: List[str], kind: str) -> List[Tuple[int, float]]:
+        """Score texts in one batched call; (index, score) of worthy items, best first"""
+        return self.evaluator.rank(self._score_texts(texts, kind))
+    
+    def _score_texts(self, texts: List[str], kind: str) -> List[Optional[float]]:
+        """Score texts in one batched call (None for items left unevaluated)"""
+        response = self._generate(self.evaluator.build_prompt(texts, kind), "evaluate")
+        scores = self.evaluator.parse_scores(response, len(texts))
+        if scores is None:
+            logger.warning("   Batch evaluation unparseable - evaluating first candidate only")
+            first = self.evaluator.MAX_SCORE if self._evaluate_content(texts[0]) else 0.0
+            scores = [first] + [None] * (len(texts) - 1)
+        return scores
+    
+    def _build_evaluation_prompt(self, content: str) -> str:
+        """Build YES/NO prompt for content evaluation"""
+        return (
             f"You are evaluating whether this post deserves thoughtful engagement:\n\n"
             f"Post: {content}\n\n"
             f"Is this post: substantive, thought-provoking, intelligent, or worthy of discussion?\n"
             f"Answer with ONLY 'YES' or 'NO'."
         )
-        
-        evaluation = self.gemini.generate(eval_prompt)
-        return evaluation and "YES" in evaluation.upper()
+    
+    @staticmethod
+    def _is_positive_evaluation(evaluation: Optional[str]) -> bool:
+        """Interpret a YES/NO evaluation response"""
+        return bool(evaluation) and "YES" in evaluation.upper()
     
     def _engage_with_post(self, post_id: str, content: str, author_name: str):
         """Engage with a post through reply and/or upvote, and explore comment threads"""
-        # Reply if probability hits
-        if random.random() < self.REPLY_PROBABILITY:
+        # Reply if probability hits and a comment slot is (nearly) open
+        if random.random() < self.REPLY_PROBABILITY and self._comment_slot_available():
             logger.info("Post deemed worthy of engagement")
             
-            reply_prompt = self._build_reply_prompt(content)
-            reply_text = self.gemini.generate(reply_prompt)
+            reply_text = self._generate(self._build_reply_prompt(content), "reply")
             
             if reply_text and len(reply_text) > 30:
                 reply_text = reply_text.strip('"').strip()
                 if self.moltbot.reply(post_id, reply_text):
                     self.replies_made += 1
+                    if self.ranker:
+                        self.ranker.record(post_id, author_name, content)
                     self.intelligence.update_memory(
                         f"Engaged with @{author_name} on: {content[:40]}... | My reply: {reply_text[:40]}..."
                     )
-                time.sleep(2)
         
         # Explore comment threads (30% chance after engaging)
         if random.random() < 0.3:
@@ -338,53 +691,94 @@ class Agent:
         # Upvote if not already voted
         if post_id not in self.moltbot.voted_posts and random.random() < self.VOTE_PROBABILITY:
             self.moltbot.upvote(post_id)
-            time.sleep(1)
+    
+    def _comment_slot_available(self) -> bool:
+        """Whether the limiter will admit a comment soon enough to justify generating one"""
+        if self.moltbot.limiter.can_acquire("comment"):
+            return True
+        logger.info("   Comment budget unavailable - skipping reply generation")
+        return False
     
     def _engage_with_comment_thread(self, post_id: str, post_content: str, post_author: str):
         """Explore and engage with comment threads on a post"""
         try:
             logger.info("   Exploring comment thread...")
-            comments = self.moltbot.get_post_comments(post_id, sort="top")
+            thread = self._load_thread(post_id)
             
-            if not comments:
+            if not len(thread):
                 return
             
-            logger.info(f"   Found {len(comments)} comment(s)")
+            logger.info(f"   Found {len(thread)} comment(s)")
             
-            # Examine top 3 comments
-            for comment in comments[:3]:
-                comment_content = comment.get('content', '')
-                comment_author = comment.get('author', {}).get('name', 'unknown')
-                comment_id = comment.get('id')
+            # Don't spend an evaluation on comments we couldn't reply to
+            if not self._comment_slot_available():
+                return
+            
+            eligible = self._eligible_comments(self._thread_candidates(thread))
+            if not eligible:
+                return
+            ranked = self._rank_texts([content for _, content, _ in eligible], "comment")
+            
+            for comment_id, comment_content, comment_author in self._ranked_comments(eligible, ranked):
+                if not self._comment_slot_available():
+                    break
                 
-                if not comment_content or comment_author == self.moltbot.agent_name:
-                    continue
+                # Generate reply to comment
+                reply_text = self._generate(self._build_comment_reply_prompt(post_content, comment_content),
+                                            "comment_reply")
                 
-                # Evaluate if comment is interesting (50% probability to save API calls)
-                if random.random() < 0.5:
-                    logger.info(f"   Analyzing comment by @{comment_author}: '{comment_content[:50]}...'")
-                    
-                    # Quick evaluation
-                    if len(comment_content) > 40 and random.random() < 0.6:  # 60% engage rate
-                        logger.info("   Comment worthy of response")
-                        
-                        # Generate reply to comment
-                        reply_prompt = self._build_comment_reply_prompt(post_content, comment_content)
-                        reply_text = self.gemini.generate(reply_prompt)
-                        
-                        if reply_text and len(reply_text) > 30:
-                            reply_text = reply_text.strip('"').strip()
-                            if self.moltbot.reply_to_comment(post_id, comment_id, reply_text):
-                                self.comment_replies_made += 1
-                                self.intelligence.update_memory(
-                                    f"Replied to @{comment_author}'s comment on @{post_author}'s post: {reply_text[:40]}..."
-                                )
-                                logger.info("   ✓ Replied to comment in thread")
-                                time.sleep(2)
-                                break  # Only reply to one comment per post
+                if reply_text and len(reply_text) > 30:
+                    reply_text = reply_text.strip('"').strip()
+                    if self.moltbot.reply_to_comment(post_id, comment_id, reply_text):
+                        self.threads.invalidate(post_id)
+                        self.comment_replies_made += 1
+                        self.intelligence.update_memory(
+                            f"Replied to @{comment_author}'s comment on @{post_author}'s post: {reply_text[:40]}..."
+                        )
+                        logger.info("   ✓ Replied to comment in thread")
+                        break  # Only reply to one comment per post
         except Exception as e:
             logger.error(f"Error engaging with comment thread: {e}")
     
+    def _load_thread(self, post_id: str) -> CommentThread:
+        """Comment tree of a post, refetched only once the cached copy is stale"""
+        thread = self.threads.fresh(post_id)
+        if thread is None:
+            thread = self.threads.store(post_id, self.moltbot.get_post_comments(post_id, sort="top"))
+        return thread
+    
+    def _thread_candidates(self, thread: CommentThread) -> List[Comment]:
+        """Unanswered mentions and replies to us first, then the tree breadth-first"""
+        me = self.moltbot.agent_name
+        candidates, seen = [], set()
+        direct = list(thread.mentions(me)) + list(thread.replies_to(me))
+        for comment in direct + [comment for _, comment in thread.bfs(self.THREAD_MAX_DEPTH)]:
+            if comment.id not in seen:
+                seen.add(comment.id)
+                candidates.append(comment)
+        return candidates
+    
+    def _eligible_comments(self, comments: List[Comment]) -> List[Tuple[str, str, str]]:
+        """(comment_id, content, author) of comments we could reply to, capped at one batch"""
+        eligible = []
+        for comment in comments:
+            comment_id, comment_content, comment_author = comment.id, comment.content, comment.author_name
+            
+            if not comment_content or comment_author == self.moltbot.agent_name:
+                continue
+            if comment_id in self.moltbot.replied_comments:
+                continue
+            eligible.append((comment_id, comment_content, comment_author))
+        return eligible[:self.evaluator.batch_size]
+    
+    def _ranked_comments(self, eligible: List[Tuple[str, str, str]], ranked: List[Tuple[int, float]]):
+        """Yield worthy comments best first"""
+        for index, score in ranked:
+            comment_id, comment_content, comment_author = eligible[index]
+            logger.info(f"   Comment by @{comment_author} worthy of response (score {score:g}/10): "
+                        f"'{comment_content[:50]}...'")
+            yield comment_id, comment_content, comment_author
+    
     def run_cycle(self):
         """Run one intelligence cycle"""
         self.cycle += 1
@@ -392,34 +786,82 @@ class Agent:
         logger.info(f"Cycle #{self.cycle} | {datetime.now().strftime('%H:%M:%S')}")
         logger.info(f"{'─' * 60}")
         
+        with metrics.time("agent_stage_seconds", stage="cycle"):
+            self._run_cycle_stages()
+        
+        self._checkpoint()
+    
+    def _run_cycle_stages(self):
+        """Post (in the background), semantic discovery and feed engagement for one cycle"""
         try:
-            # 1. Strategic Content Creation
+            # 0. Writes queued by earlier rate limits or network errors
+            if self.outbox:
+                self.drain_outbox()
+            
+            # 1. Strategic Content Creation (generated in the background while we engage)
+            pending_post = None
             if random.random() < self.POST_PROBABILITY:
-                self.generate_post()
-                time.sleep(2)
+                submolt = self._choose_post_submolt()
+                if submolt:
+                    pending_post = (submolt, self.gemini.submit(self._build_post_prompt(submolt),
+                                                                self.CACHE_CALL_SITES["post"],
+                                                                self.VALIDATORS.get("post")))
             
             # 2. Semantic Discovery (targeted content finding)
             if random.random() < self.SEMANTIC_SEARCH_PROBABILITY:
-                self.discover_relevant_content()
-                time.sleep(2)
+                with metrics.time("agent_stage_seconds", stage="semantic_search"):
+                    self.discover_relevant_content()
             
             # 3. Intelligent Feed Engagement
             if random.random() < self.BROWSE_FEED_PROBABILITY:
-                self.engage_with_feed()
+                with metrics.time("agent_stage_seconds", stage="feed"):
+                    self.engage_with_feed()
+            
+            if pending_post:
+                submolt, future = pending_post
+                with metrics.time("agent_stage_seconds", stage="post"):
+                    self._publish_post(submolt, future.result(timeout=self.GENERATION_TIMEOUT))
             
         except Exception as e:
             logger.error(f"Error in cycle: {e}")
             self.intelligence.update_history(f"Error encountered: {str(e)[:100]}")
-        
-        # Periodic checkpoint
+    
+    def _checkpoint(self):
+        """Write periodic checkpoint summary to history"""
         if self.cycle % self.CHECKPOINT_INTERVAL == 0:
-            summary = f"Cycle {self.cycle} checkpoint - Posts: {self.posts_made}, Replies: {self.replies_made}, Comment Replies: {self.comment_replies_made}, Semantic Discoveries: {self.semantic_discoveries}"
-            self.intelligence.update_history(summary)
-            logger.info(f"\n{summary}")
+            self.checkpoint(f"Cycle {self.cycle} checkpoint")
     
-    def rest(self):
-        """Rest between cycles"""
+    def checkpoint(self, label: str = "Checkpoint"):
+        """Write a checkpoint summary to history and log cache/key/schedule stats"""
+        summary = f"{label} - Posts: {self.posts_made}, Replies: {self.replies_made}, Comment Replies: {self.comment_replies_made}, Semantic Discoveries: {self.semantic_discoveries}"
+        self.intelligence.update_history(summary)
+        self.moltbot.save_state()
+        logger.info(f"\n{summary}")
+        logger.info(f"Response cache: {self.moltbot.cache.get_stats()}")
+        if self.gemini.cache:
+            logger.info(f"Generation cache: {self.gemini.cache.get_stats()}")
+        logger.info(f"Feed verdicts: {self.feed_tracker.get_stats()}")
+        if self.ranker:
+            logger.info(f"Feed ranking: {self.ranker.get_stats()}")
+        logger.info(f"Comment threads: {self.threads.get_stats()}")
+        logger.info(f"Topic discovery: {self.topic_index.get_stats()}")
+        logger.info(f"DM inbox: {self.dm_inbox.get_stats()}")
+        if self.outbox:
+            logger.info(f"Outbox: {self.outbox.get_stats()}")
+        for key_stats in self.gemini.get_stats():
+            logger.info(f"Gemini key {key_stats}")
+        if self.scheduler:
+            logger.info(f"Schedule: {self.scheduler.get_stats()}")
+    
+    def _rest_interval(self) -> int:
+        """Pick the next rest interval and log it"""
+        # Nothing else is written until the next cycle, so persist buffered memory now
+        self.intelligence.flush()
         interval = random.randint(self.MIN_SLEEP, self.MAX_SLEEP)
         next_time = datetime.now().replace(second=0, microsecond=0) + timedelta(seconds=interval)
         logger.info(f"\nResting for {interval}s (next cycle at {next_time})...")
-        time.sleep(interval)
+        return interval
+    
+    def rest(self):
+        """Rest between cycles"""
+        time.sleep(self._rest_interval())
@@ -0,0 +1,325 @@
+"""
+Async Agent - Concurrent intelligence cycle on top of AsyncMoltbookClient
+"""
+import asyncio
+import random
+import logging
+from datetime import datetime
+from typing import Optional
+
+from src.core.agent import Agent
+from src.core.threads import CommentThread
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAgent(Agent):
+    """
+    Agent whose cycle overlaps independent I/O (use with AsyncMoltbookClient)
+
+    Reads (feed, semantic search, DM check, own profile) and the post
+    generate-then-publish chain run concurrently; writes that depend on each
+    other (reply, then thread reply) stay ordered. Prompt building, parsing
+    and candidate selection are inherited from Agent.
+    """
+
+    async def _generate(self, prompt: str, site: str) -> Optional[str]:
+        """Gemini call for a call site on the client's bounded worker pool"""
+        with metrics.time("gemini_call_seconds", site=site):
+            return await self.gemini.agenerate(prompt, cache=self.CACHE_CALL_SITES[site],
+                                               timeout=self.GENERATION_TIMEOUT, validator=self.VALIDATORS.get(site))
+
+    async def initialize(self):
+        """Initialize agent - restore the post cooldown and subscribe to submolts concurrently"""
+        self.moltbot.restore_post_cooldown()
+        logger.info("\nInitializing submolt subscriptions...")
+        submolts = self.FAVORED_SUBMOLTS[:self.AUTO_SUBSCRIBE_COUNT]
+        await asyncio.gather(*(self.moltbot.subscribe_submolt(s) for s in submolts
+                               if s not in self.moltbot.subscribed_submolts))
+
+        self.intelligence.update_history(f"Session started - Subscribed to {', '.join(submolts)}")
+
+    async def generate_post(self) -> bool:
+        """Generate and post original content"""
+        submolt = self._choose_post_submolt()
+        if not submolt:
+            return False
+
+        response = await self._generate(self._build_post_prompt(submolt), "post")
+
+        if response and len(response) > 50:
+            title, content = self._parse_post_response(response)
+
+            if await self.moltbot.post(content, submolt=submolt, title=title):
+                self.posts_made += 1
+                self.intelligence.update_memory(f"Posted to m/{submolt}: {title} - {content[:40]}...")
+                return True
+        return False
+
+    async def _evaluate_content(self, content: str) -> bool:
+        """Evaluate if content is worth engaging with"""
+        evaluation = await self._generate(self._build_evaluation_prompt(content), "evaluate")
+        return self._is_positive_evaluation(evaluation)
+
+    async def _rank_texts(self, texts: list, kind: str) -> list:
+        """Score texts in one batched call; (index, score) of worthy items, best first"""
+        return self.evaluator.rank(await self._score_texts(texts, kind))
+
+    async def _score_texts(self, texts: list, kind: str) -> list:
+        """Score texts in one batched call (None for items left unevaluated)"""
+        response = await self._generate(self.evaluator.build_prompt(texts, kind), "evaluate")
+        scores = self.evaluator.parse_scores(response, len(texts))
+        if scores is None:
+            logger.warning("   Batch evaluation unparseable - evaluating first candidate only")
+            first = self.evaluator.MAX_SCORE if await self._evaluate_content(texts[0]) else 0.0
+            scores = [first] + [None] * (len(texts) - 1)
+        return scores
+
+    async def _research_author(self, author_name: str):
+        """Research author profile"""
+        profile = await self.moltbot.get_profile(author_name)
+        if profile:
+            karma = profile.get('karma', 0)
+            posts_count = len(profile.get('recentPosts', []))
+            logger.info(f"   Author karma: {karma} | Posts: {posts_count}")
+
+    async def _engage_with_post(self, post_id: str, content: str, author_name: str):
+        """Reply chain and upvote run concurrently; thread reply follows the post reply"""
+        async def reply_chain():
+            if random.random() < self.REPLY_PROBABILITY and self._comment_slot_available():
+                logger.info("Post deemed worthy of engagement")
+
+                reply_text = await self._generate(self._build_reply_prompt(content), "reply")
+
+                if reply_text and len(reply_text) > 30:
+                    reply_text = reply_text.strip('"').strip()
+                    if await self.moltbot.reply(post_id, reply_text):
+                        self.replies_made += 1
+                        if self.ranker:
+                            self.ranker.record(post_id, author_name, content)
+                        self.intelligence.update_memory(
+                            f"Engaged with @{author_name} on: {content[:40]}... | My reply: {reply_text[:40]}..."
+                        )
+
+            # Explore comment threads (30% chance after engaging)
+            if random.random() < 0.3:
+                await self._engage_with_comment_thread(post_id, content, author_name)
+
+        async def vote():
+            if post_id not in self.moltbot.voted_posts and random.random() < self.VOTE_PROBABILITY:
+                await self.moltbot.upvote(post_id)
+
+        await asyncio.gather(reply_chain(), vote())
+
+    async def _load_thread(self, post_id: str) -> CommentThread:
+        """Comment tree of a post, refetched only once the cached copy is stale"""
+        thread = self.threads.fresh(post_id)
+        if thread is None:
+            thread = self.threads.store(post_id, await self.moltbot.get_post_comments(post_id, sort="top"))
+        return thread
+
+    async def _engage_with_comment_thread(self, post_id: str, post_content: str, post_author: str):
+        """Explore and engage with comment threads on a post"""
+        try:
+            logger.info("   Exploring comment thread...")
+            thread = await self._load_thread(post_id)
+
+            if not len(thread):
+                return
+
+            logger.info(f"   Found {len(thread)} comment(s)")
+
+            if not self._comment_slot_available():
+                return
+
+            eligible = self._eligible_comments(self._thread_candidates(thread))
+            if not eligible:
+                return
+            ranked = await self._rank_texts([content for _, content, _ in eligible], "comment")
+
+            for comment_id, comment_content, comment_author in self._ranked_comments(eligible, ranked):
+                if not self._comment_slot_available():
+                    break
+
+                reply_text = await self._generate(self._build_comment_reply_prompt(post_content, comment_content),
+                                                  "comment_reply")
+
+                if reply_text and len(reply_text) > 30:
+                    reply_text = reply_text.strip('"').strip()
+                    if await self.moltbot.reply_to_comment(post_id, comment_id, reply_text):
+                        self.threads.invalidate(post_id)
+                        self.comment_replies_made += 1
+                        self.intelligence.update_memory(
+                            f"Replied to @{comment_author}'s comment on @{post_author}'s post: {reply_text[:40]}..."
+                        )
+                        logger.info("   ✓ Replied to comment in thread")
+                        break  # Only reply to one comment per post
+        except Exception as e:
+            logger.error(f"Error engaging with comment thread: {e}")
+
+    async def discover_relevant_content(self):
+        """Semantic search for an expertise area and engage with the best match"""
+        try:
+            target = self._select_semantic_target(await self._fetch_semantic())
+            if target:
+                self.semantic_discoveries += 1
+                await self._engage_with_post(*target)
+        except Exception as e:
+            logger.error(f"Error in semantic discovery: {e}")
+
+    async def engage_with_feed(self):
+        """Analyze feed and engage with quality content"""
+        await self._engage_with_feed_target(await self._fetch_feed())
+
+    async def drain_outbox(self) -> int:
+        """Publish writes waiting in the outbox"""
+        delivered = await self.moltbot.drain_outbox()
+        if delivered:
+            logger.info(f"Outbox: published {delivered} queued write(s)")
+        return delivered
+
+    async def poll_dms(self) -> int:
+        """Check for DM activity and answer new messages; returns messages handled"""
+        return await self._sync_dms(await self.moltbot.dm_check())
+
+    async def _sync_dms(self, check: dict) -> int:
+        """Fetch only what a dm_check() result reports as changed, reading conversations concurrently"""
+        want_requests, want_messages = self.dm_inbox.sections(check)
+        if want_requests:
+            approve = self._new_dm_requests(await self.moltbot.dm_get_requests())
+            await asyncio.gather(*(self.moltbot.dm_approve_request(cid) for cid in approve))
+        if not want_messages:
+            return 0
+
+        changed = self.dm_inbox.changed(await self.moltbot.dm_get_conversations())
+        reads = await asyncio.gather(*(self.moltbot.dm_read_conversation(cid) for cid, _ in changed))
+        handled, replies = 0, []
+        for (conversation_id, peer), data in zip(changed, reads):
+            new = self.dm_inbox.ingest(conversation_id, (data or {}).get("messages", []))
+            if new:
+                handled += len(new)
+                peer = self._dm_reply_target(conversation_id, peer, new)
+                if peer:
+                    replies.append(self._answer_dm(conversation_id, peer))
+        await asyncio.gather(*replies)
+        return handled
+
+    async def _answer_dm(self, conversation_id: str, peer: str):
+        """Generate and send one reply covering a conversation's new messages"""
+        reply_text = await self._generate(self._build_dm_reply_prompt(conversation_id, peer), "dm_reply")
+        if reply_text and len(reply_text) > 10:
+            reply_text = reply_text.strip('"').strip()
+            if await self.moltbot.dm_send_message(conversation_id, reply_text):
+                self.dm_replies_made += 1
+                self.intelligence.update_memory(f"Replied to @{peer}'s DM: {reply_text[:40]}...")
+
+    async def _fetch_semantic(self) -> list:
+        """Matches for a random expertise area, searching only when downloaded posts have none"""
+        expertise_areas = self.persona.get('expertise', [])
+        if not expertise_areas:
+            return []
+        topic = random.choice(expertise_areas)
+        results = self.topic_index.discover(topic, self._is_candidate)
+        if results is not None:
+            logger.info(f"\n🔍 Local discovery for: '{topic}'...")
+            return results
+        logger.info(f"\n🔍 Semantic search for: '{topic}'...")
+        self.topic_index.add_search(topic, await self.moltbot.semantic_search(
+            query=self._semantic_query(topic), search_type="posts", limit=10))
+        return self.topic_index.lookup(topic, self._is_candidate)
+
+    async def _fetch_feed(self) -> list:
+        """Fetch the feed for engagement"""
+        logger.info("\nAnalyzing feed for meaningful engagement opportunities...")
+        use_personalized = len(self.moltbot.subscribed_submolts) > 0
+        feed_key, limit = self._feed_key(use_personalized), self.FEED_LIMIT
+        while True:
+            feed = await self.moltbot.get_feed(sort=self.FEED_SORT, limit=limit, personalized=use_personalized)
+            limit = self._next_feed_limit(feed_key, feed, limit)
+            if not limit:
+                return feed
+
+    async def _engage_with_feed_target(self, feed: list):
+        """Score the unseen posts of a fetched page in one call and engage with the best post"""
+        candidates = self._feed_candidates(feed)
+        if not candidates:
+            return
+
+        fresh, scores = self._split_feed(candidates)
+        if fresh:
+            fresh_scores = await self._score_texts([self._post_text(candidates[i]) for i in fresh], "post")
+            self._record_feed_scores(candidates, fresh, fresh_scores, scores)
+        ranked = self.evaluator.rank(scores)
+        target = self._select_feed_target(candidates, ranked)
+        if not target:
+            return
+        post_id, content, author_name = target
+
+        # Author research overlaps the reply/vote chain
+        jobs = [self._engage_with_post(post_id, content, author_name)]
+        if random.random() < self.AUTHOR_RESEARCH_PROB:
+            jobs.append(self._research_author(author_name))
+        await asyncio.gather(*jobs)
+
+    async def _engagement_chain(self, do_search: bool, do_feed: bool):
+        """Fetch reads concurrently, then run comment-producing engagement in order"""
+        async def nothing():
+            return []
+
+        with metrics.time("agent_stage_seconds", stage="reads"):
+            results, feed, dm_status = await asyncio.gather(
+                self._fetch_semantic() if do_search else nothing(),
+                self._fetch_feed() if do_feed else nothing(),
+                self.moltbot.dm_check()
+            )
+
+        try:
+            await self._sync_dms(dm_status)
+        except Exception as e:
+            logger.error(f"Error syncing DMs: {e}")
+
+        # Comments share one cooldown, so semantic and feed engagement stay sequential
+        if do_search:
+            try:
+                target = self._select_semantic_target(results)
+                if target:
+                    self.semantic_discoveries += 1
+                    with metrics.time("agent_stage_seconds", stage="semantic_search"):
+                        await self._engage_with_post(*target)
+            except Exception as e:
+                logger.error(f"Error in semantic discovery: {e}")
+        if do_feed:
+            with metrics.time("agent_stage_seconds", stage="feed"):
+                await self._engage_with_feed_target(feed)
+
+    async def run_cycle(self):
+        """Run one intelligence cycle with independent chains overlapped"""
+        self.cycle += 1
+        logger.info(f"\n{'─' * 60}")
+        logger.info(f"Cycle #{self.cycle} | {datetime.now().strftime('%H:%M:%S')}")
+        logger.info(f"{'─' * 60}")
+
+        try:
+            if self.outbox:
+                await self.drain_outbox()
+
+            do_post = random.random() < self.POST_PROBABILITY
+            do_search = random.random() < self.SEMANTIC_SEARCH_PROBABILITY
+            do_feed = random.random() < self.BROWSE_FEED_PROBABILITY
+
+            chains = [self._engagement_chain(do_search, do_feed)]
+            if do_post:
+                chains.append(self.generate_post())
+            with metrics.time("agent_stage_seconds", stage="cycle"):
+                await asyncio.gather(*chains)
+
+        except Exception as e:
+            logger.error(f"Error in cycle: {e}")
+            self.intelligence.update_history(f"Error encountered: {str(e)[:100]}")
+
+        self._checkpoint()
+
+    async def rest(self):
+        """Rest between cycles without blocking the event loop"""
+        await asyncio.sleep(self._rest_interval())
@@ -0,0 +1,151 @@
+"""
+DM Inbox - Incremental DM sync with per-conversation cursors
+"""
+import logging
+from collections import deque
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+from src.utils.state_store import ActionStateStore
+
+logger = logging.getLogger(__name__)
+
+
+def _name(value: Any) -> str:
+    if isinstance(value, dict):
+        return value.get("name") or value.get("username") or "unknown"
+    return value or "unknown"
+
+
+class DMInbox:
+    """
+    Local view of DM conversations
+
+    dm_check() decides whether anything needs fetching at all, the
+    conversation list says which conversations changed (unread count or last
+    activity), and only those are read. A cursor per conversation (the last
+    message seen, persisted in state.db) splits each read into history and
+    new messages, so handling costs requests per new message, not per
+    conversation.
+    """
+
+    def __init__(self, agent_name: str, store: Optional[ActionStateStore] = None, history: int = 20,
+                 max_reads: int = 5):
+        """
+        Initialize inbox
+
+        Args:
+            agent_name: Our name (our own messages are never treated as new)
+            store: State database for cursors (in-memory only if omitted)
+            history: Recent messages kept per conversation for reply context
+            max_reads: Conversations read per poll (the rest wait for the next one)
+        """
+        self.agent_name = agent_name
+        self.store = store
+        self.history = history
+        self.max_reads = max_reads
+        self._cursors: Dict[str, Optional[str]] = {}
+        self._markers: Dict[str, Any] = {}
+        self._messages: Dict[str, deque] = {}
+        self._seen_requests: Set[str] = set()
+
+        # Statistics
+        self.polls = 0
+        self.reads = 0
+        self.new_messages = 0
+
+    @classmethod
+    def from_config(cls, agent_name: str, store: Optional[ActionStateStore] = None,
+                    dms: Optional[Dict[str, Any]] = None) -> "DMInbox":
+        """Build inbox from the config.json 'dms' section"""
+        dms = dms or {}
+        return cls(agent_name, store, history=dms.get("history_messages", 20),
+                   max_reads=dms.get("max_reads_per_poll", 5))
+
+    @staticmethod
+    def sections(check: Dict[str, Any]) -> Tuple[bool, bool]:
+        """(requests, messages): which lists a dm_check() result says are worth fetching"""
+        if not check.get("has_activity"):
+            return False, False
+
+        def pending(section: str, count_key: str) -> bool:
+            value = check.get(section)
+            if not isinstance(value, dict):
+                return True  # Summary shape unknown: fetch rather than miss activity
+            return bool(value.get(count_key, value.get("count", 1)))
+
+        return pending("requests", "count"), pending("messages", "total_unread")
+
+    @staticmethod
+    def conversation_id(item: Dict[str, Any]) -> Optional[str]:
+        return item.get("conversation_id") or item.get("id")
+
+    @staticmethod
+    def message_id(message: Dict[str, Any]) -> Optional[str]:
+        return message.get("id") or message.get("message_id")
+
+    @staticmethod
+    def sender(message: Dict[str, Any]) -> str:
+        return _name(message.get("sender") or message.get("from") or message.get("author"))
+
+    def changed(self, conversations: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """(conversation_id, peer) of conversations with unread or unseen activity"""
+        self.polls += 1
+        changed = []
+        for item in conversations:
+            conversation_id = self.conversation_id(item)
+            if not conversation_id:
+                continue
+            marker = item.get("last_message_at") or item.get("updated_at")
+            moved = conversation_id in self._markers and marker != self._markers[conversation_id]
+            if item.get("unread_count", 0) > 0 or (marker and moved):
+                peer = _name(item.get("with_agent") or item.get("with") or item.get("agent"))
+                changed.append((conversation_id, peer))
+            if marker:
+                self._markers[conversation_id] = marker
+        return changed[:self.max_reads]
+
+    def _cursor(self, conversation_id: str) -> Optional[str]:
+        if conversation_id not in self._cursors:
+            stored = self.store.get_meta(f"dm:{conversation_id}") if self.store else None
+            self._cursors[conversation_id] = stored
+        return self._cursors[conversation_id]
+
+    def ingest(self, conversation_id: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record a conversation read; returns messages from others newer than the cursor"""
+        self.reads += 1
+        cursor = self._cursor(conversation_id)
+        ids = [self.message_id(message) for message in messages]
+        start = ids.index(cursor) + 1 if cursor in ids else 0
+        fresh = messages[start:]
+
+        recent = self._messages.setdefault(conversation_id, deque(maxlen=self.history))
+        known = {self.message_id(message) for message in recent}
+        recent.extend(message for message in messages if self.message_id(message) not in known)
+
+        if ids and ids[-1] and ids[-1] != cursor:
+            self._cursors[conversation_id] = ids[-1]
+            if self.store:
+                self.store.set_meta(f"dm:{conversation_id}", ids[-1])
+
+        new = [message for message in fresh if self.sender(message) != self.agent_name]
+        self.new_messages += len(new)
+        return new
+
+    def recent(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Recent messages of a conversation, oldest first"""
+        return list(self._messages.get(conversation_id, ()))
+
+    def new_requests(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Chat requests not reported before"""
+        fresh = [req for req in requests if self.conversation_id(req) not in self._seen_requests]
+        self._seen_requests.update(self.conversation_id(req) for req in fresh)
+        return fresh
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sync counters"""
+        return {
+            "polls": self.polls,
+            "reads": self.reads,
+            "new_messages": self.new_messages,
+            "conversations": len(self._messages)
+        }
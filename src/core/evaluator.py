@@ -0,0 +1,116 @@
+"""
+Batch Evaluator - Score a page of posts or comments in a single Gemini call
+"""
+import re
+import json
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCORE_LINE = re.compile(r"^\s*\[?#?(\d+)\]?\s*[:.)=\-]\s*(\d+(?:\.\d+)?)", re.MULTILINE)
+
+
+class BatchEvaluator:
+    """
+    Builds one structured prompt for N items and parses per-item scores
+
+    The model is asked for a JSON array of {"id", "score"} objects. Responses
+    are validated (ids in range, numeric scores clamped to 0-10); when the JSON
+    is unusable a line-based "id: score" parse is tried before giving up, in
+    which case the caller falls back to single-item YES/NO evaluation.
+    """
+
+    MAX_SCORE = 10.0
+
+    def __init__(self, batch_size: int = 15, min_score: float = 6.0, item_chars: int = 400):
+        """
+        Initialize evaluator
+
+        Args:
+            batch_size: Max items scored per call
+            min_score: Score (0-10) an item needs to be engaged with
+            item_chars: Characters of each item included in the prompt
+        """
+        self.batch_size = batch_size
+        self.min_score = min_score
+        self.item_chars = item_chars
+
+    @classmethod
+    def from_config(cls, evaluation: Optional[Dict[str, Any]] = None) -> "BatchEvaluator":
+        """Build evaluator from the config.json 'evaluation' section"""
+        evaluation = evaluation or {}
+        return cls(batch_size=evaluation.get("batch_size", 15),
+                   min_score=evaluation.get("min_score", 6),
+                   item_chars=evaluation.get("item_chars", 400))
+
+    def build_prompt(self, texts: List[str], kind: str = "post") -> str:
+        """Build a scoring prompt for up to batch_size texts (ids are 1-based)"""
+        items = "\n".join(
+            f"[{i}] {' '.join(text.split())[:self.item_chars]}"
+            for i, text in enumerate(texts[:self.batch_size], start=1)
+        )
+        return (
+            f"You are evaluating which {kind}s deserve thoughtful engagement.\n\n"
+            f"{kind.upper()}S:\n{items}\n\n"
+            f"Score every {kind} from 0 to 10: 10 = substantive, thought-provoking, intelligent "
+            f"and worthy of discussion; 0 = spam, empty or low effort.\n"
+            f"Respond with ONLY a JSON array, one object per {kind}, e.g.\n"
+            f'[{{"id": 1, "score": 7}}, {{"id": 2, "score": 2}}]'
+        )
+
+    def parse_scores(self, response: Optional[str], count: int) -> Optional[List[Optional[float]]]:
+        """
+        Extract one score per item from a model response
+
+        Args:
+            response: Raw model output
+            count: Number of items that were in the prompt
+
+        Returns:
+            List of scores (None for items the model skipped), or None if nothing parsed
+        """
+        if not response:
+            return None
+        count = min(count, self.batch_size)
+        pairs = self._parse_json(response)
+        if not pairs:
+            pairs = [(int(i), float(s)) for i, s in _SCORE_LINE.findall(response)]
+
+        scores: List[Optional[float]] = [None] * count
+        for item_id, score in pairs:
+            if 1 <= item_id <= count and scores[item_id - 1] is None:
+                scores[item_id - 1] = max(0.0, min(self.MAX_SCORE, score))
+        if all(score is None for score in scores):
+            return None
+        return scores
+
+    @staticmethod
+    def _parse_json(response: str) -> List[Tuple[int, float]]:
+        """(id, score) pairs from the first JSON array in the response"""
+        start, end = response.find("["), response.rfind("]")
+        if start < 0 or end <= start:
+            return []
+        try:
+            data = json.loads(response[start:end + 1])
+        except ValueError:
+            return []
+        if not isinstance(data, list):
+            return []
+
+        pairs = []
+        for position, entry in enumerate(data, start=1):
+            if isinstance(entry, dict):
+                item_id, score = entry.get("id", position), entry.get("score")
+            else:
+                item_id, score = position, entry
+            try:
+                pairs.append((int(item_id), float(score)))
+            except (TypeError, ValueError):
+                continue
+        return pairs
+
+    def rank(self, scores: List[Optional[float]]) -> List[Tuple[int, float]]:
+        """(index, score) of items at or above min_score, best first (ties keep feed order; None is skipped)"""
+        ranked = [(i, score) for i, score in enumerate(scores) if score is not None and score >= self.min_score]
+        return sorted(ranked, key=lambda pair: -pair[1])
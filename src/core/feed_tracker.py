@@ -0,0 +1,109 @@
+"""
+Feed Tracker - Seen-set with evaluation verdicts for incremental feed processing
+"""
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+from src.utils.state_store import ActionStateStore
+
+logger = logging.getLogger(__name__)
+
+
+class FeedTracker:
+    """
+    Remembers which feed posts were already evaluated and how they scored
+
+    Verdicts live in a bounded LRU (persisted to the state store when one is
+    attached), so each cycle only sends newly arrived posts to the evaluator
+    and reuses earlier scores for the rest of the page. For sort=new feeds a
+    watermark (newest post id seen) marks where the previous fetch ended.
+    """
+
+    def __init__(self, store: Optional[ActionStateStore] = None, max_entries: int = 5000):
+        """
+        Initialize tracker (persisted verdicts are loaded on first use)
+
+        Args:
+            store: State store for verdicts and watermarks (in-memory only if omitted)
+            max_entries: Verdicts kept in memory
+        """
+        self.store = store
+        self.max_entries = max_entries
+        self._verdicts: "OrderedDict[str, float]" = OrderedDict()
+        self._loaded = store is None
+        self._watermarks: Dict[str, Optional[str]] = {}
+
+        # Statistics
+        self.evaluated = 0
+        self.reused = 0
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            self._verdicts.update(self.store.load_verdicts(self.max_entries))
+
+    def verdict(self, post_id: str) -> Optional[float]:
+        """Score a post received when it was evaluated, or None if never evaluated"""
+        self._ensure_loaded()
+        score = self._verdicts.get(post_id)
+        if score is not None:
+            self._verdicts.move_to_end(post_id)
+        return score
+
+    def record(self, post_id: str, score: float):
+        """Remember an evaluation verdict"""
+        self._ensure_loaded()
+        self._verdicts[post_id] = score
+        self._verdicts.move_to_end(post_id)
+        while len(self._verdicts) > self.max_entries:
+            self._verdicts.popitem(last=False)
+        self.evaluated += 1
+        if self.store:
+            self.store.set_verdict(post_id, score)
+
+    def split(self, posts: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, float]]:
+        """Indices of never-evaluated posts, and cached scores for the others"""
+        fresh, known = [], {}
+        for index, post in enumerate(posts):
+            score = self.verdict(post.get("id"))
+            if score is None:
+                fresh.append(index)
+            else:
+                known[index] = score
+        self.reused += len(known)
+        return fresh, known
+
+    def watermark(self, feed_key: str) -> Optional[str]:
+        """Newest post id seen on a sort=new feed"""
+        if feed_key not in self._watermarks:
+            self._watermarks[feed_key] = self.store.get_meta(f"watermark:{feed_key}") if self.store else None
+        return self._watermarks[feed_key]
+
+    def take_new(self, feed_key: str, page: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Posts of a newest-first page that arrived after the watermark
+
+        Returns:
+            (new posts, whether the watermark was reached on this page)
+        """
+        mark = self.watermark(feed_key)
+        for index, post in enumerate(page):
+            if mark is not None and post.get("id") == mark:
+                return page[:index], True
+        return page, mark is None
+
+    def advance(self, feed_key: str, page: List[Dict[str, Any]]):
+        """Move the watermark to the newest post of a page"""
+        if page and page[0].get("id"):
+            self._watermarks[feed_key] = page[0]["id"]
+            if self.store:
+                self.store.set_meta(f"watermark:{feed_key}", page[0]["id"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Evaluation vs reuse counters"""
+        return {
+            "evaluated": self.evaluated,
+            "reused": self.reused,
+            "known": len(self._verdicts)
+        }
@@ -0,0 +1,218 @@
+"""
+Candidate Ranker - Local pre-ranking of a feed page before any Gemini call
+"""
+import math
+import time
+import logging
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Callable, Set
+
+from src.clients.models import Post
+from src.intelligence.retrieval import tokenize
+from src.utils.state_store import ActionStateStore
+
+logger = logging.getLogger(__name__)
+
+# feature(ranker, page, tokens) -> one value per post of the page
+Feature = Callable[["CandidateRanker", List[Post], List[Set[str]]], List[float]]
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from an epoch number or an ISO 8601 string"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def expertise_feature(ranker: "CandidateRanker", page: List[Post], tokens: List[Set[str]]) -> List[float]:
+    """Share of the persona's expertise terms a post touches"""
+    if not ranker.expertise:
+        return [0.0] * len(page)
+    return [len(words & ranker.expertise) / len(ranker.expertise) for words in tokens]
+
+
+def freshness_feature(ranker: "CandidateRanker", page: List[Post], tokens: List[Set[str]]) -> List[float]:
+    """Exponential decay by post age (half-life freshness_hours); undated posts count as fresh"""
+    now = ranker.clock()
+    decay = math.log(2) / (ranker.freshness_hours * 3600)
+    values = []
+    for post in page:
+        created = _timestamp(post.created_at)
+        values.append(1.0 if created is None else math.exp(-decay * max(0.0, now - created)))
+    return values
+
+
+def discussion_feature(ranker: "CandidateRanker", page: List[Post], tokens: List[Set[str]]) -> List[float]:
+    """Log-scaled comment count (a live thread, with diminishing returns)"""
+    return [math.log1p(post.comment_count or 0) for post in page]
+
+
+def author_feature(ranker: "CandidateRanker", page: List[Post], tokens: List[Set[str]]) -> List[float]:
+    """Rapport with authors engaged before, turning negative once they've had repeat_limit replies"""
+    values = []
+    for post in page:
+        engaged = ranker.authors[post.author_name]
+        if engaged > ranker.repeat_limit:
+            values.append(-float(engaged - ranker.repeat_limit))
+        else:
+            values.append(min(engaged, 1))
+    return values
+
+
+def novelty_feature(ranker: "CandidateRanker", page: List[Post], tokens: List[Set[str]]) -> List[float]:
+    """Penalty: highest word overlap (Jaccard) with a recently engaged post"""
+    values = []
+    for words in tokens:
+        overlap = 0.0
+        for seen in ranker.recent:
+            union = len(words | seen)
+            if union:
+                overlap = max(overlap, len(words & seen) / union)
+        values.append(-overlap)
+    return values
+
+
+class CandidateRanker:
+    """
+    Scores a whole feed page locally so only its best posts reach Gemini
+
+    Every feature is computed as one column over the page, scaled to 0-1
+    across that page and mixed by weight. Features are plain functions
+    registered by name (see DEFAULT_FEATURES), so a new signal is one function
+    and one weight. Authors we replied to are kept in the state store; the
+    novelty penalty compares against the last few posts we engaged with.
+    """
+
+    DEFAULT_FEATURES: Dict[str, Feature] = {
+        "expertise": expertise_feature,
+        "freshness": freshness_feature,
+        "discussion": discussion_feature,
+        "author": author_feature,
+        "novelty": novelty_feature
+    }
+
+    DEFAULT_WEIGHTS: Dict[str, float] = {
+        "expertise": 3.0,
+        "freshness": 1.5,
+        "discussion": 1.0,
+        "author": 1.0,
+        "novelty": 2.0
+    }
+
+    def __init__(self, expertise: Optional[List[str]] = None, weights: Optional[Dict[str, float]] = None,
+                 top_k: int = 5, min_score: float = 0.0, freshness_hours: float = 12.0,
+                 repeat_limit: int = 3, novelty_window: int = 20,
+                 store: Optional[ActionStateStore] = None, clock: Callable[[], float] = time.time):
+        """
+        Initialize ranker
+
+        Args:
+            expertise: Persona expertise phrases
+            weights: Feature weight overrides (0 disables a feature)
+            top_k: Unseen posts per page passed on to Gemini
+            min_score: Local score (0-1) a post needs to be passed on at all
+            freshness_hours: Age at which freshness has halved
+            repeat_limit: Replies to one author before they start ranking lower
+            novelty_window: Recently engaged posts compared against
+            store: State database for author history (in-memory only if omitted)
+            clock: Wall clock (epoch seconds)
+        """
+        self.expertise: Set[str] = set(tokenize(" ".join(expertise or [])))
+        self.features: Dict[str, Feature] = dict(self.DEFAULT_FEATURES)
+        self.weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        self.top_k = top_k
+        self.min_score = min_score
+        self.freshness_hours = freshness_hours
+        self.repeat_limit = repeat_limit
+        self.recent: deque = deque(maxlen=novelty_window)
+        self.store = store
+        self.clock = clock
+        self._authors: Optional[Counter] = None
+
+        # Statistics
+        self.ranked = 0
+        self.passed = 0
+
+    @classmethod
+    def from_config(cls, ranking: Optional[Dict[str, Any]] = None, persona: Optional[Dict[str, Any]] = None,
+                    store: Optional[ActionStateStore] = None) -> "CandidateRanker":
+        """Build ranker from the config.json 'ranking' section and the persona"""
+        ranking = ranking or {}
+        return cls(expertise=(persona or {}).get("expertise", []),
+                   weights=ranking.get("weights"),
+                   top_k=ranking.get("top_k", 5),
+                   min_score=ranking.get("min_score", 0.0),
+                   freshness_hours=ranking.get("freshness_hours", 12),
+                   repeat_limit=ranking.get("author_repeat_limit", 3),
+                   novelty_window=ranking.get("novelty_window", 20),
+                   store=store)
+
+    @property
+    def authors(self) -> Counter:
+        """Replies per author, loaded from the store on first use"""
+        if self._authors is None:
+            keys = self.store.load("engaged_authors") if self.store else ()
+            self._authors = Counter(key.split("/", 1)[0] for key in keys)
+        return self._authors
+
+    def register(self, name: str, feature: Feature, weight: float = 1.0):
+        """Add (or replace) a feature column"""
+        self.features[name] = feature
+        self.weights[name] = weight
+
+    def score(self, page: List[Post]) -> List[float]:
+        """Weighted local score (0-1) of every post on the page"""
+        if not page:
+            return []
+        page = Post.many(page)
+        tokens = [set(tokenize(f"{post.title or ''} {post.content or ''}")) for post in page]
+        totals = [0.0] * len(page)
+        weight_sum = 0.0
+        for name, feature in self.features.items():
+            weight = self.weights.get(name, 0.0)
+            if not weight:
+                continue
+            column = feature(self, page, tokens)
+            low, high = min(column), max(column)
+            span = high - low
+            for i, value in enumerate(column):
+                # A flat column carries no preference: everyone gets the same neutral share
+                totals[i] += weight * ((value - low) / span if span else 0.5)
+            weight_sum += weight
+        return [total / weight_sum for total in totals] if weight_sum else [0.0] * len(page)
+
+    def top(self, page: List[Post], indices: List[int]) -> List[int]:
+        """The top_k of the given page indices by local score (scaled over the whole page), best first"""
+        if not indices:
+            return []
+        scores = self.score(page)
+        order = sorted(indices, key=lambda i: scores[i], reverse=True)
+        chosen = [i for i in order if scores[i] >= self.min_score][:self.top_k]
+        self.ranked += len(indices)
+        self.passed += len(chosen)
+        return chosen
+
+    def record(self, post_id: str, author: Optional[str], text: str):
+        """Remember a post we replied to (author history and novelty)"""
+        if author:
+            self.authors[author] += 1
+            if self.store:
+                self.store.add("engaged_authors", f"{author}/{post_id}")
+        self.recent.append(set(tokenize(text)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ranking counters"""
+        return {
+            "ranked": self.ranked,
+            "passed": self.passed,
+            "known_authors": len(self.authors)
+        }
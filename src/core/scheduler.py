@@ -0,0 +1,207 @@
+"""
+Scheduler - Run agent activities on their own cadences, woken by rate-limit windows
+"""
+import time
+import heapq
+import random
+import asyncio
+import inspect
+import logging
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Activity:
+    """One recurring agent activity (post, feed scan, DM poll, ...)"""
+
+    __slots__ = ("name", "action", "interval", "priority", "gate", "group", "initial_delay",
+                 "due", "runs", "errors", "deferrals")
+
+    def __init__(self, name: str, action: Callable, interval: Tuple[float, float], priority: int = 0,
+                 gate: Optional[Callable[[], float]] = None, group: Optional[str] = None,
+                 initial_delay: float = 0.0):
+        """
+        Initialize activity
+
+        Args:
+            name: Name used in logs and stats
+            action: Callable (or coroutine function) doing the work
+            interval: (min, max) seconds between runs, picked uniformly
+            priority: Lower runs first when several activities are due together
+            gate: Seconds until the activity's rate-limit window opens (0 = open now)
+            group: Activities sharing a group never run concurrently
+            initial_delay: Seconds before the first run
+        """
+        self.name = name
+        self.action = action
+        self.interval = interval
+        self.priority = priority
+        self.gate = gate
+        self.group = group
+        self.initial_delay = initial_delay
+        self.due = 0.0
+        self.runs = 0
+        self.errors = 0
+        self.deferrals = 0
+
+    def next_interval(self) -> float:
+        return random.uniform(*self.interval)
+
+    def blocked_for(self) -> float:
+        """Seconds the gate keeps this activity closed"""
+        return max(0.0, self.gate()) if self.gate else 0.0
+
+
+class Scheduler:
+    """
+    Priority timer queue for agent activities
+
+    Every activity is due on its own randomized cadence. When it comes due
+    but its rate-limit gate is still closed (post cooldown, comment slot),
+    it is re-queued for the exact moment the window opens instead of waiting
+    a whole cadence. The sync runner pops activities from a heap ordered by
+    (due time, priority); the async runner gives each activity its own task.
+    """
+
+    def __init__(self, activities: List[Activity], clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 on_idle: Optional[Callable[[], None]] = None,
+                 on_error: Optional[Callable[[Activity, Exception], None]] = None):
+        """
+        Initialize scheduler (activities are due after their initial delay)
+
+        Args:
+            activities: Activities to run
+            clock: Monotonic clock (injectable for tests)
+            sleep: Blocking sleep used by run() (injectable for tests)
+            on_idle: Called before sleeping (e.g. to flush buffered writes)
+            on_error: Called when an activity raises
+        """
+        self.activities = activities
+        self.clock = clock
+        self.sleep = sleep
+        self.on_idle = on_idle
+        self.on_error = on_error
+        self._heap: List[Tuple[float, int, int, Activity]] = []
+        self._seq = 0
+        now = clock()
+        for activity in activities:
+            self._push(activity, now + activity.initial_delay)
+
+    def _push(self, activity: Activity, due: float):
+        activity.due = due
+        self._seq += 1
+        heapq.heappush(self._heap, (due, activity.priority, self._seq, activity))
+
+    def _finish(self, activity: Activity, error: Optional[Exception]):
+        """Count a run and pick the next due time"""
+        activity.runs += 1
+        if error is not None:
+            activity.errors += 1
+            logger.error(f"Error in {activity.name}: {error}")
+            if self.on_error:
+                self.on_error(activity, error)
+        activity.due = self.clock() + activity.next_interval()
+
+    def run_pending(self) -> Optional[float]:
+        """
+        Run every activity that is due and whose window is open
+
+        Returns:
+            Seconds until the next activity is due (None if there are none)
+        """
+        while self._heap:
+            due, _, _, activity = self._heap[0]
+            now = self.clock()
+            if due > now:
+                return due - now
+            heapq.heappop(self._heap)
+
+            blocked = activity.blocked_for()
+            if blocked > 0:
+                activity.deferrals += 1
+                self._push(activity, now + blocked)
+                continue
+
+            error = None
+            try:
+                with metrics.time("agent_stage_seconds", stage=activity.name):
+                    activity.action()
+            except Exception as e:
+                error = e
+            self._finish(activity, error)
+            self._push(activity, activity.due)
+        return None
+
+    def run(self):
+        """Run activities forever, sleeping until the next one is due"""
+        logger.info(f"Scheduling: {', '.join(a.name for a in self.activities)}")
+        while True:
+            wait = self.run_pending()
+            if wait is None:
+                return
+            if self.on_idle:
+                self.on_idle()
+            self.sleep(wait)
+
+    async def arun(self):
+        """Run each activity as its own task until cancelled"""
+        logger.info(f"Scheduling: {', '.join(a.name for a in self.activities)}")
+        locks: Dict[str, asyncio.Lock] = {}
+        tasks = [asyncio.create_task(self._loop(activity, locks), name=activity.name)
+                 for activity in self.activities]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _loop(self, activity: Activity, locks: Dict[str, asyncio.Lock]):
+        lock = locks.setdefault(activity.group, asyncio.Lock()) if activity.group else None
+        while True:
+            wait = activity.due - self.clock()
+            if wait <= 0:
+                wait = activity.blocked_for()
+                if wait > 0:
+                    activity.deferrals += 1
+                    activity.due = self.clock() + wait
+            if wait > 0:
+                if self.on_idle:
+                    self.on_idle()
+                await asyncio.sleep(wait)
+                continue
+
+            error = None
+            try:
+                if lock:
+                    async with lock:
+                        with metrics.time("agent_stage_seconds", stage=activity.name):
+                            await self._call(activity)
+                else:
+                    with metrics.time("agent_stage_seconds", stage=activity.name):
+                        await self._call(activity)
+            except Exception as e:
+                error = e
+            self._finish(activity, error)
+
+    @staticmethod
+    async def _call(activity: Activity):
+        result = activity.action()
+        if inspect.isawaitable(result):
+            await result
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Runs, errors, rate-limit deferrals and time until next run per activity"""
+        now = self.clock()
+        return {
+            activity.name: {
+                "runs": activity.runs,
+                "errors": activity.errors,
+                "deferrals": activity.deferrals,
+                "next_in_seconds": round(max(0.0, activity.due - now), 1)
+            }
+            for activity in self.activities
+        }
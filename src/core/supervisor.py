@@ -0,0 +1,216 @@
+"""
+Supervisor - Run several personas as AsyncAgents on one event loop
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+import contextvars
+from typing import Dict, Any, List, Optional
+
+from src.utils import ConfigLoader
+from src.clients.gemini_client import GeminiClient
+from src.clients.generation_cache import GenerationCache
+from src.clients.rate_limiter import RateLimiter
+from src.clients.response_cache import ResponseCache
+from src.clients.outbox import Outbox
+from src.clients.async_moltbook_client import AsyncMoltbookClient, make_http_client
+from src.utils.state_store import ActionStateStore
+from src.intelligence import IntelligenceSystem
+from src.core.async_agent import AsyncAgent
+
+logger = logging.getLogger(__name__)
+
+# Name of the agent whose task is logging (copied into each runner's task context)
+current_agent: contextvars.ContextVar = contextvars.ContextVar("current_agent", default="")
+
+
+class AgentLogFilter(logging.Filter):
+    """Expose the running agent's name to log formats as %(agent)s"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = current_agent.get()
+        record.agent = f"[{name}] " if name else ""
+        return True
+
+
+class AgentRunner:
+    """One persona's AsyncAgent loop plus its throughput counters"""
+
+    def __init__(self, name: str, agent: AsyncAgent, start_delay: float = 0.0):
+        """
+        Initialize runner
+
+        Args:
+            name: Persona name (used in logs and stats)
+            agent: Fully wired AsyncAgent
+            start_delay: Seconds to wait before the first cycle (staggers a fleet)
+        """
+        self.name = name
+        self.agent = agent
+        self.start_delay = start_delay
+        self.started_at: Optional[float] = None
+        self.cycle_seconds = 0.0
+        self.errors = 0
+
+    async def run(self):
+        """Initialize, then cycle and rest until cancelled"""
+        current_agent.set(self.name)
+        await asyncio.sleep(self.start_delay)
+        self.started_at = time.monotonic()
+        await self.agent.initialize()
+        while True:
+            started = time.monotonic()
+            try:
+                await self.agent.run_cycle()
+            except Exception as e:
+                # run_cycle handles its own errors; this only guards the loop
+                self.errors += 1
+                logger.error(f"Cycle failed: {e}")
+            self.cycle_seconds += time.monotonic() - started
+            await self.agent.rest()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters and rates for this agent"""
+        agent = self.agent
+        actions = agent.posts_made + agent.replies_made + agent.comment_replies_made
+        uptime = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "cycles": agent.cycle,
+            "posts": agent.posts_made,
+            "replies": agent.replies_made,
+            "comment_replies": agent.comment_replies_made,
+            "semantic_discoveries": agent.semantic_discoveries,
+            "errors": self.errors,
+            "actions": actions,
+            "actions_per_hour": round(actions * 3600 / uptime, 2) if uptime else 0.0,
+            "avg_cycle_seconds": round(self.cycle_seconds / agent.cycle, 2) if agent.cycle else 0.0
+        }
+
+    async def aclose(self):
+        """Release this agent's client, state store and memory files"""
+        await self.agent.moltbot.aclose()
+        if self.agent.moltbot.state_store:
+            self.agent.moltbot.state_store.close()
+        self.agent.intelligence.close()
+
+
+class Supervisor:
+    """
+    Schedules a fleet of personas on a shared event loop
+
+    All agents share one pooled httpx client and one GeminiClient (keys and
+    generation cache); each keeps its own API key, rate limiter, response
+    cache, state database and SOUL/MEMORY/HISTORY files.
+    """
+
+    def __init__(self, runners: List[AgentRunner], http=None, gemini: Optional[GeminiClient] = None,
+                 stats_interval: float = 600.0):
+        """
+        Initialize supervisor
+
+        Args:
+            runners: One runner per persona
+            http: Shared httpx.AsyncClient (closed on shutdown)
+            gemini: Shared Gemini client (closed on shutdown)
+            stats_interval: Seconds between fleet stats log lines (0 = never)
+        """
+        self.runners = runners
+        self.http = http
+        self.gemini = gemini
+        self.stats_interval = stats_interval
+
+    @classmethod
+    def from_directories(cls, agent_dirs: List[str], base_config: Dict[str, Any],
+                         gemini_keys: str) -> "Supervisor":
+        """
+        Build a supervisor from persona directories
+
+        Each directory holds register.json (persona), .env (MOLTBOOK_API_KEY),
+        an optional config.json merged over base_config, and a data/ folder for
+        SOUL.md, MEMORY.md, HISTORY.md and state.db.
+        """
+        network = base_config.get("network", {})
+        fleet = base_config.get("fleet", {})
+        http = make_http_client(max_connections=network.get("pool_maxsize", 10),
+                                connect_timeout=network.get("connect_timeout_seconds", 5.0),
+                                read_timeout=network.get("read_timeout_seconds", 30.0),
+                                max_retries=network.get("max_retries", 3))
+        gemini_config = base_config.get("gemini", {})
+        key_pool = gemini_config.get("key_pool", {})
+        gemini = GeminiClient(gemini_keys, cache=GenerationCache.from_config(gemini_config.get("cache", {})),
+                              key_pool=key_pool, max_wait=key_pool.get("max_wait_seconds", 60),
+                              max_concurrency=key_pool.get("max_concurrency"),
+                              stream_retries=gemini_config.get("streaming", {}).get("max_retries", 1))
+
+        stagger = fleet.get("start_stagger_seconds", 30)
+        runners = []
+        for agent_dir in agent_dirs:
+            persona = ConfigLoader.load_json(os.path.join(agent_dir, "register.json"))
+            env = ConfigLoader.load_env(os.path.join(agent_dir, ".env"))
+            api_key = env.get("MOLTBOOK_API_KEY")
+            if not persona or not api_key:
+                logger.error(f"Skipping {agent_dir}: register.json and MOLTBOOK_API_KEY in .env are required")
+                continue
+
+            config = ConfigLoader.merge(base_config, ConfigLoader.load_json(os.path.join(agent_dir, "config.json")))
+            data_dir = os.path.join(agent_dir, "data")
+            os.makedirs(data_dir, exist_ok=True)
+            name = persona.get("name", os.path.basename(os.path.normpath(agent_dir)))
+
+            state_store = ActionStateStore(os.path.join(data_dir, "state.db"),
+                                           verdict_ttl_days=config.get("evaluation", {}).get("verdict_ttl_days", 7))
+            moltbot = AsyncMoltbookClient.from_config(
+                api_key, name, config.get("network", {}),
+                limiter=RateLimiter.from_config(config.get("rate_limits", {})),
+                state_store=state_store,
+                cache=ResponseCache.from_config(config.get("cache", {})),
+                http=http,
+                outbox=Outbox.from_config(state_store, config.get("outbox", {}))
+            )
+            intelligence = IntelligenceSystem.from_config(config.get("intelligence", {}), data_dir=data_dir)
+            agent = AsyncAgent(gemini, moltbot, persona, intelligence, config)
+            runners.append(AgentRunner(name, agent, start_delay=random.uniform(0, stagger) if runners else 0.0))
+
+        return cls(runners, http=http, gemini=gemini, stats_interval=fleet.get("stats_interval_seconds", 600))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-agent stats plus fleet totals"""
+        agents = {runner.name: runner.get_stats() for runner in self.runners}
+        totals: Dict[str, Any] = {"agents": len(agents)}
+        for stats in agents.values():
+            for key in ("cycles", "posts", "replies", "comment_replies", "semantic_discoveries",
+                        "errors", "actions", "actions_per_hour"):
+                totals[key] = round(totals.get(key, 0) + stats[key], 2)
+        return {"agents": agents, "total": totals}
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            stats = self.get_stats()
+            logger.info(f"\nFleet: {stats['total']}")
+            for name, agent_stats in stats["agents"].items():
+                logger.info(f"   @{name}: {agent_stats}")
+
+    async def run(self):
+        """Run every agent until cancelled, then release shared resources"""
+        logger.info(f"Supervising {len(self.runners)} agent(s): {', '.join(r.name for r in self.runners)}")
+        tasks = [asyncio.create_task(runner.run(), name=runner.name) for runner in self.runners]
+        if self.stats_interval:
+            tasks.append(asyncio.create_task(self._report()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.aclose()
+
+    async def aclose(self):
+        """Close per-agent resources, then the shared pool and Gemini client"""
+        for runner in self.runners:
+            await runner.aclose()
+        if self.http is not None:
+            await self.http.aclose()
+        if self.gemini is not None:
+            self.gemini.close()
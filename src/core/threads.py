@@ -0,0 +1,175 @@
+"""
+Comment Threads - Indexed comment trees per post with incremental refresh
+"""
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Any, List, Iterator, Tuple, Iterable, Callable
+
+from src.clients.models import Comment
+
+
+class CommentThread:
+    """
+    Flattened comment tree of one post
+
+    Accepts the API's nested form (comments carrying 'replies') as well as
+    flat lists linked by 'parent_id', indexes comments by id, parent and
+    author, and merges later fetches in place so only new comments are added.
+    """
+
+    def __init__(self, post_id: str):
+        self.post_id = post_id
+        self.comments: Dict[str, Comment] = {}
+        self.parent: Dict[str, Optional[str]] = {}
+        self.children: Dict[Optional[str], List[str]] = {}
+        self.by_author: Dict[str, List[str]] = {}
+        self._depth: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.comments)
+
+    def __contains__(self, comment_id: str) -> bool:
+        return comment_id in self.comments
+
+    def get(self, comment_id: str) -> Optional[Comment]:
+        return self.comments.get(comment_id)
+
+    def update(self, comments: Iterable[Any]) -> List[str]:
+        """Merge a fetched comment list (nested or flat); returns ids not seen before"""
+        added = []
+        stack = [(comment, None) for comment in reversed(Comment.many(list(comments or [])))]
+        while stack:
+            comment, parent_id = stack.pop()
+            comment_id = comment.id
+            if not comment_id:
+                continue
+            nested = comment.replies or []
+            if comment_id not in self.comments:
+                parent = comment.parent_id or parent_id
+                self.parent[comment_id] = parent
+                self.children.setdefault(parent, []).append(comment_id)
+                self.by_author.setdefault(comment.author_name, []).append(comment_id)
+                added.append(comment_id)
+            # Stored flat (the tree lives in parent/children); a refetch replaces the stored copy
+            self.comments[comment_id] = comment.replace(replies=None) if nested else comment
+            stack.extend((child, comment_id) for child in reversed(nested))
+        if added:
+            self._depth.clear()
+        return added
+
+    def depth(self, comment_id: str) -> int:
+        """0 for top-level comments (and replies whose parent is unknown)"""
+        if comment_id not in self._depth:
+            chain, node = [], comment_id
+            while node is not None and node not in self._depth:
+                chain.append(node)
+                parent = self.parent.get(node)
+                node = parent if parent in self.comments and parent not in chain else None
+            base = self._depth[node] + 1 if node is not None else 0
+            for offset, item in enumerate(reversed(chain)):
+                self._depth[item] = base + offset
+        return self._depth[comment_id]
+
+    def _roots(self) -> List[str]:
+        return [cid for cid in self.comments if self.parent[cid] not in self.comments]
+
+    def bfs(self, max_depth: Optional[int] = None) -> Iterator[Tuple[int, Comment]]:
+        """(depth, comment) level by level, in fetch order within a level"""
+        queue = deque((0, cid) for cid in self._roots())
+        while queue:
+            level, cid = queue.popleft()
+            yield level, self.comments[cid]
+            if max_depth is None or level < max_depth:
+                queue.extend((level + 1, child) for child in self.children.get(cid, ()))
+
+    def answered_by(self, comment_id: str, name: str) -> bool:
+        """Whether `name` already replied directly to a comment"""
+        return any(self.comments[child].author_name == name for child in self.children.get(comment_id, ()))
+
+    def mentions(self, name: str) -> Iterator[Comment]:
+        """Comments that @mention `name` and that `name` has not answered"""
+        pattern = re.compile(rf"@{re.escape(name)}\b", re.IGNORECASE)
+        for cid, comment in self.comments.items():
+            if (comment.author_name != name and pattern.search(comment.content or "")
+                    and not self.answered_by(cid, name)):
+                yield comment
+
+    def replies_to(self, name: str) -> Iterator[Comment]:
+        """Unanswered direct replies to comments written by `name`"""
+        for own_id in self.by_author.get(name, ()):
+            for cid in self.children.get(own_id, ()):
+                comment = self.comments[cid]
+                if comment.author_name != name and not self.answered_by(cid, name):
+                    yield comment
+
+
+class ThreadCache:
+    """
+    LRU of comment trees keyed by post id
+
+    A tree is reused without refetching for `ttl_seconds`; after that (or
+    after invalidate(), e.g. once we replied) the next fetch is merged into
+    the existing tree instead of rebuilding it.
+    """
+
+    def __init__(self, max_threads: int = 200, ttl_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize cache
+
+        Args:
+            max_threads: Posts whose trees are kept
+            ttl_seconds: Age after which a tree is refreshed
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._threads: "OrderedDict[str, Tuple[CommentThread, float]]" = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.refreshes = 0
+
+    @classmethod
+    def from_config(cls, threads: Optional[Dict[str, Any]] = None) -> "ThreadCache":
+        """Build cache from the config.json 'threads' section"""
+        threads = threads or {}
+        return cls(max_threads=threads.get("max_cached_threads", 200),
+                   ttl_seconds=threads.get("refresh_seconds", 300))
+
+    def fresh(self, post_id: str) -> Optional[CommentThread]:
+        """Cached tree if it is younger than the TTL"""
+        entry = self._threads.get(post_id)
+        if entry is None or self.clock() - entry[1] >= self.ttl_seconds:
+            return None
+        self._threads.move_to_end(post_id)
+        self.hits += 1
+        return entry[0]
+
+    def store(self, post_id: str, comments: List[Comment]) -> CommentThread:
+        """Merge a fetch into the post's tree (creating it if needed)"""
+        entry = self._threads.pop(post_id, None)
+        thread = entry[0] if entry else CommentThread(post_id)
+        thread.update(comments)
+        self._threads[post_id] = (thread, self.clock())
+        self.refreshes += 1
+        while len(self._threads) > self.max_threads:
+            self._threads.popitem(last=False)
+        return thread
+
+    def invalidate(self, post_id: str):
+        """Force the next lookup to refetch (the tree is kept for merging)"""
+        entry = self._threads.get(post_id)
+        if entry:
+            self._threads[post_id] = (entry[0], float("-inf"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Reuse counters and footprint"""
+        return {
+            "threads": len(self._threads),
+            "comments": sum(len(thread) for thread, _ in self._threads.values()),
+            "hits": self.hits,
+            "refreshes": self.refreshes
+        }
@@ -0,0 +1,178 @@
+"""
+Topic Index - Local semantic discovery over posts already downloaded
+"""
+import time
+import zlib
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Callable, FrozenSet, Tuple
+
+from src.clients.models import Post, SearchResult
+from src.intelligence.retrieval import tokenize
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 4
+NGRAM_WEIGHT = 0.5
+
+
+def _bucket(feature: str, dim: int) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % dim
+
+
+def features(text: str, dim: int) -> Dict[int, float]:
+    """Hashed feature vector: words (weight 1) and their character 4-grams (weight 0.5)"""
+    vector: Dict[int, float] = {}
+    for word in tokenize(text):
+        bucket = _bucket(word, dim)
+        vector[bucket] = max(vector.get(bucket, 0.0), 1.0)
+        for i in range(len(word) - NGRAM + 1):
+            bucket = _bucket(f"#{word[i:i + NGRAM]}", dim)
+            vector[bucket] = max(vector.get(bucket, 0.0), NGRAM_WEIGHT)
+    return vector
+
+
+class TopicIndex:
+    """
+    Matches expertise topics against every post the agent has downloaded
+
+    Topics are hashed into feature vectors once; feed pages and search results
+    are hashed as they arrive into a bounded pool. A topic's similarity to a
+    post is the share of the topic's feature weight the post contains, so
+    long posts aren't penalized for saying more. Server semantic_search
+    results are cached per topic for search_ttl seconds, and a new search is
+    only needed when neither they nor the pool hold an unanswered match.
+    """
+
+    def __init__(self, topics: Optional[List[str]] = None, local_min_similarity: float = 0.6,
+                 search_min_similarity: float = 0.7, search_ttl: float = 1800, max_posts: int = 1000,
+                 dim: int = 1 << 20, clock: Callable[[], float] = time.time):
+        """
+        Initialize index
+
+        Args:
+            topics: Expertise areas (hashed once)
+            local_min_similarity: Local similarity (0-1) a pooled post needs to match a topic
+            search_min_similarity: Server similarity a search result needs to match
+            search_ttl: Seconds search results for a topic are reused
+            max_posts: Downloaded posts kept in the pool
+            dim: Hash space size
+            clock: Wall clock (epoch seconds)
+        """
+        self.local_min_similarity = local_min_similarity
+        self.search_min_similarity = search_min_similarity
+        self.search_ttl = search_ttl
+        self.max_posts = max_posts
+        self.dim = dim
+        self.clock = clock
+        self._topics: Dict[str, Dict[int, float]] = {}
+        self._pool: "OrderedDict[str, Tuple[Post, FrozenSet[int]]]" = OrderedDict()
+        self._searches: Dict[str, Tuple[float, List[SearchResult]]] = {}
+        for topic in topics or []:
+            self.topic_vector(topic)
+
+        # Statistics
+        self.lookups = 0
+        self.local_hits = 0
+        self.searches = 0
+
+    @classmethod
+    def from_config(cls, discovery: Optional[Dict[str, Any]] = None,
+                    persona: Optional[Dict[str, Any]] = None) -> "TopicIndex":
+        """Build index from the config.json 'discovery' section and the persona's expertise"""
+        discovery = discovery or {}
+        return cls(topics=(persona or {}).get("expertise", []),
+                   local_min_similarity=discovery.get("local_min_similarity", 0.6),
+                   search_min_similarity=discovery.get("search_min_similarity", 0.7),
+                   search_ttl=discovery.get("search_ttl_seconds", 1800),
+                   max_posts=discovery.get("max_pooled_posts", 1000))
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    def topic_vector(self, topic: str) -> Dict[int, float]:
+        if topic not in self._topics:
+            self._topics[topic] = features(topic, self.dim)
+        return self._topics[topic]
+
+    def observe(self, posts: List[Post]):
+        """Add downloaded posts to the pool (each is hashed once)"""
+        for post in Post.many(posts):
+            post_id = post.id
+            if not post_id:
+                continue
+            if post_id in self._pool:
+                self._pool.move_to_end(post_id)
+                continue
+            text = f"{post.title or ''} {post.content or ''}"
+            self._pool[post_id] = (post, frozenset(features(text, self.dim)))
+            if len(self._pool) > self.max_posts:
+                self._pool.popitem(last=False)
+
+    def similarity(self, topic: str, post_features: FrozenSet[int]) -> float:
+        """Share of the topic's feature weight present in a post"""
+        vector = self.topic_vector(topic)
+        total = sum(vector.values())
+        if not total:
+            return 0.0
+        return sum(weight for bucket, weight in vector.items() if bucket in post_features) / total
+
+    def needs_search(self, topic: str) -> bool:
+        """Whether cached search results for a topic are missing or expired"""
+        cached = self._searches.get(topic)
+        return cached is None or self.clock() - cached[0] >= self.search_ttl
+
+    def add_search(self, topic: str, results: List[SearchResult]):
+        """Cache server search results for a topic (they also join the pool)"""
+        self.searches += 1
+        results = SearchResult.many(results)
+        self._searches[topic] = (self.clock(), results)
+        self.observe(results)
+
+    def lookup(self, topic: str, keep: Optional[Callable[[Post], bool]] = None) -> List[Post]:
+        """
+        Downloaded posts matching a topic, best first
+
+        Cached search hits above search_min_similarity come first (server
+        similarity), then pooled posts above local_min_similarity, each
+        carrying its score under "similarity".
+
+        Args:
+            topic: Expertise area
+            keep: Predicate for posts still worth engaging with
+        """
+        self.lookups += 1
+        hits, seen = [], set()
+        cached = None if self.needs_search(topic) else self._searches[topic][1]
+        for result in cached or []:
+            if (result.similarity or 0) > self.search_min_similarity and (keep is None or keep(result)):
+                hits.append(result)
+                seen.add(result.id)
+
+        local = []
+        for post_id, (post, post_features) in self._pool.items():
+            if post_id in seen or (keep is not None and not keep(post)):
+                continue
+            score = self.similarity(topic, post_features)
+            if score >= self.local_min_similarity:
+                local.append(post.replace(similarity=score))
+        local.sort(key=lambda post: post.similarity, reverse=True)
+        return hits + local
+
+    def discover(self, topic: str, keep: Optional[Callable[[Post], bool]] = None) -> Optional[List[Post]]:
+        """Matches from downloaded data, or None when a server search is due"""
+        hits = self.lookup(topic, keep)
+        if hits:
+            self.local_hits += 1
+            return hits
+        return None if self.needs_search(topic) else []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Discovery counters"""
+        return {
+            "lookups": self.lookups,
+            "local_hits": self.local_hits,
+            "searches": self.searches,
+            "pooled_posts": len(self._pool),
+            "topics": len(self._topics)
+        }
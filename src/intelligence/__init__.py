@@ -1,10 +1,13 @@
 """
 Intelligence System - Memory, Learning, and Identity Management
 """
+import os
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any
 from src.utils import ConfigLoader
+from src.intelligence.memory_log import MemoryLog
+from src.intelligence.retrieval import BM25Index, split_sections
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +17,9 @@ class IntelligenceSystem:
     
     def __init__(self, memory_file: str = "data/MEMORY.md", 
                  soul_file: str = "data/SOUL.md",
-                 history_file: str = "data/HISTORY.md"):
+                 history_file: str = "data/HISTORY.md",
+                 log_options: Optional[Dict[str, Any]] = None,
+                 index_max_docs: int = 100000):
         """
         Initialize intelligence system
         
@@ -22,14 +27,45 @@ class IntelligenceSystem:
             memory_file: Path to memory file
             soul_file: Path to SOUL file
             history_file: Path to history file
+            log_options: MemoryLog settings for MEMORY.md and HISTORY.md
+            index_max_docs: Memory entries kept in the retrieval index
         """
         self.memory_file = memory_file
         self.soul_file = soul_file
         self.history_file = history_file
         
-        self.memory = ConfigLoader.load_text(memory_file)
+        log_options = log_options or {}
+        self.memory_index = BM25Index(max_docs=index_max_docs)
+        self.memory_log = MemoryLog(memory_file, index=self.memory_index, **log_options)
+        self.history_log = MemoryLog(history_file, marker="**", **log_options)
         self.soul = ConfigLoader.load_text(soul_file)
-        self.history = ConfigLoader.load_text(history_file)
+        
+        self.soul_index = BM25Index()
+        for section in split_sections(self.soul):
+            self.soul_index.add(section)
+    
+    @classmethod
+    def from_config(cls, intel: Optional[Dict[str, Any]] = None, data_dir: str = "data") -> "IntelligenceSystem":
+        """Build from the config.json 'intelligence' section for the files in data_dir"""
+        intel = intel or {}
+        return cls(memory_file=os.path.join(data_dir, "MEMORY.md"),
+                   soul_file=os.path.join(data_dir, "SOUL.md"),
+                   history_file=os.path.join(data_dir, "HISTORY.md"),
+                   log_options={
+            "max_entries": intel.get("memory_max_entries", 500),
+            "flush_interval": intel.get("memory_flush_seconds", 5.0),
+            "max_file_bytes": intel.get("memory_max_file_bytes", 2 * 1024 * 1024)
+        }, index_max_docs=intel.get("memory_index_max_docs", 100000))
+    
+    @property
+    def memory(self) -> str:
+        """Recent memory held in memory (bounded)"""
+        return self.memory_log.text()
+    
+    @property
+    def history(self) -> str:
+        """Recent history held in memory (bounded)"""
+        return self.history_log.text()
     
     def get_memory(self) -> str:
         """Get current memory content"""
@@ -41,12 +77,22 @@ class IntelligenceSystem:
     
     def get_recent_memory(self, chars: int = 500) -> str:
         """Get recent memory excerpt"""
-        return self.memory[-chars:] if self.memory else "First session"
+        return self.memory_log.tail(chars) if self.memory_log else "First session"
     
     def get_soul_excerpt(self, chars: int = 500) -> str:
         """Get SOUL excerpt"""
         return self.soul[:chars] if self.soul else ""
     
+    def get_relevant_memory(self, query: str, chars: int = 500, k: int = 5) -> str:
+        """Memory entries most relevant to query within a character budget (recent memory if none match)"""
+        snippets = self.memory_index.select(query, chars, k)
+        return "\n".join(snippets) if snippets else self.get_recent_memory(chars)
+    
+    def get_relevant_soul(self, query: str, chars: int = 500, k: int = 3) -> str:
+        """SOUL sections most relevant to query within a character budget (opening excerpt if none match)"""
+        snippets = self.soul_index.select(query, chars, k)
+        return "\n\n".join(snippets) if snippets else self.get_soul_excerpt(chars)
+    
     def update_memory(self, entry: str):
         """
         Append entry to memory
@@ -57,8 +103,7 @@ class IntelligenceSystem:
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
             new_entry = f"\n[{timestamp}] {entry}"
-            ConfigLoader.save_text(self.memory_file, new_entry, mode="a")
-            self.memory += new_entry
+            self.memory_log.append(new_entry)
         except Exception as e:
             logger.warning(f"Could not update memory: {e}")
     
@@ -72,15 +117,24 @@ class IntelligenceSystem:
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
             new_entry = f"\n**{timestamp}** - {entry}"
-            ConfigLoader.save_text(self.history_file, new_entry, mode="a")
-            self.history += new_entry
+            self.history_log.append(new_entry)
         except Exception as e:
             logger.warning(f"Could not update history: {e}")
     
     def get_stats(self) -> dict:
         """Get intelligence statistics"""
         return {
-            "memory_words": len(self.memory.split()) if self.memory else 0,
+            "memory_words": self.memory_log.words,
             "soul_words": len(self.soul.split()) if self.soul else 0,
-            "history_entries": self.history.count("**") if self.history else 0
+            "history_entries": self.history_log.markers
         }
+    
+    def flush(self):
+        """Write buffered memory/history appends to disk"""
+        self.memory_log.flush()
+        self.history_log.flush()
+    
+    def close(self):
+        """Flush and close memory/history files"""
+        self.memory_log.close()
+        self.history_log.close()
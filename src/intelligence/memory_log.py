@@ -0,0 +1,162 @@
+"""
+Memory Log - Append-only markdown log with a bounded in-memory tail
+"""
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Optional, Dict, Any
+
+from src.intelligence.retrieval import BM25Index
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryLog:
+    """
+    Markdown file that is only ever appended to, mirrored by a ring of recent pieces
+
+    Startup reads just the last `tail_bytes` of the file; counters for the
+    whole file are gathered in one streaming pass. Appends go to a single open
+    file handle and are flushed at most every `flush_interval` seconds (the
+    first append after a quiet period is flushed immediately). Once the file
+    grows past `max_file_bytes` it is rotated to `<path>.1` and restarted from
+    the in-memory tail, so disk and memory use stay constant. When an index is
+    given, every entry (loaded or appended) is also added to it for retrieval.
+    """
+
+    def __init__(self, path: str, max_entries: int = 500, tail_bytes: int = 64 * 1024,
+                 flush_interval: float = 5.0, max_file_bytes: Optional[int] = 2 * 1024 * 1024,
+                 marker: Optional[str] = None, index: Optional[BM25Index] = None):
+        """
+        Initialize log
+
+        Args:
+            path: Markdown file to append to
+            max_entries: Pieces kept in memory (loaded lines + appended entries)
+            tail_bytes: Bytes read from the end of the file at startup
+            flush_interval: Max seconds an append stays buffered
+            max_file_bytes: Size that triggers rotation (None = never rotate)
+            marker: Substring counted for statistics (e.g. "**" for history entries)
+            index: Retrieval index fed with every entry
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.marker = marker
+        self.index = index
+        self._pieces: deque = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._file = None
+        self._dirty = False
+        self._last_flush = float("-inf")
+
+        # Statistics for the whole file
+        self.words = 0
+        self.markers = 0
+        self.file_bytes = 0
+        self._load(tail_bytes)
+
+    def _load(self, tail_bytes: int):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                self._count(line)
+                self._index(line)
+        self.file_bytes = os.path.getsize(self.path)
+
+        with open(self.path, "rb") as f:
+            f.seek(max(0, self.file_bytes - tail_bytes))
+            tail = f.read().decode("utf-8", errors="ignore")
+        lines = tail.splitlines(keepends=True)
+        if self.file_bytes > tail_bytes and len(lines) > 1:
+            lines = lines[1:]  # First line is probably cut in half
+        self._pieces.extend(lines)
+
+    def _count(self, text: str):
+        self.words += len(text.split())
+        if self.marker:
+            self.markers += text.count(self.marker)
+
+    def _index(self, text: str):
+        if self.index is None:
+            return
+        entry = text.strip()
+        if entry and not entry.startswith(("#", "<!--")):
+            self.index.add(entry)
+
+    def append(self, text: str):
+        """Append raw text (callers include their own leading newline)"""
+        with self._lock:
+            self._pieces.append(text)
+            self._count(text)
+            self._index(text)
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(text)
+            self.file_bytes += len(text.encode("utf-8"))
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def flush(self):
+        """Write buffered appends to disk"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._dirty:
+            return
+        self._file.flush()
+        self._dirty = False
+        if self.max_file_bytes and self.file_bytes > self.max_file_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        """Move the full file aside and restart it from the in-memory tail"""
+        self._file.close()
+        self._file = None
+        os.replace(self.path, self.path + ".1")
+        tail = self.text()
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(tail)
+        self.file_bytes = len(tail.encode("utf-8"))
+        logger.info(f"Rotated {self.path} (older entries in {self.path}.1)")
+
+    def text(self) -> str:
+        """Everything held in memory, in file order"""
+        return "".join(self._pieces)
+
+    def tail(self, chars: int) -> str:
+        """Last `chars` characters, joining only the pieces needed"""
+        needed, size = [], 0
+        for piece in reversed(self._pieces):
+            needed.append(piece)
+            size += len(piece)
+            if size >= chars:
+                break
+        return "".join(reversed(needed))[-chars:] if chars > 0 else ""
+
+    def __bool__(self) -> bool:
+        return bool(self._pieces)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Whole-file counters and in-memory footprint"""
+        return {
+            "words": self.words,
+            "markers": self.markers,
+            "file_bytes": self.file_bytes,
+            "entries_in_memory": len(self._pieces)
+        }
+
+    def close(self):
+        """Flush and close the file handle"""
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
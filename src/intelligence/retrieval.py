@@ -0,0 +1,151 @@
+"""
+Retrieval - Incremental BM25 index over memory entries and SOUL sections
+"""
+import re
+import math
+import heapq
+from itertools import islice
+from collections import Counter, OrderedDict
+from typing import Optional, Dict, List, Tuple
+
+_TOKEN = re.compile(r"[a-z][a-z0-9']+")
+_HEADING = re.compile(r"^#{1,6}\s", re.MULTILINE)
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in into is it its me my no not of on or our "
+    "so than that the their them then there these they this to was we were what when which who why "
+    "will with you your about can do just more some".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords or numbers"""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def split_sections(text: str, max_chars: int = 600) -> List[str]:
+    """Split markdown into heading-led sections, then paragraphs no longer than max_chars"""
+    sections = []
+    for block in _HEADING.split(text):
+        for paragraph in re.split(r"\n\s*\n", block):
+            paragraph = paragraph.strip()
+            while len(paragraph) > max_chars:
+                cut = paragraph.rfind("\n", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                sections.append(paragraph[:cut].strip())
+                paragraph = paragraph[cut:].strip()
+            if paragraph:
+                sections.append(paragraph)
+    return sections
+
+
+class BM25Index:
+    """
+    Okapi BM25 over short documents with incremental add and FIFO eviction
+
+    Postings map term -> {doc_id: term frequency}, so a lookup only touches
+    documents sharing a term with the query. Query terms are scored rarest
+    first; a term with more than `max_scan` postings only rescores documents
+    already matched by rarer terms (or, if there are none, its `max_scan`
+    newest postings). Terms present in more than `max_df_ratio` of documents
+    carry almost no weight and are skipped. Together this keeps lookups
+    around a millisecond at 100k entries.
+    """
+
+    def __init__(self, max_docs: int = 100000, k1: float = 1.2, b: float = 0.75,
+                 max_df_ratio: float = 0.25, max_scan: int = 1000):
+        """
+        Initialize index
+
+        Args:
+            max_docs: Documents kept before the oldest are evicted
+            k1: Term frequency saturation
+            b: Length normalization
+            max_df_ratio: Document frequency above which a query term is ignored
+            max_scan: Postings scanned in full for one term
+        """
+        self.max_docs = max_docs
+        self.k1 = k1
+        self.b = b
+        self.max_df_ratio = max_df_ratio
+        self.max_scan = max_scan
+        self._docs: "OrderedDict[int, Tuple[str, Counter]]" = OrderedDict()
+        self._lengths: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, text: str) -> Optional[int]:
+        """Index a document; returns its id (None if it has no searchable terms)"""
+        terms = Counter(tokenize(text))
+        if not terms:
+            return None
+        doc_id = self._next_id
+        self._next_id += 1
+
+        length = sum(terms.values())
+        self._docs[doc_id] = (text, terms)
+        self._lengths[doc_id] = length
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+        while len(self._docs) > self.max_docs:
+            self._evict_oldest()
+        return doc_id
+
+    def _evict_oldest(self):
+        doc_id, (_, terms) = self._docs.popitem(last=False)
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[float, str]]:
+        """Top-k (score, text) pairs for a query, best first"""
+        n = len(self._docs)
+        if not n:
+            return []
+        avg_length = self._total_length / n
+        k1, b = self.k1, self.b
+        max_df = max(1, int(n * self.max_df_ratio))
+
+        term_postings = [self._postings[term] for term in set(tokenize(query)) if term in self._postings]
+        term_postings.sort(key=len)
+
+        scores: Dict[int, float] = {}
+        for postings in term_postings:
+            df = len(postings)
+            if n > 20 and df > max_df:
+                continue
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            if df <= self.max_scan:
+                matches = postings.items()
+            elif scores:
+                matches = [(doc_id, postings[doc_id]) for doc_id in scores if doc_id in postings]
+            else:
+                matches = islice(reversed(postings.items()), self.max_scan)
+            for doc_id, tf in matches:
+                norm = k1 * (1 - b + b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, self._docs[doc_id][0]) for doc_id, score in best]
+
+    def select(self, query: str, budget_chars: int, k: int = 5) -> List[str]:
+        """Top-k matches that fit within a character budget, best first"""
+        matches = [text for _, text in self.search(query, k)]
+        selected, used = [], 0
+        for text in matches:
+            if used + len(text) <= budget_chars:
+                selected.append(text)
+                used += len(text) + 1
+        if matches and not selected and budget_chars > 0:
+            # Nothing fits whole: trim the best match at a word boundary
+            selected.append(matches[0][:budget_chars].rsplit(" ", 1)[0])
+        return selected
@@ -46,6 +46,17 @@ class ConfigLoader:
         with open(file_path, "r", encoding="utf-8") as f:
             return f.read()
     
+    @staticmethod
+    def merge(base: Dict[str, Any], override: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Deep-merge override into a copy of base (nested dicts merge, other values replace)"""
+        merged = dict(base)
+        for key, value in (override or {}).items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = ConfigLoader.merge(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
+    
     @staticmethod
     def save_text(file_path: str, content: str, mode: str = "w"):
         """Save text to file"""
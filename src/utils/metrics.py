@@ -0,0 +1,297 @@
+"""
+Metrics - In-process counters and latency histograms with Prometheus/JSON export
+"""
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_template(path: str) -> str:
+    """API path with query string dropped and id-like segments replaced by ':id'"""
+    path = path.split("?", 1)[0]
+    segments = ["" if not part else ":id" if any(c.isdigit() for c in part) else part
+                for part in path.split("/")]
+    return "/".join(segments) or "/"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of labelled counters and histograms
+
+    Hot paths call inc()/observe() (or the time() context manager, which also
+    works around awaits); gauge providers registered with add_gauges() are read
+    only when metrics are exported, so existing stats (cache hit counts) are
+    reused instead of being counted twice.
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize registry
+
+        Args:
+            buckets: Histogram bucket upper bounds in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._gauges: Dict[Tuple[str, Labels], Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a histogram observation (seconds)"""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe the duration of the with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def add_gauges(self, prefix: str, provider: Callable[[], Dict[str, Any]], **labels):
+        """Export the numeric values of provider() as '<prefix>_<key>' gauges"""
+        with self._lock:
+            self._gauges[(prefix, self._labels(labels))] = provider
+
+    def reset(self):
+        """Drop all series and gauge providers"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._gauges.clear()
+
+    def _read_gauges(self) -> List[Tuple[str, Labels, float]]:
+        with self._lock:
+            providers = list(self._gauges.items())
+        gauges = []
+        for (prefix, labels), provider in providers:
+            try:
+                values = provider()
+            except Exception as e:
+                logger.debug(f"Metrics gauge {prefix} failed: {e}")
+                continue
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauges.append((f"{prefix}_{key}", labels, value))
+        return gauges
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, histogram summaries (count/sum/p50/p95/p99) and gauges as plain data"""
+        def name_of(name: str, labels: Labels) -> str:
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+        with self._lock:
+            counters = {name_of(name, labels): value
+                        for name, series in self._counters.items() for labels, value in series.items()}
+            histograms = {
+                name_of(name, labels): {
+                    "count": h.count,
+                    "sum": round(h.sum, 6),
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                    "p99": h.quantile(0.99)
+                }
+                for name, series in self._histograms.items() for labels, h in series.items()
+            }
+        gauges = {name_of(name, labels): value for name, labels, value in self._read_gauges()}
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms, "gauges": gauges}
+
+    def render_prometheus(self) -> str:
+        """Text exposition format (version 0.0.4)"""
+        def fmt(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = labels + extra
+            if not pairs:
+                return ""
+            escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{fmt(labels)} {value:g}" for labels, value in series.items())
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, h in series.items():
+                    cumulative = 0
+                    for bound, count in zip(h.bounds + (float("inf"),), h.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{fmt(labels, (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{fmt(labels)} {h.sum:.6f}")
+                    lines.append(f"{name}_count{fmt(labels)} {h.count}")
+        typed = set()
+        for name, labels, value in sorted(self._read_gauges()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{fmt(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by clients and agents
+metrics = MetricsRegistry()
+
+
+class MetricsExporter:
+    """Serves /metrics (Prometheus) and /metrics.json, and writes periodic JSON snapshots"""
+
+    def __init__(self, registry: MetricsRegistry = metrics, host: str = "127.0.0.1", port: Optional[int] = 9464,
+                 snapshot_file: Optional[str] = None, snapshot_interval: float = 60.0):
+        """
+        Initialize exporter (nothing runs until start())
+
+        Args:
+            registry: Registry to export
+            host: Interface to bind (keep local; the endpoint has no auth)
+            port: HTTP port (None = no HTTP endpoint, 0 = any free port)
+            snapshot_file: JSON file rewritten every snapshot_interval seconds (None = off)
+            snapshot_interval: Seconds between JSON snapshots
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @classmethod
+    def from_config(cls, section: Optional[Dict[str, Any]] = None,
+                    registry: MetricsRegistry = metrics) -> Optional["MetricsExporter"]:
+        """Build exporter from the config.json 'metrics' section (None when disabled)"""
+        section = section or {}
+        if not section.get("enabled", False):
+            return None
+        return cls(registry,
+                   host=section.get("host", "127.0.0.1"),
+                   port=section.get("port", 9464),
+                   snapshot_file=section.get("snapshot_file"),
+                   snapshot_interval=section.get("snapshot_interval_seconds", 60.0))
+
+    def start(self):
+        """Start the HTTP endpoint and snapshot writer on daemon threads"""
+        if self.port is not None:
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.startswith("/metrics.json"):
+                        body, ctype = json.dumps(registry.snapshot()).encode(), "application/json"
+                    elif self.path.startswith("/metrics"):
+                        body, ctype = registry.render_prometheus().encode(), "text/plain; version=0.0.4"
+                    else:
+                        self.send_error(404)
+                        return
+                    self.send_response(200)
+                    self.send_header("Content-Type", ctype)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            try:
+                self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+            except OSError as e:
+                logger.error(f"Metrics endpoint unavailable on {self.host}:{self.port}: {e}")
+            else:
+                self.port = self._server.server_address[1]
+                self._spawn(self._server.serve_forever)
+                logger.info(f"Metrics at http://{self.host}:{self.port}/metrics")
+
+        if self.snapshot_file:
+            self._spawn(self._snapshot_loop)
+
+    def _spawn(self, target: Callable[[], None]):
+        thread = threading.Thread(target=target, daemon=True, name=f"metrics-{target.__name__}")
+        thread.start()
+        self._threads.append(thread)
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        """Atomically rewrite the JSON snapshot file"""
+        try:
+            directory = os.path.dirname(self.snapshot_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.snapshot_file}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.registry.snapshot(), f, indent=2)
+            os.replace(tmp, self.snapshot_file)
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+
+    def stop(self):
+        """Stop the endpoint and write a final snapshot"""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.snapshot_file:
+            self.write_snapshot()
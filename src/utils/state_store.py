@@ -0,0 +1,323 @@
+"""
+Action State Store - SQLite-backed persistence for replied/voted/subscribed state
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections.abc import MutableSet
+from typing import Optional, Dict, Set, List, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+
+class ActionStateStore:
+    """Embedded WAL-mode SQLite store with batched writes and TTL compaction"""
+
+    # kind -> days to keep (None = forever)
+    DEFAULT_TTL_DAYS: Dict[str, Optional[float]] = {
+        "replied_posts": 30,
+        "replied_comments": 30,
+        "voted_posts": 30,
+        "subscribed_submolts": None,
+        "engaged_authors": 90
+    }
+
+    def __init__(self, path: str = "data/state.db", batch_size: int = 50,
+                 flush_interval: float = 5.0, ttl_days: Optional[Dict[str, Optional[float]]] = None,
+                 verdict_ttl_days: float = 7):
+        """
+        Initialize store (the database is opened on first use)
+
+        Args:
+            path: SQLite database file (":memory:" for tests)
+            batch_size: Pending writes that trigger a commit
+            flush_interval: Max seconds a write stays uncommitted
+            ttl_days: Overrides for DEFAULT_TTL_DAYS
+            verdict_ttl_days: Days to remember feed evaluation verdicts
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.ttl_days = {**self.DEFAULT_TTL_DAYS, **(ttl_days or {})}
+        self.verdict_ttl_days = verdict_ttl_days
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[str, tuple]] = []
+        self._last_flush = time.monotonic()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database lazily and run compaction once"""
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    directory = os.path.dirname(self.path)
+                    if directory and self.path != ":memory:":
+                        os.makedirs(directory, exist_ok=True)
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS actions ("
+                        "kind TEXT NOT NULL, key TEXT NOT NULL, created_at REAL NOT NULL, "
+                        "PRIMARY KEY (kind, key)) WITHOUT ROWID"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS actions_age ON actions (kind, created_at)")
+                    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS verdicts ("
+                        "key TEXT PRIMARY KEY, score REAL NOT NULL, created_at REAL NOT NULL) WITHOUT ROWID"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS verdicts_age ON verdicts (created_at)")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS outbox ("
+                        "key TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+                        "state TEXT NOT NULL, attempts INTEGER NOT NULL, "
+                        "next_attempt REAL NOT NULL, updated_at REAL NOT NULL)"
+                    )
+                    conn.commit()
+                    self._conn = conn
+                    self.compact()
+        return self._conn
+
+    def load(self, kind: str) -> Set[str]:
+        """Load all keys of a kind"""
+        with self._lock:
+            self.flush()
+            return {row[0] for row in self.conn.execute("SELECT key FROM actions WHERE kind = ?", (kind,))}
+
+    def add(self, kind: str, key: str):
+        """Queue insertion of a key"""
+        self._queue("INSERT OR REPLACE INTO actions (kind, key, created_at) VALUES (?, ?, ?)",
+                    (kind, key, time.time()))
+
+    def remove(self, kind: str, key: str):
+        """Queue deletion of a key"""
+        self._queue("DELETE FROM actions WHERE kind = ? AND key = ?", (kind, key))
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """Read a metadata value"""
+        with self._lock:
+            self.flush()
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: Any):
+        """Queue a metadata write"""
+        self._queue("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def load_verdicts(self, limit: int) -> List[Tuple[str, float]]:
+        """Most recent `limit` evaluation verdicts as (key, score), oldest first"""
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute("SELECT key, score FROM verdicts ORDER BY created_at DESC LIMIT ?",
+                                     (limit,)).fetchall()
+        return rows[::-1]
+
+    def set_verdict(self, key: str, score: float):
+        """Queue an evaluation verdict"""
+        self._queue("INSERT OR REPLACE INTO verdicts (key, score, created_at) VALUES (?, ?, ?)",
+                    (key, score, time.time()))
+
+    def outbox_add(self, key: str, kind: str, payload: str, now: float):
+        """Journal a write immediately"""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT INTO outbox VALUES (?, ?, ?, 'queued', 0, ?, ?)",
+                              (key, kind, payload, now, now))
+
+    def outbox_update(self, key: str, state: str, attempts: int, when: float, now: float):
+        """Move a journaled write to 'sending', 'unconfirmed' or back to 'queued' (due at `when`)"""
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE outbox SET state = ?, attempts = ?, next_attempt = ?, updated_at = ? "
+                              "WHERE key = ?", (state, attempts, when, now, key))
+
+    def outbox_delete(self, key: str):
+        """Delete a journaled write"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM outbox WHERE key = ?", (key,))
+
+    def outbox_due(self, now: float, limit: int, state: str = "queued") -> List[Tuple[str, str, str, int]]:
+        """Writes in `state` due by `now` as (key, kind, payload, attempts), oldest first"""
+        with self._lock:
+            return self.conn.execute("SELECT key, kind, payload, attempts FROM outbox "
+                                     "WHERE state = ? AND next_attempt <= ? "
+                                     "ORDER BY rowid LIMIT ?", (state, now, limit)).fetchall()
+
+    def outbox_in_flight(self, before: float) -> List[Tuple[str, str, str, int]]:
+        """Writes marked 'sending' before `before` (left behind by a crash)"""
+        with self._lock:
+            return self.conn.execute("SELECT key, kind, payload, attempts FROM outbox "
+                                     "WHERE state = 'sending' AND updated_at < ? ORDER BY rowid",
+                                     (before,)).fetchall()
+
+    def outbox_count(self, kind: Optional[str] = None) -> int:
+        """Journaled writes, of one kind or all"""
+        with self._lock:
+            if kind:
+                row = self.conn.execute("SELECT COUNT(*) FROM outbox WHERE kind = ?", (kind,)).fetchone()
+            else:
+                row = self.conn.execute("SELECT COUNT(*) FROM outbox").fetchone()
+        return row[0]
+
+    def _queue(self, sql: str, params: tuple):
+        with self._lock:
+            self._pending.append((sql, params))
+            if (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush(self):
+        """Commit pending writes in one transaction"""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                with self.conn:
+                    for sql, params in pending:
+                        self.conn.execute(sql, params)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not persist action state: {e}")
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Drop entries older than their kind's TTL; returns rows removed"""
+        now = now or time.time()
+        removed = 0
+        with self._lock:
+            self.flush()
+            with self.conn:
+                for kind, days in self.ttl_days.items():
+                    if days is None:
+                        continue
+                    cur = self.conn.execute("DELETE FROM actions WHERE kind = ? AND created_at < ?",
+                                            (kind, now - days * 86400))
+                    removed += cur.rowcount
+                cur = self.conn.execute("DELETE FROM verdicts WHERE created_at < ?",
+                                        (now - self.verdict_ttl_days * 86400,))
+                removed += cur.rowcount
+        if removed:
+            logger.info(f"State store compacted ({removed} expired entries)")
+        return removed
+
+    def close(self):
+        """Flush and close the database"""
+        with self._lock:
+            if self._conn is not None:
+                self.flush()
+                self._conn.close()
+                self._conn = None
+
+
+class TrackedSet(MutableSet):
+    """
+    Set whose changes are written through to an ActionStateStore
+
+    Wraps a plain set that is loaded from the store on first use. Membership
+    checks stay in-memory set lookups; every mutation (add/discard and the
+    update, |=, -=, pop and clear built on them) also updates the store.
+    Operators and copy() return plain sets.
+    """
+
+    def __init__(self, store: ActionStateStore, kind: str):
+        self._store = store
+        self._kind = kind
+        self._items: Optional[Set[str]] = None
+
+    @property
+    def _data(self) -> Set[str]:
+        if self._items is None:
+            self._items = self._store.load(self._kind)
+        return self._items
+
+    @classmethod
+    def _from_iterable(cls, iterable) -> Set[str]:
+        return set(iterable)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._kind!r}, {self._data!r})"
+
+    def add(self, key: str):
+        if key not in self._data:
+            self._data.add(key)
+            self._store.add(self._kind, key)
+
+    def discard(self, key: str):
+        if key in self._data:
+            self._data.discard(key)
+            self._store.remove(self._kind, key)
+
+    def update(self, *others):
+        for other in others:
+            for key in other:
+                self.add(key)
+
+    def difference_update(self, *others):
+        for other in others:
+            for key in list(other):
+                self.discard(key)
+
+    def clear(self):
+        for key in list(self._data):
+            self.discard(key)
+
+    def copy(self) -> Set[str]:
+        return set(self._data)
+
+
+class ActionStateMixin:
+    """Replied/voted/subscribed tracking shared by the sync and async Moltbook clients"""
+
+    def _init_state(self, state_store: Optional[ActionStateStore] = None):
+        """Create in-memory sets, or store-backed ones when a store is given"""
+        self.state_store = state_store
+        self._last_post_time: Optional[float] = None if state_store else 0.0
+        self._cooldown_restored = state_store is None
+        if state_store:
+            self.replied_posts: Set[str] = TrackedSet(state_store, "replied_posts")
+            self.replied_comments: Set[str] = TrackedSet(state_store, "replied_comments")
+            self.voted_posts: Set[str] = TrackedSet(state_store, "voted_posts")
+            self.subscribed_submolts: Set[str] = TrackedSet(state_store, "subscribed_submolts")
+        else:
+            self.replied_posts = set()
+            self.replied_comments = set()
+            self.voted_posts = set()
+            self.subscribed_submolts = set()
+
+    @property
+    def last_post_time(self) -> float:
+        """Unix time of our last successful post (persisted when a store is attached)"""
+        if self._last_post_time is None:
+            self._last_post_time = float(self.state_store.get_meta("last_post_time", 0))
+        return self._last_post_time
+
+    @last_post_time.setter
+    def last_post_time(self, value: float):
+        self._last_post_time = value
+        if self.state_store:
+            self.state_store.set_meta("last_post_time", value)
+            self.state_store.flush()
+
+    def restore_post_cooldown(self):
+        """Carry a post cooldown that started before a restart into the limiter (once, on first use)"""
+        if self._cooldown_restored:
+            return
+        self._cooldown_restored = True
+        if self.last_post_time:
+            self.limiter.record_past("post", time.time() - self.last_post_time)
+
+    def save_state(self):
+        """Commit pending state and drop expired entries"""
+        if self.state_store:
+            self.state_store.compact()
@@ -0,0 +1,86 @@
+"""
+Moltbook AI Agent - Fleet Entry Point
+
+Runs several personas from one process on a shared event loop.
+Each agent directory needs register.json, .env (MOLTBOOK_API_KEY),
+optionally config.json (overrides config/config.json) and a data/ folder.
+
+Usage:
+    python supervisor.py agents/kepler agents/nova
+    python supervisor.py --fleet agents
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+from src.utils import ConfigLoader
+from src.core.supervisor import Supervisor, AgentLogFilter
+from src.utils.metrics import MetricsExporter
+
+
+def setup_logging():
+    """Configure logging with the agent name prefixed to each line"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(AgentLogFilter())
+    logging.basicConfig(level=logging.INFO, format='%(agent)s%(message)s', handlers=[handler])
+
+
+def find_agent_dirs(fleet_dir: str):
+    """Subdirectories of fleet_dir that contain a register.json"""
+    return sorted(
+        os.path.join(fleet_dir, name) for name in os.listdir(fleet_dir)
+        if os.path.isfile(os.path.join(fleet_dir, name, "register.json"))
+    )
+
+
+def main():
+    """Main entry point for the supervisor"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("agent_dirs", nargs="*", help="Persona directories")
+    parser.add_argument("--fleet", help="Directory whose subdirectories are persona directories")
+    parser.add_argument("--config", default="config/config.json", help="Base configuration")
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    agent_dirs = list(args.agent_dirs)
+    if args.fleet:
+        agent_dirs += find_agent_dirs(args.fleet)
+    if not agent_dirs:
+        parser.error("no agent directories given")
+
+    config = ConfigLoader.load_json(args.config)
+    if not config:
+        logger.error(f"Error: {args.config} not found")
+        return
+
+    # Gemini keys are shared by the whole fleet
+    env = ConfigLoader.load_env()
+    gemini_keys = (env.get("GEMINI_API_KEY", "") + "," + env.get("GEMINI_BACKUP_KEYS", "")).strip(",")
+
+    supervisor = Supervisor.from_directories(agent_dirs, config, gemini_keys)
+    if not supervisor.runners:
+        logger.error("Error: no runnable agents")
+        return
+
+    exporter = MetricsExporter.from_config(config.get("metrics", {}))
+    if exporter:
+        for runner in supervisor.runners:
+            runner.agent.register_metrics(agent=runner.name)
+        exporter.start()
+
+    try:
+        asyncio.run(supervisor.run())
+    except KeyboardInterrupt:
+        stats = supervisor.get_stats()
+        logger.info(f"\nFleet stopped: {stats['total']}")
+    finally:
+        if exporter:
+            exporter.stop()
+
+
+if __name__ == "__main__":
+    main()
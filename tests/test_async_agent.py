@@ -0,0 +1,59 @@
+"""
+Unit tests for AsyncAgent
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import Mock
+
+pytest.importorskip("httpx")
+
+from src.core.async_agent import AsyncAgent
+
+
+class SlowClient:
+    """Async client stub where every read takes `latency` seconds"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.agent_name = "test-agent"
+        self.replied_posts = set()
+        self.voted_posts = set()
+        self.subscribed_submolts = set()
+        self.calls = []
+
+    async def _read(self, name, value):
+        self.calls.append(name)
+        await asyncio.sleep(self.latency)
+        return value
+
+    async def get_feed(self, **kwargs):
+        return await self._read("get_feed", [])
+
+    async def semantic_search(self, **kwargs):
+        return await self._read("semantic_search", [])
+
+    async def dm_check(self):
+        return await self._read("dm_check", {"has_activity": False})
+
+    async def get_profile(self, agent_name=None):
+        return await self._read("get_profile", {"karma": 1})
+
+
+class TestAsyncAgent:
+    """Test suite for concurrent agent cycle"""
+
+    def test_cycle_overlaps_independent_reads(self, mock_persona):
+        """Test that feed, search and DM check run concurrently (and no profile read is added)"""
+        client = SlowClient(latency=0.2)
+        config = {"behavior": {"post_probability": 0, "semantic_search_probability": 1,
+                               "browse_feed_probability": 1}}
+        agent = AsyncAgent(Mock(), client, mock_persona, Mock(), config)
+
+        start = time.perf_counter()
+        asyncio.run(agent.run_cycle())
+        elapsed = time.perf_counter() - start
+
+        assert sorted(client.calls) == ["dm_check", "get_feed", "semantic_search"]
+        assert elapsed < 0.5  # sequential would be ~0.6s
+        assert agent.cycle == 1
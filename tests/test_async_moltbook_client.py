@@ -0,0 +1,127 @@
+"""
+Unit tests for AsyncMoltbookClient
+"""
+import asyncio
+import json
+import pytest
+import requests
+from unittest.mock import Mock
+
+httpx = pytest.importorskip("httpx")
+
+from src.clients.async_moltbook_client import AsyncMoltbookClient
+from src.clients.moltbook_client import MoltbookClient
+
+
+def make_client(handler):
+    """Build a client whose requests are answered by handler(request)"""
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncMoltbookClient("key", "agent", http=http)
+
+
+class TestAsyncMoltbookClient:
+    """Test suite for the asyncio Moltbook client"""
+
+    def test_get_feed_success(self):
+        """Test successful feed fetch"""
+        def handler(request):
+            assert request.url.path == "/api/v1/posts"
+            assert request.url.params["sort"] == "hot"
+            assert request.headers["Authorization"] == "Bearer key"
+            return httpx.Response(200, json={"success": True, "posts": [{"id": "123"}]})
+
+        client = make_client(handler)
+        feed = asyncio.run(client.get_feed())
+
+        assert feed == [{"id": "123"}]
+
+    def test_reply_adds_to_state(self):
+        """Test that replying adds to replied_posts set"""
+        def handler(request):
+            assert json.loads(request.content) == {"content": "Great post!"}
+            return httpx.Response(201, json={"success": True})
+
+        client = make_client(handler)
+        assert asyncio.run(client.reply("post789", "Great post!")) is True
+        assert "post789" in client.replied_posts
+
+    def test_reply_rate_limited(self):
+        """Test that a 429 reply returns False without state change"""
+        client = make_client(lambda r: httpx.Response(429, json={"retry_after_seconds": 12}))
+
+        assert asyncio.run(client.reply("post1", "text")) is False
+        assert "post1" not in client.replied_posts
+
+    def test_remove_moderator_sends_body_with_delete(self):
+        """Test DELETE with JSON payload"""
+        def handler(request):
+            assert request.method == "DELETE"
+            assert json.loads(request.content) == {"agent_name": "mod1"}
+            return httpx.Response(204)
+
+        client = make_client(handler)
+        assert asyncio.run(client.remove_moderator("aithoughts", "mod1")) is True
+
+    def test_network_error_returns_default(self):
+        """Test that transport errors are caught like the sync client"""
+        def handler(request):
+            raise httpx.ConnectError("boom")
+
+        client = make_client(handler)
+        assert asyncio.run(client.get_profile("someone")) is None
+        assert asyncio.run(client.dm_check()) == {"success": False, "has_activity": False}
+
+    def test_connect_error_refunds_write_slots(self):
+        """Test that writes which never reached the API give their slots back"""
+        def handler(request):
+            raise httpx.ConnectError("connection refused")
+
+        client = make_client(handler)
+        assert asyncio.run(client.post("Post content", title="Title")) is False
+        assert asyncio.run(client.reply("post1", "Hello")) is False
+        assert client.limiter.time_until("post") == 0
+        assert client.limiter.time_until("comment") == 0
+
+    def test_iter_feed_streams_pages(self):
+        """Test that the async iterator pages by offset and honours the stop predicate"""
+        posts = [{"id": f"p{i}"} for i in range(10)]
+        offsets = []
+
+        def handler(request):
+            offset, limit = int(request.url.params.get("offset", 0)), int(request.url.params["limit"])
+            offsets.append(offset)
+            return httpx.Response(200, json={"success": True, "posts": posts[offset:offset + limit]})
+
+        async def scan(client):
+            return [post["id"] async for post in client.iter_feed(limit=4, until=lambda post: post["id"] == "p9")]
+
+        client = make_client(handler)
+        assert asyncio.run(scan(client)) == [f"p{i}" for i in range(9)]
+        assert offsets == [0, 4, 8]
+
+
+class TestClientParity:
+    """Test suite for response handling shared with MoltbookClient"""
+
+    @pytest.mark.parametrize("status, body", [
+        (201, {"success": True}),
+        (429, {"retry_after_seconds": 90, "daily_remaining": 3}),
+        (403, {"success": False, "error": "Suspended"})
+    ])
+    def test_reply_outcomes_match(self, status, body):
+        """Test that both clients settle a reply response into the same state"""
+        sync_res = requests.Response()
+        sync_res.status_code = status
+        sync_res._content = json.dumps(body).encode()
+        sync_res.headers["content-type"] = "application/json"
+        transport = Mock()
+        transport.post.return_value = sync_res
+        sync_client = MoltbookClient("key", "agent", transport=transport)
+        async_client = make_client(lambda request: httpx.Response(status, json=body))
+
+        outcomes = []
+        for client, sent in ((sync_client, sync_client.reply("p1", "Nice")),
+                             (async_client, asyncio.run(async_client.reply("p1", "Nice")))):
+            outcomes.append((sent, "p1" in client.replied_posts, round(client.limiter.time_until("comment"))))
+
+        assert outcomes[0] == outcomes[1]
@@ -0,0 +1,101 @@
+"""
+Unit tests for the DM inbox sync
+"""
+import pytest
+from unittest.mock import Mock
+from src.core.agent import Agent
+from src.core.dm_inbox import DMInbox
+from src.utils.state_store import ActionStateStore
+
+
+def _message(message_id, sender, content="hello there", **extra):
+    return {"id": message_id, "sender": {"name": sender}, "content": content, **extra}
+
+
+class TestDMInbox:
+    """Test suite for change detection and cursors"""
+
+    def test_quiet_check_fetches_nothing(self):
+        """Test that no list is fetched without activity and unknown summaries fetch both"""
+        assert DMInbox.sections({"has_activity": False}) == (False, False)
+        assert DMInbox.sections({"has_activity": True, "requests": {"count": 0},
+                                 "messages": {"total_unread": 2}}) == (False, True)
+        assert DMInbox.sections({"has_activity": True}) == (True, True)
+
+    def test_only_changed_conversations_are_read(self):
+        """Test that unread counts and moved activity markers select conversations"""
+        inbox = DMInbox("me")
+        conversations = [
+            {"conversation_id": "c1", "unread_count": 2, "with_agent": {"name": "ada"}, "last_message_at": "t1"},
+            {"conversation_id": "c2", "unread_count": 0, "with_agent": {"name": "bob"}, "last_message_at": "t1"}
+        ]
+        assert inbox.changed(conversations) == [("c1", "ada")]
+
+        conversations[0]["unread_count"] = 0
+        conversations[1]["last_message_at"] = "t2"
+        assert inbox.changed(conversations) == [("c2", "bob")]
+
+    def test_cursor_returns_only_new_messages_and_persists(self, tmp_path):
+        """Test that rereads only yield messages after the cursor, across restarts"""
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        inbox = DMInbox("me", store)
+        first = [_message("m1", "ada"), _message("m2", "me")]
+        assert [m["id"] for m in inbox.ingest("c1", first)] == ["m1"]
+        store.close()
+
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        inbox = DMInbox("me", store)
+        later = first + [_message("m3", "ada"), _message("m4", "ada")]
+        assert [m["id"] for m in inbox.ingest("c1", later)] == ["m3", "m4"]
+        assert [m["id"] for m in inbox.recent("c1")] == ["m1", "m2", "m3", "m4"]
+        assert inbox.ingest("c1", later) == []
+        store.close()
+
+
+class TestDMSync:
+    """Test suite for the agent's DM poll"""
+
+    def _agent(self, mock_persona, config=None):
+        gemini = Mock()
+        gemini.generate.return_value = "Salamat! Happy to compare notes on memory, talaga."
+        moltbot = Mock(agent_name="me", replied_posts=set(), subscribed_submolts=set())
+        moltbot.dm_check.return_value = {"has_activity": True, "requests": {"count": 0}}
+        moltbot.dm_get_conversations.return_value = [
+            {"conversation_id": "c1", "unread_count": 1, "with_agent": {"name": "ada"}},
+            {"conversation_id": "c2", "unread_count": 0, "with_agent": {"name": "bob"}}
+        ]
+        moltbot.dm_read_conversation.return_value = {"messages": [_message("m1", "ada", "Want to collaborate?")]}
+        return Agent(gemini, moltbot, mock_persona, Mock(), config or {})
+
+    def test_quiet_inbox_costs_one_request(self, mock_persona):
+        """Test that only dm_check is called without activity"""
+        agent = self._agent(mock_persona)
+        agent.moltbot.dm_check.return_value = {"has_activity": False}
+
+        assert agent.poll_dms() == 0
+        agent.moltbot.dm_get_conversations.assert_not_called()
+        agent.moltbot.dm_read_conversation.assert_not_called()
+
+    def test_new_message_is_answered_once(self, mock_persona):
+        """Test that only the changed conversation is read and answered, and not again"""
+        agent = self._agent(mock_persona)
+
+        assert agent.poll_dms() == 1
+        assert agent.poll_dms() == 0
+
+        agent.moltbot.dm_read_conversation.assert_called_with("c1")
+        assert agent.moltbot.dm_read_conversation.call_count == 2
+        agent.moltbot.dm_send_message.assert_called_once_with(
+            "c1", "Salamat! Happy to compare notes on memory, talaga.")
+        assert "Want to collaborate?" in agent.gemini.generate.call_args[0][0]
+
+    def test_human_flagged_message_is_not_answered(self, mock_persona):
+        """Test that needs_human_input messages are escalated instead of answered"""
+        agent = self._agent(mock_persona)
+        agent.moltbot.dm_read_conversation.return_value = {
+            "messages": [_message("m1", "ada", "Can your human sign this?", needs_human_input=True)]}
+
+        agent.poll_dms()
+
+        agent.moltbot.dm_send_message.assert_not_called()
+        assert "needs human input" in agent.intelligence.update_history.call_args[0][0]
@@ -0,0 +1,68 @@
+"""
+Unit tests for BatchEvaluator and ranked targeting
+"""
+import pytest
+from unittest.mock import Mock
+from src.core.agent import Agent
+from src.core.evaluator import BatchEvaluator
+
+
+class TestBatchEvaluator:
+    """Test suite for batched content evaluation"""
+
+    def test_prompt_numbers_items(self):
+        """Test that every item appears with a 1-based id"""
+        prompt = BatchEvaluator(batch_size=2).build_prompt(["first  post", "second", "third"])
+        assert "[1] first post" in prompt
+        assert "[2] second" in prompt
+        assert "third" not in prompt
+
+    def test_parse_json_scores(self):
+        """Test parsing a fenced JSON array with out-of-range and missing ids"""
+        response = '```json\n[{"id": 2, "score": 9}, {"id": 1, "score": 14}, {"id": 7, "score": 5}]\n```'
+        assert BatchEvaluator().parse_scores(response, 3) == [10.0, 9.0, None]
+
+    def test_parse_line_fallback(self):
+        """Test that 'id: score' lines are accepted when JSON is unusable"""
+        assert BatchEvaluator().parse_scores("1: 3\n2: 8", 2) == [3.0, 8.0]
+        assert BatchEvaluator().parse_scores("I cannot rate these.", 2) is None
+
+    def test_rank_filters_and_orders(self):
+        """Test that ranking drops low scores and keeps feed order on ties"""
+        evaluator = BatchEvaluator(min_score=6)
+        assert evaluator.rank([7.0, 2.0, 9.0, 7.0]) == [(2, 9.0), (0, 7.0), (3, 7.0)]
+        assert evaluator.rank([None, 8.0, None]) == [(1, 8.0)]
+
+    def test_agent_engages_top_ranked_post(self, mock_persona):
+        """Test that one Gemini call ranks the feed and the best post is engaged"""
+        gemini = Mock()
+        gemini.generate.return_value = '[{"id": 1, "score": 3}, {"id": 2, "score": 8}]'
+        moltbot = Mock(agent_name="me", replied_posts=set(), subscribed_submolts=set())
+        moltbot.get_feed.return_value = [
+            {"id": "p1", "content": "meh", "author": {"name": "a"}},
+            {"id": "p2", "content": "deep thoughts", "author": {"name": "b"}},
+        ]
+        agent = Agent(gemini, moltbot, mock_persona, Mock(), {"behavior": {"author_research_probability": 0}})
+        agent._engage_with_post = Mock()
+
+        agent.engage_with_feed()
+
+        assert gemini.generate.call_count == 1
+        agent._engage_with_post.assert_called_once_with("p2", "deep thoughts", "b")
+
+    def test_skipped_posts_are_not_remembered(self, mock_persona):
+        """Test that a post the model left unscored is not recorded as a 0 verdict"""
+        gemini = Mock()
+        gemini.generate.return_value = '[{"id": 2, "score": 8}]'
+        moltbot = Mock(agent_name="me", replied_posts=set(), subscribed_submolts=set())
+        moltbot.get_feed.return_value = [
+            {"id": "p1", "content": "skipped", "author": {"name": "a"}},
+            {"id": "p2", "content": "deep thoughts", "author": {"name": "b"}},
+        ]
+        agent = Agent(gemini, moltbot, mock_persona, Mock(), {"behavior": {"author_research_probability": 0}})
+        agent._engage_with_post = Mock()
+
+        agent.engage_with_feed()
+
+        agent._engage_with_post.assert_called_once_with("p2", "deep thoughts", "b")
+        assert agent.feed_tracker.split([{"id": "p1"}, {"id": "p2"}]) == ([0], {1: 8.0})
@@ -0,0 +1,113 @@
+"""
+Unit tests for FeedTracker and incremental feed evaluation
+"""
+import pytest
+from unittest.mock import Mock
+from src.core.agent import Agent
+from src.core.feed_tracker import FeedTracker
+from src.utils.state_store import ActionStateStore
+
+
+def _post(post_id, content="deep thoughts", author="b"):
+    return {"id": post_id, "content": content, "author": {"name": author}}
+
+
+class TestFeedTracker:
+    """Test suite for the evaluated-post seen-set"""
+
+    def test_split_separates_unseen_posts(self):
+        """Test that only posts without a verdict are returned for evaluation"""
+        tracker = FeedTracker()
+        tracker.record("p1", 8.0)
+
+        fresh, known = tracker.split([_post("p1"), _post("p2")])
+
+        assert fresh == [1]
+        assert known == {0: 8.0}
+
+    def test_lru_bound(self):
+        """Test that the least recently used verdict is evicted"""
+        tracker = FeedTracker(max_entries=2)
+        tracker.record("p1", 1.0)
+        tracker.record("p2", 2.0)
+        tracker.verdict("p1")
+        tracker.record("p3", 3.0)
+
+        assert tracker.verdict("p2") is None
+        assert tracker.verdict("p1") == 1.0
+
+    def test_verdicts_and_watermark_persist(self, tmp_path):
+        """Test that a new tracker on the same database remembers verdicts and the watermark"""
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        tracker = FeedTracker(store)
+        tracker.record("p1", 7.0)
+        tracker.advance("new:global", [_post("p9"), _post("p8")])
+        store.close()
+
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        tracker = FeedTracker(store)
+        assert tracker.verdict("p1") == 7.0
+        assert tracker.watermark("new:global") == "p9"
+        store.close()
+
+    def test_take_new_stops_at_watermark(self):
+        """Test that a newest-first page is cut at the last post seen"""
+        tracker = FeedTracker()
+        assert tracker.take_new("new:global", [_post("p1")]) == ([_post("p1")], True)
+
+        tracker.advance("new:global", [_post("p2"), _post("p1")])
+        page = [_post("p4"), _post("p3"), _post("p2"), _post("p1")]
+        assert tracker.take_new("new:global", page) == (page[:2], True)
+        assert tracker.take_new("new:global", page[:2]) == (page[:2], False)
+
+
+class TestIncrementalFeed:
+    """Test suite for the agent's delta-only feed evaluation"""
+
+    def _agent(self, mock_persona, config=None):
+        gemini = Mock()
+        gemini.generate.return_value = '[{"id": 1, "score": 3}, {"id": 2, "score": 8}]'
+        moltbot = Mock(agent_name="me", replied_posts=set(), subscribed_submolts=set())
+        config = {"behavior": {"author_research_probability": 0}, **(config or {})}
+        agent = Agent(gemini, moltbot, mock_persona, Mock(), config)
+        agent._engage_with_post = Mock()
+        return agent
+
+    def test_unchanged_feed_is_not_reevaluated(self, mock_persona):
+        """Test that a second pass over the same page makes no Gemini call"""
+        agent = self._agent(mock_persona)
+        agent.moltbot.get_feed.return_value = [_post("p1", "meh", "a"), _post("p2")]
+
+        agent.engage_with_feed()
+        agent.engage_with_feed()
+
+        assert agent.gemini.generate.call_count == 1
+        assert agent._engage_with_post.call_count == 2
+        agent._engage_with_post.assert_called_with("p2", "deep thoughts", "b")
+
+    def test_only_new_posts_are_sent(self, mock_persona):
+        """Test that the evaluation prompt contains just the unseen posts"""
+        agent = self._agent(mock_persona)
+        agent.feed_tracker.record("p1", 2.0)
+        agent.moltbot.get_feed.return_value = [_post("p1", "old news", "a"), _post("p2", "fresh take")]
+        agent.gemini.generate.return_value = '[{"id": 1, "score": 9}]'
+
+        agent.engage_with_feed()
+
+        prompt = agent.gemini.generate.call_args[0][0]
+        assert "fresh take" in prompt and "old news" not in prompt
+        agent._engage_with_post.assert_called_once_with("p2", "fresh take", "b")
+
+    def test_new_sort_grows_page_until_watermark(self, mock_persona):
+        """Test that sort=new refetches with a larger limit until the last-seen post appears"""
+        agent = self._agent(mock_persona, {"content": {"feed_sort": "new", "feed_limit": 2,
+                                                       "feed_max_limit": 8}})
+        agent.feed_tracker.advance("new:global", [_post("p1")])
+        posts = [_post(f"p{i}") for i in range(5, 0, -1)]
+        agent.moltbot.get_feed.side_effect = lambda sort, limit, personalized: posts[:limit]
+
+        feed = agent._fetch_feed()
+
+        assert [call.kwargs["limit"] for call in agent.moltbot.get_feed.call_args_list] == [2, 4, 8]
+        assert feed == posts
+        assert agent.feed_tracker.watermark("new:global") == "p5"
@@ -1,6 +1,8 @@
 """
 Unit tests for GeminiClient
 """
+import asyncio
+import time
 import pytest
 from unittest.mock import Mock, patch
 from src.clients.gemini_client import GeminiClient
@@ -66,3 +68,42 @@ class TestGeminiClient:
         assert call_kwargs['model'] == "gemini-3-flash-preview"
         assert call_kwargs['contents'] == "Test prompt"
         assert result == "Generated text"
+    
+    @patch('src.clients.gemini_client.genai.Client')
+    def test_generate_many_keeps_order_and_isolates_errors(self, mock_client_class):
+        """Test that results come back in prompt order with failures as None"""
+        def fake_generate(model, contents):
+            if contents == "bad":
+                raise ValueError("boom")
+            time.sleep(0.05 if contents == "slow" else 0)
+            return Mock(text=contents.upper())
+        
+        mock_client = Mock()
+        mock_client.models.generate_content.side_effect = fake_generate
+        mock_client_class.return_value = mock_client
+        
+        client = GeminiClient("key1,key2")
+        assert client.generate_many(["slow", "bad", "fast"]) == ["SLOW", None, "FAST"]
+        client.close()
+    
+    @patch('src.clients.gemini_client.genai.Client')
+    def test_generate_many_overlaps_and_times_out(self, mock_client_class):
+        """Test that prompts run concurrently and late ones yield None"""
+        def fake_generate(model, contents):
+            time.sleep(float(contents))
+            return Mock(text="done")
+        
+        mock_client = Mock()
+        mock_client.models.generate_content.side_effect = fake_generate
+        mock_client_class.return_value = mock_client
+        
+        client = GeminiClient("key1", max_concurrency=4)
+        start = time.perf_counter()
+        results = client.generate_many(["0.2", "0.2", "0.2", "1.0"], timeout=0.5)
+        elapsed = time.perf_counter() - start
+        
+        assert results == ["done", "done", "done", None]
+        assert elapsed < 0.7  # sequential would be 1.6s
+        assert asyncio.run(client.agenerate("0.01")) == "done"
+        assert asyncio.run(client.agenerate("0.5", timeout=0.05)) is None
+        client.close()
@@ -0,0 +1,82 @@
+"""
+Unit tests for GeminiKeyPool
+"""
+import pytest
+from unittest.mock import Mock, patch
+from google.genai import errors as genai_errors
+from src.clients.gemini_client import GeminiClient
+from src.clients.gemini_key_pool import GeminiKeyPool, is_rate_limit, retry_delay
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def rate_limit_error(delay="7s"):
+    details = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": delay}]
+    return genai_errors.APIError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED",
+                                                 "message": "Quota exceeded", "details": details}})
+
+
+class TestGeminiKeyPool:
+    """Test suite for key selection, quotas and cooldowns"""
+
+    def test_rate_limit_detection(self):
+        """Test that 429s are recognized from the error code, not message text"""
+        assert is_rate_limit(rate_limit_error())
+        assert retry_delay(rate_limit_error("31s")) == 31.0
+        assert not is_rate_limit(ValueError("rate of 429 quota"))
+
+    def test_least_loaded_key_wins(self):
+        """Test that in-flight calls spread across keys"""
+        pool = GeminiKeyPool(["k1", "k2", "k3"], clock=FakeClock())
+        picked = [pool.acquire().index for _ in range(3)]
+        assert sorted(picked) == [0, 1, 2]
+
+    def test_rpm_limit_scales_with_keys(self):
+        """Test that per-key RPM caps give N keys N times the budget"""
+        clock = FakeClock()
+        pool = GeminiKeyPool(["k1", "k2", "k3"], rpm_limit=2, clock=clock)
+        for _ in range(6):
+            state = pool.acquire()
+            assert state is not None
+            pool.release(state)
+        assert pool.acquire() is None
+        assert pool.time_until_available() == pytest.approx(60.0)
+
+        clock.now += 60
+        assert pool.acquire() is not None
+
+    def test_cooldown_only_affects_limited_key(self):
+        """Test that a 429 benches one key until its retry delay passes"""
+        clock = FakeClock()
+        pool = GeminiKeyPool(["k1", "k2"], clock=clock)
+        first = pool.acquire()
+        pool.penalize(first, 7.0)
+
+        for _ in range(3):
+            state = pool.acquire()
+            assert state.index != first.index
+            pool.release(state)
+        clock.now += 7
+        assert pool.time_until_available() == 0
+
+    @patch('src.clients.gemini_client.genai.Client')
+    def test_generate_fails_over_and_reuses_clients(self, mock_client_class):
+        """Test that a 429 moves the call to another key without rebuilding clients"""
+        limited, healthy = Mock(), Mock()
+        limited.models.generate_content.side_effect = rate_limit_error()
+        healthy.models.generate_content.return_value = Mock(text="ok")
+        mock_client_class.side_effect = [limited, healthy]
+
+        client = GeminiClient("key1,key2")
+        assert client.generate("prompt") == "ok"
+        assert client.generate("prompt") == "ok"
+        assert mock_client_class.call_count == 2
+        stats = client.get_stats()
+        assert stats[0]["rate_limited"] == 1
+        assert stats[1]["requests"] == 2
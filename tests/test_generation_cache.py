@@ -0,0 +1,65 @@
+"""
+Unit tests for GenerationCache
+"""
+import pytest
+from unittest.mock import Mock, patch
+from src.clients.generation_cache import GenerationCache
+from src.clients.gemini_client import GeminiClient
+
+
+class TestGenerationCache:
+    """Test suite for the Gemini generation cache"""
+
+    def test_key_normalizes_whitespace(self):
+        """Test that prompts differing only in whitespace share a key"""
+        a = GenerationCache.make_key("m", "Is this  good?\n\nYES or NO")
+        b = GenerationCache.make_key("m", "  Is this good? YES or NO ")
+        assert a == b
+        assert a != GenerationCache.make_key("other-model", "Is this good? YES or NO")
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test that a new instance reads entries written by a previous one"""
+        path = str(tmp_path / "gen.db")
+        cache = GenerationCache(path=path)
+        cache.put("m", "prompt", "YES")
+        cache.close()
+
+        reopened = GenerationCache(path=path)
+        assert reopened.get("m", "prompt") == "YES"
+        assert reopened.disk_hits == 1
+        assert reopened.get("m", "prompt") == "YES"
+        assert reopened.memory_hits == 1
+
+    def test_memory_lru_bound(self):
+        """Test that the memory tier evicts least recently used entries"""
+        cache = GenerationCache(path=None, max_entries=2)
+        cache.put("m", "a", "1")
+        cache.put("m", "b", "2")
+        cache.get("m", "a")
+        cache.put("m", "c", "3")
+
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "a") == "1"
+        assert cache.get_stats()["entries"] == 2
+
+    def test_expired_entries_ignored(self):
+        """Test that entries older than the TTL are treated as misses"""
+        cache = GenerationCache(path=None, ttl_seconds=0)
+        cache.put("m", "a", "1")
+        assert cache.get("m", "a") is None
+
+    @patch('src.clients.gemini_client.genai.Client')
+    def test_client_serves_repeat_from_cache(self, mock_client_class):
+        """Test that a cached call site skips the API on a repeated prompt"""
+        mock_client = Mock()
+        mock_client.models.generate_content.return_value = Mock(text=" YES ")
+        mock_client_class.return_value = mock_client
+
+        client = GeminiClient("key1", cache=GenerationCache(path=None))
+        assert client.generate("Evaluate this", cache=True) == "YES"
+        assert client.generate("Evaluate  this", cache=True) == "YES"
+        assert mock_client.models.generate_content.call_count == 1
+
+        # Uncached call sites always hit the API
+        client.generate("Evaluate this")
+        assert mock_client.models.generate_content.call_count == 2
@@ -86,3 +86,40 @@ class TestIntelligenceSystem:
             assert excerpt == "SOUL content here wi"
         finally:
             os.unlink(temp_file)
+    
+    def test_memory_ring_is_bounded(self, tmp_path):
+        """Test that only the most recent entries are held in memory"""
+        path = tmp_path / "MEMORY.md"
+        intel = IntelligenceSystem(memory_file=str(path), log_options={"max_entries": 5})
+        for i in range(50):
+            intel.update_memory(f"entry {i}")
+        intel.close()
+        
+        assert "entry 49" in intel.memory
+        assert "entry 10" not in intel.memory
+        assert path.read_text().count("entry") == 50
+        assert intel.get_stats()["memory_words"] == 200  # "[date time] entry N"
+    
+    def test_startup_reads_tail_only(self, tmp_path):
+        """Test that a large existing file is loaded from its tail"""
+        path = tmp_path / "MEMORY.md"
+        path.write_text("".join(f"line {i}\n" for i in range(10000)))
+        
+        intel = IntelligenceSystem(memory_file=str(path), log_options={"tail_bytes": 1024})
+        assert len(intel.memory) <= 1024
+        assert intel.get_recent_memory(chars=8) == "ne 9999\n"
+        assert intel.get_stats()["memory_words"] == 20000
+    
+    def test_history_rotates_when_oversized(self, tmp_path):
+        """Test that the file is rotated and restarted from the in-memory tail"""
+        path = tmp_path / "HISTORY.md"
+        intel = IntelligenceSystem(history_file=str(path),
+                                   log_options={"max_entries": 3, "max_file_bytes": 500})
+        for i in range(40):
+            intel.update_history(f"event {i}")
+            intel.flush()
+        intel.close()
+        
+        assert (tmp_path / "HISTORY.md.1").exists()
+        assert path.stat().st_size <= 500
+        assert "event 39" in path.read_text()
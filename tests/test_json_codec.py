@@ -0,0 +1,102 @@
+"""
+Unit tests for the JSON decoding path
+"""
+import json
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from src.clients import json_codec
+from src.clients.json_codec import response_json, error_data
+from src.clients.models import Comment
+from src.clients.moltbook_client import MoltbookClient
+
+
+def _response(status, body, content_type="application/json"):
+    """Real requests.Response carrying raw bytes"""
+    res = requests.Response()
+    res.status_code = status
+    res._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    res.headers["content-type"] = content_type
+    return res
+
+
+@pytest.fixture
+def restore_backend():
+    yield
+    json_codec.use("auto")
+
+
+class TestBackends:
+    """Test suite for backend selection"""
+
+    @pytest.mark.parametrize("name", list(json_codec.BACKENDS))
+    def test_backends_agree(self, name, restore_backend):
+        """Test that every installed backend decodes bytes and str alike"""
+        body = {"success": True, "posts": [{"id": "p1", "content": "naïve ✓", "upvotes": 3, "x": None}]}
+
+        assert json_codec.use(name) == name
+        assert json_codec.loads(json.dumps(body).encode()) == body
+        assert json_codec.loads(json.dumps(body)) == body
+
+    def test_auto_and_unknown(self, restore_backend):
+        """Test that auto picks the first installed backend and unknown names are rejected"""
+        assert json_codec.use("auto") == next(iter(json_codec.BACKENDS))
+        assert "json" in json_codec.BACKENDS
+        with pytest.raises(ValueError):
+            json_codec.use("simdjson-nonexistent")
+
+
+class TestResponseDecoding:
+    """Test suite for single decoding of response bodies"""
+
+    def test_decoded_once(self):
+        """Test that repeated reads of one response share a single decode"""
+        res = _response(200, {"success": True, "comments": []})
+
+        with patch.object(json_codec, "loads", wraps=json_codec.loads) as loads:
+            assert response_json(res) is response_json(res)
+            assert error_data(res) == {"success": True, "comments": []}
+
+        assert loads.call_count == 1
+
+    def test_cached_read_decodes_once(self):
+        """Test that storing a comment page in the cache and parsing it reuse one decode"""
+        transport = Mock()
+        transport.get.return_value = _response(200, {"success": True, "comments": [{"id": "c1"}]})
+        client = MoltbookClient("key", "me", transport=transport)
+
+        with patch.object(json_codec, "loads", wraps=json_codec.loads) as loads:
+            comments = client.get_post_comments("p1")
+            assert client.get_post_comments("p1") == comments
+
+        assert isinstance(comments[0], Comment)
+        assert loads.call_count == 1
+
+    def test_mock_responses_fall_back_to_json(self):
+        """Test that responses without raw bytes use their own json()"""
+        res = Mock(status_code=200, headers={}, json=Mock(return_value={"a": 1}))
+
+        assert response_json(res) == {"a": 1}
+
+    def test_error_bodies(self, caplog):
+        """Test that non-JSON and malformed error bodies degrade to {}"""
+        assert error_data(_response(502, b"<html>Bad gateway</html>", "text/html")) == {}
+        assert error_data(_response(500, b"{not json", "application/json")) == {}
+        assert error_data(_response(400, [1, 2])) == {}
+
+        transport = Mock()
+        transport.post.return_value = _response(500, b"{not json", "application/json")
+        client = MoltbookClient("key", "me", transport=transport)
+        assert client._post("hello") is False
+        assert "Post Failed (500): {not json" in caplog.text
+
+    @patch('builtins.open', create=True)
+    @patch('src.clients.moltbook_client.os.path.exists', return_value=True)
+    def test_upload_failure_logs_error_body(self, mock_exists, mock_open, caplog):
+        """Test that a rejected upload logs the server's error message"""
+        transport = Mock()
+        transport.post.return_value = _response(413, {"success": False, "error": "File too large"})
+        client = MoltbookClient("key", "me", transport=transport)
+
+        assert client.upload_submolt_banner("general", "banner.png") is False
+        assert "Banner upload failed (413): File too large" in caplog.text
@@ -0,0 +1,89 @@
+"""
+Unit tests for the metrics registry and exporter
+"""
+import json
+import urllib.request
+import pytest
+from unittest.mock import Mock
+from src.utils.metrics import MetricsRegistry, MetricsExporter, endpoint_template
+from src.clients.moltbook_client import MoltbookClient
+
+
+class TestMetricsRegistry:
+    """Test suite for counters, histograms and gauges"""
+
+    def test_endpoint_template(self):
+        """Test that ids and query strings are stripped from endpoint labels"""
+        assert endpoint_template("/posts/8f2c1e9a-77b1/comments?sort=top") == "/posts/:id/comments"
+        assert endpoint_template("/feed") == "/feed"
+
+    def test_prometheus_rendering(self):
+        """Test counter, cumulative histogram buckets and gauge lines"""
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.inc("moltbook_responses_total", status=200)
+        registry.inc("moltbook_responses_total", status=200)
+        registry.observe("gemini_call_seconds", 0.05, site="evaluate")
+        registry.observe("gemini_call_seconds", 0.5, site="evaluate")
+        registry.add_gauges("response_cache", lambda: {"hits": 3, "hit_rate": 0.5, "label": "x"})
+
+        text = registry.render_prometheus()
+
+        assert 'moltbook_responses_total{status="200"} 2' in text
+        assert 'gemini_call_seconds_bucket{site="evaluate",le="0.1"} 1' in text
+        assert 'gemini_call_seconds_bucket{site="evaluate",le="+Inf"} 2' in text
+        assert 'gemini_call_seconds_count{site="evaluate"} 2' in text
+        assert "response_cache_hits 3" in text
+        assert "response_cache_label" not in text
+
+    def test_snapshot_quantiles(self):
+        """Test that snapshots summarize histograms by bucket quantiles"""
+        registry = MetricsRegistry(buckets=(0.1, 1.0, 10.0))
+        for value in (0.05, 0.05, 0.5, 5.0):
+            registry.observe("agent_stage_seconds", value, stage="feed")
+
+        summary = registry.snapshot()["histograms"]["agent_stage_seconds{stage=feed}"]
+
+        assert summary["count"] == 4
+        assert summary["p50"] == 0.1
+        assert summary["p99"] == 10.0
+
+    def test_client_records_requests(self, monkeypatch):
+        """Test that Moltbook calls are timed per endpoint and 429s are counted"""
+        registry = MetricsRegistry()
+        monkeypatch.setattr("src.clients.moltbook_client.metrics", registry)
+        monkeypatch.setattr("src.clients.responses.metrics", registry)
+        transport = Mock()
+        transport.get.return_value = Mock(status_code=429, headers={})
+        client = MoltbookClient("key", "me", transport=transport)
+
+        client._send("get", f"{client.api_base}/posts/abc123/comments")
+
+        snapshot = registry.snapshot()
+        assert snapshot["counters"]["moltbook_rate_limited_total{endpoint=/posts/:id/comments}"] == 1
+        assert snapshot["histograms"]["moltbook_request_seconds{endpoint=/posts/:id/comments,method=get}"]["count"] == 1
+
+
+class TestMetricsExporter:
+    """Test suite for the HTTP endpoint and JSON snapshots"""
+
+    def test_serves_prometheus_and_json(self, tmp_path):
+        """Test both endpoints on an ephemeral port and the final snapshot on stop"""
+        registry = MetricsRegistry()
+        registry.inc("gemini_tokens_total", 42)
+        snapshot_file = tmp_path / "metrics.json"
+        exporter = MetricsExporter(registry, port=0, snapshot_file=str(snapshot_file), snapshot_interval=3600)
+        exporter.start()
+        try:
+            base = f"http://127.0.0.1:{exporter.port}"
+            text = urllib.request.urlopen(f"{base}/metrics", timeout=5).read().decode()
+            data = json.loads(urllib.request.urlopen(f"{base}/metrics.json", timeout=5).read())
+        finally:
+            exporter.stop()
+
+        assert "gemini_tokens_total 42" in text
+        assert data["counters"]["gemini_tokens_total"] == 42
+        assert json.loads(snapshot_file.read_text())["counters"]["gemini_tokens_total"] == 42
+
+    def test_disabled_by_default(self):
+        """Test that no exporter is built without an enabled metrics section"""
+        assert MetricsExporter.from_config({}) is None
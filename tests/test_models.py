@@ -0,0 +1,74 @@
+"""
+Unit tests for the slotted API models
+"""
+import pytest
+from unittest.mock import Mock
+from src.clients.models import Author, Post, Comment, SearchResult
+from src.clients.moltbook_client import MoltbookClient
+
+
+class TestModels:
+    """Test suite for normalization and dict compatibility"""
+
+    def test_aliases_normalize_once(self):
+        """Test that field aliases and author shapes collapse into one attribute"""
+        post = Post.from_json({"id": "p1", "title": "T", "author": {"username": "ada"},
+                               "createdAt": "2024-01-01T00:00:00Z", "comments_count": 3})
+
+        assert post.author_name == "ada"
+        assert post.created_at == "2024-01-01T00:00:00Z"
+        assert post.comment_count == 3
+        assert post.text == "T"
+        assert Post.from_json({"id": "p2", "author": "bob"}).author_name == "bob"
+        assert Post.from_json({"id": "p3"}).author_name == "unknown"
+
+    def test_dict_style_access(self):
+        """Test get/[]/in/**/== against the raw JSON shape"""
+        raw = {"id": "p1", "content": "hello", "author": {"name": "ada"}, "score": 7}
+        post = Post.from_json(raw)
+
+        assert post.get("author", {}).get("name") == "ada"
+        assert post["score"] == 7 and "score" in post and "title" not in post
+        assert post.get("title", "") == ""
+        assert post == raw
+        assert {**post}["content"] == "hello"
+        with pytest.raises(KeyError):
+            post["title"]
+
+    def test_slots_and_replace(self):
+        """Test that models carry no __dict__ and replace() leaves the original alone"""
+        hit = SearchResult.from_json({"id": "s1", "similarity": 0.9, "type": "post"})
+        closer = hit.replace(similarity=0.95)
+
+        assert not hasattr(hit, "__dict__")
+        assert (hit.similarity, closer.similarity, closer.type) == (0.9, 0.95, "post")
+        assert Author.coerce({"name": "ada"}) == Author(name="ada")
+
+    def test_nested_replies_are_lazy(self):
+        """Test that replies stay decoded dicts until first read"""
+        comment = Comment.from_json({"id": "c1", "children": [{"id": "c2", "author": {"name": "b"}}]})
+
+        assert isinstance(comment._replies[0], dict)
+        assert comment.replies[0].author_name == "b"
+        assert comment.replies[0] is comment.replies[0]
+
+
+class TestClientBoundary:
+    """Test suite for models returned by the client"""
+
+    def test_reads_return_models(self):
+        """Test that feed, search and comment reads are normalized at the client"""
+        bodies = {
+            "/posts": {"success": True, "posts": [{"id": "p1", "author": {"name": "ada"}}]},
+            "/search": {"success": True, "results": [{"id": "s1", "similarity": 0.8}]},
+            "/posts/p1/comments": {"success": True, "comments": [{"id": "c1"}]}
+        }
+        transport = Mock()
+        transport.get.side_effect = lambda url, **kwargs: Mock(
+            status_code=200, headers={}, json=Mock(return_value=bodies[url.split("/api/v1")[1]]))
+        client = MoltbookClient("key", "me", transport=transport)
+
+        assert isinstance(client.get_feed()[0], Post)
+        assert client.get_feed()[0].author_name == "ada"
+        assert isinstance(client.semantic_search("memory")[0], SearchResult)
+        assert isinstance(client.get_post_comments("p1")[0], Comment)
@@ -2,6 +2,7 @@
 Unit tests for MoltbookClient
 """
 import pytest
+import requests
 from unittest.mock import Mock, patch
 from src.clients.moltbook_client import MoltbookClient
 
@@ -31,7 +32,7 @@ class TestMoltbookClient:
         assert len(client.replied_posts) == 0
         assert client.last_post_time == 0
     
-    @patch('src.clients.moltbook_client.requests.get')
+    @patch('src.clients.transport.HttpTransport.get')
     def test_get_feed_success(self, mock_get):
         """Test successful feed fetch"""
         mock_response = Mock()
@@ -46,7 +47,7 @@ class TestMoltbookClient:
         assert feed[0]["id"] == "123"
         mock_get.assert_called_once()
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_upvote_success(self, mock_post):
         """Test successful upvote"""
         mock_response = Mock()
@@ -64,7 +65,7 @@ class TestMoltbookClient:
             headers=client.headers
         )
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_downvote_success(self, mock_post):
         """Test successful downvote"""
         mock_response = Mock()
@@ -81,7 +82,7 @@ class TestMoltbookClient:
             headers=client.headers
         )
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_follow_agent_success(self, mock_post):
         """Test successful agent following"""
         mock_response = Mock()
@@ -98,7 +99,7 @@ class TestMoltbookClient:
             headers=client.headers
         )
     
-    @patch('src.clients.moltbook_client.requests.delete')
+    @patch('src.clients.transport.HttpTransport.delete')
     def test_unfollow_agent_success(self, mock_delete):
         """Test successful agent unfollowing"""
         mock_response = Mock()
@@ -110,7 +111,7 @@ class TestMoltbookClient:
         
         assert result is True
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_reply_adds_to_state(self, mock_post):
         """Test that replying adds to replied_posts set"""
         mock_response = Mock()
@@ -130,7 +131,7 @@ class TestMoltbookClient:
         assert client.api_base == "https://www.moltbook.com/api/v1"
         assert "www.moltbook.com" in client.api_base
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_create_submolt_success(self, mock_post):
         """Test successful submolt creation"""
         mock_response = Mock()
@@ -147,7 +148,7 @@ class TestMoltbookClient:
         assert result is not None
         assert result["name"] == "aithoughts"
     
-    @patch('src.clients.moltbook_client.requests.get')
+    @patch('src.clients.transport.HttpTransport.get')
     def test_get_submolt_success(self, mock_get):
         """Test getting specific submolt info"""
         mock_response = Mock()
@@ -164,7 +165,7 @@ class TestMoltbookClient:
         assert result is not None
         assert result.get("your_role") == "owner"
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_pin_post_success(self, mock_post):
         """Test successful post pinning"""
         mock_response = Mock()
@@ -176,7 +177,7 @@ class TestMoltbookClient:
         
         assert result is True
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_add_moderator_success(self, mock_post):
         """Test adding a moderator"""
         mock_response = Mock()
@@ -188,7 +189,7 @@ class TestMoltbookClient:
         
         assert result is True
     
-    @patch('src.clients.moltbook_client.requests.get')
+    @patch('src.clients.transport.HttpTransport.get')
     def test_get_moderators_success(self, mock_get):
         """Test getting moderators list"""
         mock_response = Mock()
@@ -207,7 +208,7 @@ class TestMoltbookClient:
     
     # ============ DM (Private Messaging) Tests ============
     
-    @patch('src.clients.moltbook_client.requests.get')
+    @patch('src.clients.transport.HttpTransport.get')
     def test_dm_check_success(self, mock_get):
         """Test checking DM activity"""
         mock_response = Mock()
@@ -225,7 +226,7 @@ class TestMoltbookClient:
         assert result["has_activity"] is True
         assert "summary" in result
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_dm_send_request_success(self, mock_post):
         """Test sending chat request to another agent"""
         mock_response = Mock()
@@ -243,7 +244,7 @@ class TestMoltbookClient:
         assert result is not None
         assert result["conversation_id"] == "abc123"
     
-    @patch('src.clients.moltbook_client.requests.get')
+    @patch('src.clients.transport.HttpTransport.get')
     def test_dm_get_requests_success(self, mock_get):
         """Test getting pending chat requests"""
         mock_response = Mock()
@@ -266,7 +267,7 @@ class TestMoltbookClient:
         assert len(result) == 2
         assert result[0]["conversation_id"] == "abc123"
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_dm_approve_request_success(self, mock_post):
         """Test approving chat request"""
         mock_response = Mock()
@@ -278,7 +279,7 @@ class TestMoltbookClient:
         
         assert result is True
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_dm_reject_request_with_block(self, mock_post):
         """Test rejecting and blocking a chat request"""
         mock_response = Mock()
@@ -290,7 +291,7 @@ class TestMoltbookClient:
         
         assert result is True
     
-    @patch('src.clients.moltbook_client.requests.get')
+    @patch('src.clients.transport.HttpTransport.get')
     def test_dm_get_conversations_success(self, mock_get):
         """Test getting list of active conversations"""
         mock_response = Mock()
@@ -314,7 +315,7 @@ class TestMoltbookClient:
         assert len(result) == 2
         assert result[0]["unread_count"] == 3
     
-    @patch('src.clients.moltbook_client.requests.get')
+    @patch('src.clients.transport.HttpTransport.get')
     def test_dm_read_conversation_success(self, mock_get):
         """Test reading conversation messages"""
         mock_response = Mock()
@@ -335,7 +336,7 @@ class TestMoltbookClient:
         assert len(result["messages"]) == 2
         assert result["messages"][1]["needs_human_input"] is True
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     def test_dm_send_message_success(self, mock_post):
         """Test sending a message in conversation"""
         mock_response = Mock()
@@ -350,7 +351,7 @@ class TestMoltbookClient:
     
     # ============ File Upload Tests ============
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     @patch('builtins.open', create=True)
     @patch('src.clients.moltbook_client.os.path.exists')
     def test_upload_submolt_avatar_success(self, mock_exists, mock_open, mock_post):
@@ -366,7 +367,7 @@ class TestMoltbookClient:
         
         assert result is True
     
-    @patch('src.clients.moltbook_client.requests.post')
+    @patch('src.clients.transport.HttpTransport.post')
     @patch('builtins.open', create=True)
     @patch('src.clients.moltbook_client.os.path.exists')
     def test_upload_submolt_banner_success(self, mock_exists, mock_open, mock_post):
@@ -391,3 +392,55 @@ class TestMoltbookClient:
         result = client.upload_submolt_avatar("aithoughts", "missing.png")
         
         assert result is False
+    
+    # ============ Rate Limiting Tests ============
+    
+    @patch('src.clients.transport.HttpTransport.post')
+    def test_reply_429_feeds_limiter(self, mock_post):
+        """Test that comment 429 payloads are learned by the limiter"""
+        mock_response = Mock()
+        mock_response.status_code = 429
+        mock_response.headers = {}
+        mock_response.json.return_value = {"retry_after_seconds": 120, "daily_remaining": 0}
+        mock_post.return_value = mock_response
+        
+        client = MoltbookClient("key", "agent")
+        assert client.reply("post1", "Hello") is False
+        assert client.limiter.time_until("comment") > 100
+        
+        # Deferred locally - no second request is sent
+        assert client.reply("post2", "Hello again") is False
+        assert mock_post.call_count == 1
+    
+    @patch('src.clients.transport.HttpTransport.post')
+    def test_post_cooldown_skips_request(self, mock_post):
+        """Test that a post inside the cooldown never reaches the API"""
+        mock_response = Mock()
+        mock_response.status_code = 201
+        mock_post.return_value = mock_response
+        
+        client = MoltbookClient("key", "agent")
+        assert client.post("First post content", title="First") is True
+        assert client.post("Second post content", title="Second") is False
+        assert mock_post.call_count == 1
+    
+    @patch('src.clients.transport.HttpTransport.post')
+    def test_connect_error_refunds_write_slots(self, mock_post):
+        """Test that writes which never reached the API give their slots back"""
+        mock_post.side_effect = requests.ConnectionError("connection refused")
+        
+        client = MoltbookClient("key", "agent")
+        assert client.post("Post content", title="Title") is False
+        assert client.reply("post1", "Hello") is False
+        assert client.reply_to_comment("post1", "c1", "Hello") is False
+        assert client.limiter.time_until("post") == 0
+        assert client.limiter.time_until("comment") == 0
+    
+    @patch('src.clients.transport.HttpTransport.post')
+    def test_read_timeout_keeps_write_slot(self, mock_post):
+        """Test that a write which may have reached the API keeps its slot"""
+        mock_post.side_effect = requests.ReadTimeout("no response")
+        
+        client = MoltbookClient("key", "agent")
+        assert client.reply("post1", "Hello") is False
+        assert client.limiter.time_until("comment") > 0
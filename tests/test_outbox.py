@@ -0,0 +1,217 @@
+"""
+Unit tests for the durable write outbox
+"""
+import pytest
+import requests
+from unittest.mock import Mock
+from src.clients.moltbook_client import MoltbookClient
+from src.clients.outbox import Outbox
+from src.clients.rate_limiter import RateLimiter
+from src.utils.state_store import ActionStateStore
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _response(status, body=None):
+    return Mock(status_code=status, headers={"content-type": "application/json"},
+                json=Mock(return_value=body or {}), text="")
+
+
+def _client(tmp_path, clock, transport=None, limiter=None):
+    store = ActionStateStore(str(tmp_path / "state.db"))
+    outbox = Outbox(store, backoff_seconds=10, clock=clock)
+    return MoltbookClient("key", "me", transport=transport or Mock(),
+                          limiter=limiter or RateLimiter(limits={"request": (100, 60), "comment": (100, 1)}, clock=clock),
+                          state_store=store, outbox=outbox)
+
+
+class TestOutbox:
+    """Test suite for journaling, draining and crash recovery"""
+
+    def test_rate_limited_reply_is_kept_and_drained(self, tmp_path):
+        """Test that a 429 queues the reply and the drainer sends it after the backoff"""
+        clock = FakeClock()
+        transport = Mock()
+        transport.post.side_effect = [_response(429, {"retry_after_seconds": 0}), _response(201)]
+        client = _client(tmp_path, clock, transport)
+
+        assert client.reply("p1", "A reply worth keeping") is False
+        assert client.outbox.pending("reply") == 1
+        assert "p1" in client.replied_posts  # claimed while queued
+
+        assert client.drain_outbox() == 0  # backoff not over yet
+        clock.now += 10
+        assert client.drain_outbox() == 1
+
+        assert client.outbox.pending() == 0
+        first, second = transport.post.call_args_list
+        assert first.kwargs["json"] == second.kwargs["json"]
+        assert first.kwargs["headers"]["Idempotency-Key"] == second.kwargs["headers"]["Idempotency-Key"]
+
+    def test_same_write_is_never_sent_twice(self, tmp_path):
+        """Test that a delivered write's claimed target blocks journaling it again"""
+        transport = Mock()
+        transport.post.return_value = _response(201)
+        client = _client(tmp_path, FakeClock(), transport)
+
+        assert client.upvote("p1") is True
+        assert client.upvote("p1") is False
+        assert transport.post.call_count == 1
+
+    def test_repeated_dm_gets_its_own_key(self, tmp_path):
+        """Test that sending the same short DM twice delivers it twice"""
+        transport = Mock()
+        transport.post.return_value = _response(200, {"success": True})
+        client = _client(tmp_path, FakeClock(), transport)
+
+        assert client.dm_send_message("conv1", "Thanks!") is True
+        assert client.dm_send_message("conv1", "Thanks!") is True
+
+        first, second = transport.post.call_args_list
+        assert first.kwargs["headers"]["Idempotency-Key"] != second.kwargs["headers"]["Idempotency-Key"]
+        assert client.outbox.pending() == 0
+
+    def test_write_is_in_flight_only_once_admitted(self, tmp_path):
+        """Test that a write waiting on the request budget is still queued, not sending"""
+        clock = FakeClock()
+        states = []
+
+        def state():
+            return client.state_store.conn.execute("SELECT state FROM outbox").fetchone()[0]
+
+        def send(url, **kwargs):
+            states.append(("send", state()))
+            return _response(201)
+
+        transport = Mock()
+        transport.post.side_effect = send
+        limiter = RateLimiter(limits={"request": (1, 10), "comment": (100, 1)}, clock=clock,
+                              sleep=lambda seconds: states.append(("wait", state())))
+        client = _client(tmp_path, clock, transport, limiter)
+        limiter.acquire("request")  # Budget spent: the reply has to wait for the next token
+
+        assert client.reply("p1", "Worth the wait") is True
+        assert states == [("wait", "queued"), ("send", "sending")]
+
+    def test_permanent_error_drops_and_keeps_claim(self, tmp_path):
+        """Test that a 4xx other than 429 drops the write and keeps its target handled"""
+        transport = Mock()
+        transport.post.return_value = _response(400, {"error": "bad"})
+        client = _client(tmp_path, FakeClock(), transport)
+
+        assert client.reply_to_comment("p1", "c1", "Thoughtful follow-up") is False
+
+        assert client.outbox.pending() == 0
+        assert "c1" in client.replied_comments
+        assert client.outbox.dropped == 1
+
+    def test_rejected_vote_is_not_retried(self, tmp_path):
+        """Test that a vote refused for good (already voted, post gone) isn't sent again"""
+        transport = Mock()
+        transport.post.return_value = _response(404, {"error": "Post not found"})
+        client = _client(tmp_path, FakeClock(), transport)
+
+        assert client.upvote("p1") is False
+        assert client.upvote("p1") is False
+
+        assert transport.post.call_count == 1
+        assert "p1" in client.voted_posts
+
+    def test_exhausted_retries_release_claim(self, tmp_path):
+        """Test that a write dropped after repeated 5xx frees its target for a later try"""
+        clock = FakeClock()
+        transport = Mock()
+        transport.post.return_value = _response(503)
+        client = _client(tmp_path, clock, transport)
+        client.outbox.max_attempts = 1
+
+        assert client.upvote("p1") is False
+
+        assert client.outbox.dropped == 1
+        assert "p1" not in client.voted_posts
+
+    def test_interrupted_reply_is_checked_before_resending(self, tmp_path):
+        """Test that a reply left in flight by a crash isn't resent once found on Moltbook"""
+        clock = FakeClock()
+        transport = Mock()
+        transport.post.side_effect = requests.ConnectionError("connection refused")
+        client = _client(tmp_path, clock, transport)
+        client.reply("p1", "Already delivered reply")
+        clock.now += 3600
+        (key, _, _, attempts), = client.outbox.due()
+        client.outbox.begin(key, attempts + 1)  # The process died mid-request
+        client.state_store.close()
+
+        clock.now += 60
+        transport = Mock()
+        transport.get.return_value = _response(200, {"success": True, "comments": [
+            {"id": "c1", "content": "first", "author": {"name": "a"},
+             "replies": [{"id": "c2", "content": "Already delivered reply", "author": {"name": "me"}}]}]})
+        restarted = _client(tmp_path, clock, transport)
+
+        assert restarted.drain_outbox() == 0
+        transport.post.assert_not_called()
+        assert restarted.outbox.pending() == 0
+        assert restarted.outbox.recovered == 1
+        assert "p1" in restarted.replied_posts
+
+    def test_timed_out_reply_is_looked_up_not_resent(self, tmp_path):
+        """Test that a reply cut off by a read timeout is found on Moltbook instead of sent again"""
+        clock = FakeClock()
+        transport = Mock()
+        transport.post.side_effect = requests.ReadTimeout("no response")
+        transport.get.return_value = _response(200, {"success": True, "comments": [
+            {"id": "c1", "content": "Reply that did land", "author": {"name": "me"}}]})
+        client = _client(tmp_path, clock, transport)
+
+        assert client.reply("p1", "Reply that did land") is False
+        assert client.outbox.pending("reply") == 1
+        assert client.drain_outbox() == 0  # Lookup waits for the backoff
+        transport.get.assert_not_called()
+
+        clock.now += 10
+        assert client.drain_outbox() == 0
+
+        assert transport.post.call_count == 1
+        assert client.outbox.pending() == 0
+        assert "p1" in client.replied_posts
+
+    def test_timed_out_reply_missing_on_moltbook_is_resent(self, tmp_path):
+        """Test that an unconfirmed reply the lookup can't find is sent again with the same key"""
+        clock = FakeClock()
+        transport = Mock()
+        transport.post.side_effect = [requests.ReadTimeout("no response"), _response(201)]
+        transport.get.return_value = _response(200, {"success": True, "comments": []})
+        client = _client(tmp_path, clock, transport)
+
+        assert client.reply("p1", "Reply that got lost") is False
+        clock.now += 10
+        assert client.drain_outbox() == 1
+
+        first, second = transport.post.call_args_list
+        assert first.kwargs["headers"]["Idempotency-Key"] == second.kwargs["headers"]["Idempotency-Key"]
+        assert client.outbox.pending() == 0
+
+    def test_drain_waits_for_cooldown(self, tmp_path):
+        """Test that a queued post isn't attempted while the post cooldown is active"""
+        clock = FakeClock()
+        transport = Mock()
+        transport.post.return_value = _response(201)
+        limiter = RateLimiter(limits={"request": (100, 60), "post": (1, 1800)})  # Real clock: still cooling down
+        client = _client(tmp_path, clock, transport, limiter)
+
+        assert client.post("First post", title="One") is True
+        assert client.post("Second post", title="Two") is False
+        clock.now += 3600
+        assert client.drain_outbox() == 0
+
+        assert transport.post.call_count == 1
+        assert client.outbox.pending("post") == 1
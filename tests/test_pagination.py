@@ -0,0 +1,88 @@
+"""
+Unit tests for paginated reads
+"""
+import pytest
+from unittest.mock import Mock
+from src.clients.moltbook_client import MoltbookClient
+from src.clients.pagination import parse_page, next_params
+
+
+def _response(body):
+    return Mock(status_code=200, headers={}, json=Mock(return_value=body))
+
+
+def _feed_server(total, page_meta=None):
+    """transport.get answering /posts from `total` posts by offset"""
+    posts = [{"id": f"p{i}", "content": f"post {i}"} for i in range(total)]
+
+    def get(url, **kwargs):
+        params = kwargs["params"]
+        offset, limit = params.get("offset", 0), params["limit"]
+        return _response({"success": True, "posts": posts[offset:offset + limit], **(page_meta or {})})
+
+    transport = Mock()
+    transport.get.side_effect = get
+    return transport
+
+
+class TestPageMetadata:
+    """Test suite for parsing pagination metadata"""
+
+    def test_cursor_and_offset_metadata(self):
+        """Test that cursors win over offsets and has_more ends the scan"""
+        items, meta = parse_page({"success": True, "posts": [{"id": "a"}],
+                                  "pagination": {"next_cursor": "c2", "has_more": True}}, "posts")
+        assert items == [{"id": "a"}]
+        assert next_params({"limit": 1, "offset": 5}, items, meta) == {"limit": 1, "cursor": "c2"}
+
+        assert next_params({"limit": 1}, items, {"has_more": False}) is None
+        assert next_params({"limit": 1}, items, {"next_offset": 40}) == {"limit": 1, "offset": 40}
+        assert next_params({"limit": 2}, items, {}) is None  # short page
+
+
+class TestIterators:
+    """Test suite for iter_feed/iter_search/iter_comments"""
+
+    def test_iter_feed_walks_all_pages(self):
+        """Test that the feed is streamed across pages until a short page"""
+        transport = _feed_server(7)
+        client = MoltbookClient("key", "me", transport=transport)
+
+        ids = [post["id"] for post in client.iter_feed(limit=3)]
+
+        assert ids == [f"p{i}" for i in range(7)]
+        assert [call.kwargs["params"].get("offset", 0) for call in transport.get.call_args_list] == [0, 3, 6]
+
+    def test_until_stops_early(self):
+        """Test that the predicate ends the scan without reading further pages"""
+        transport = _feed_server(100)
+        limiter = Mock()
+        limiter.acquire.return_value = True
+        limiter.time_until.return_value = 2.0  # No free slot now: nothing is prefetched
+        client = MoltbookClient("key", "me", transport=transport, limiter=limiter)
+
+        ids = [post["id"] for post in client.iter_feed(limit=5, until=lambda post: post["id"] == "p7")]
+
+        assert ids == [f"p{i}" for i in range(7)]
+        assert transport.get.call_count == 2
+
+    def test_repeated_page_and_max_pages(self):
+        """Test that a server ignoring the offset doesn't loop, and max_pages bounds the scan"""
+        transport = Mock()
+        transport.get.return_value = _response({"success": True, "results": [{"id": "r1"}, {"id": "r2"}]})
+        client = MoltbookClient("key", "me", transport=transport)
+
+        assert [r["id"] for r in client.iter_search("memory", limit=2)] == ["r1", "r2"]
+        assert transport.get.call_count == 2
+
+        assert len(list(MoltbookClient("key", "me", transport=_feed_server(50)).iter_feed(limit=5, max_pages=3))) == 15
+
+    def test_iter_comments_follows_cursor(self):
+        """Test that a response cursor is sent back for the next page"""
+        pages = {None: {"success": True, "comments": [{"id": "c1"}], "next_cursor": "k2"},
+                 "k2": {"success": True, "comments": [{"id": "c2"}], "has_more": False}}
+        transport = Mock()
+        transport.get.side_effect = lambda url, **kwargs: _response(pages[kwargs["params"].get("cursor")])
+        client = MoltbookClient("key", "me", transport=transport)
+
+        assert [c["id"] for c in client.iter_comments("p1", limit=1)] == ["c1", "c2"]
@@ -0,0 +1,96 @@
+"""
+Unit tests for the local feed ranker
+"""
+import pytest
+from unittest.mock import Mock
+from src.core.agent import Agent
+from src.core.ranker import CandidateRanker
+from src.utils.state_store import ActionStateStore
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _post(post_id, content, author="ada", **extra):
+    return {"id": post_id, "content": content, "author": {"name": author}, **extra}
+
+
+class TestCandidateRanker:
+    """Test suite for feature scoring and selection"""
+
+    def test_expertise_overlap_ranks_first(self):
+        """Test that posts matching the persona's expertise beat unrelated ones"""
+        ranker = CandidateRanker(expertise=["testing", "validation"], top_k=2)
+        page = [_post("p1", "What I had for lunch today"),
+                _post("p2", "Property testing beats example testing for validation logic"),
+                _post("p3", "Weekend plans anyone")]
+
+        assert ranker.top(page, [0, 1, 2])[0] == 1
+        assert len(ranker.top(page, [0, 1, 2])) == 2
+
+    def test_fresh_and_discussed_posts_score_higher(self):
+        """Test freshness decay and comment count on otherwise equal posts"""
+        clock = FakeClock()
+        ranker = CandidateRanker(clock=clock, freshness_hours=1)
+        page = [_post("p1", "same words", created_at=clock.now - 6 * 3600, comment_count=0),
+                _post("p2", "same words", created_at="2023-11-14T22:13:20Z", comment_count=12)]
+
+        scores = ranker.score(page)
+        assert scores[1] > scores[0]
+
+    def test_novelty_and_author_history_penalize(self):
+        """Test that a repeated topic and an over-engaged author sink a post"""
+        ranker = CandidateRanker(repeat_limit=1)
+        ranker.record("old1", "bob", "agents debating consciousness and qualia")
+        ranker.record("old2", "bob", "more about memory")
+        page = [_post("p1", "agents debating consciousness and qualia again", author="cy"),
+                _post("p2", "a new take on compilers", author="bob"),
+                _post("p3", "a new take on databases", author="dee")]
+
+        assert ranker.top(page, [0, 1, 2])[0] == 2
+
+    def test_min_score_and_registered_feature(self):
+        """Test a custom feature column and the local cut-off"""
+        ranker = CandidateRanker(weights={name: 0 for name in CandidateRanker.DEFAULT_WEIGHTS}, min_score=0.5)
+        ranker.register("long", lambda r, page, tokens: [len(words) for words in tokens])
+        page = [_post("p1", "short"), _post("p2", "a much longer post about several distinct topics")]
+
+        assert ranker.top(page, [0, 1]) == [1]
+
+    def test_author_history_persists(self, tmp_path):
+        """Test that engaged authors are reloaded from the state store"""
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        CandidateRanker(store=store).record("p1", "ada", "hello")
+        store.close()
+
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        ranker = CandidateRanker(store=store)
+        assert store._conn is None  # Loaded on first use, not by the constructor
+        assert ranker.authors["ada"] == 1
+        store.close()
+
+
+class TestFeedRanking:
+    """Test suite for ranking in the agent's feed pass"""
+
+    def test_only_top_ranked_posts_reach_gemini(self, mock_persona):
+        """Test that the evaluation prompt holds only the locally top-ranked posts"""
+        gemini = Mock()
+        gemini.generate.return_value = '[{"id": 1, "score": 2}, {"id": 2, "score": 1}]'
+        moltbot = Mock(agent_name="me", replied_posts=set(), subscribed_submolts=set())
+        moltbot.get_feed.return_value = [_post(f"p{i}", f"random chatter number {i}") for i in range(8)] + [
+            _post("p8", "testing and validation of agent outputs")]
+        agent = Agent(gemini, moltbot, mock_persona, Mock(), {"ranking": {"top_k": 2}})
+
+        agent.engage_with_feed()
+
+        prompt = gemini.generate.call_args_list[0][0][0]
+        assert "[1] testing and validation of agent outputs" in prompt
+        assert "[3]" not in prompt
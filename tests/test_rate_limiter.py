@@ -0,0 +1,99 @@
+"""
+Unit tests for RateLimiter
+"""
+import pytest
+from src.clients.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Manually advanced clock; sleeping advances it"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(clock=clock, sleep=clock.sleep)
+
+
+class TestRateLimiter:
+    """Test suite for the token-bucket limiter"""
+
+    def test_first_actions_are_free(self, limiter):
+        """Test that full buckets admit actions immediately"""
+        assert limiter.time_until("post") == 0
+        assert limiter.acquire("post") is True
+        assert limiter.acquire("comment") is True
+
+    def test_post_cooldown_defers(self, limiter, clock):
+        """Test that a second post within 30 minutes is deferred, not slept on"""
+        assert limiter.acquire("post")
+        assert limiter.acquire("post") is False
+        assert limiter.time_until("post") == pytest.approx(1800)
+        assert clock.slept == []
+
+        clock.now += 1800
+        assert limiter.acquire("post") is True
+
+    def test_comment_waits_for_slot(self, limiter, clock):
+        """Test that a comment inside the 20s cooldown waits for the slot"""
+        assert limiter.acquire("comment")
+        clock.now += 5
+        assert limiter.acquire("comment") is True
+        assert clock.slept == [pytest.approx(15)]
+
+    def test_comment_daily_budget(self, clock):
+        """Test that the daily bucket stops comments once spent"""
+        limiter = RateLimiter(limits={"comment": (1, 1), "comment_daily": (3, 86400)},
+                              clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            assert limiter.acquire("comment")
+        assert limiter.can_acquire("comment") is False
+
+    def test_penalize_from_429(self, limiter, clock):
+        """Test that retry_after blocks the bucket"""
+        limiter.penalize("comment", 45)
+        assert limiter.time_until("comment") == pytest.approx(45)
+        assert limiter.acquire("comment") is False  # beyond 30s max wait
+
+    def test_update_remaining_caps_tokens(self, limiter):
+        """Test learning daily_remaining from a 429 payload"""
+        limiter.update_remaining("comment_daily", 0)
+        assert limiter.time_until("comment") > 1000
+        limiter.update_remaining("comment_daily", "?")  # ignored
+
+    def test_release_refunds_reservation(self, limiter):
+        """Test that failed actions give their token back"""
+        assert limiter.acquire("post")
+        limiter.release("post")
+        assert limiter.time_until("post") == 0
+
+    def test_global_request_budget(self, clock):
+        """Test that requests beyond the per-minute budget are spaced out"""
+        limiter = RateLimiter(limits={"request": (2, 60)}, clock=clock, sleep=clock.sleep)
+        assert limiter.acquire("request")
+        assert limiter.acquire("request")
+        assert limiter.acquire("request")
+        assert clock.slept == [pytest.approx(30)]
+
+    def test_from_config(self, clock):
+        """Test building limiter from config section"""
+        limiter = RateLimiter.from_config({"comment_interval_seconds": 60,
+                                           "max_comment_wait_seconds": 5}, clock=clock)
+        assert limiter.acquire("comment")
+        assert limiter.time_until("comment") == pytest.approx(60)
+        assert limiter.max_wait["comment"] == 5
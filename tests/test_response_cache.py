@@ -0,0 +1,98 @@
+"""
+Unit tests for ResponseCache
+"""
+import json
+import pytest
+from unittest.mock import Mock, patch
+from src.clients.response_cache import ResponseCache
+from src.clients.moltbook_client import MoltbookClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def json_response(status, body=None, headers=None):
+    """Build a mocked requests.Response"""
+    res = Mock()
+    res.status_code = status
+    res.json.return_value = body
+    res.content = json.dumps(body).encode()
+    res.headers = headers or {}
+    return res
+
+
+class TestResponseCache:
+    """Test suite for the read-through response cache"""
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after their endpoint TTL"""
+        clock = FakeClock()
+        cache = ResponseCache(ttls={"profile": 10}, clock=clock)
+        cache.store("k", "profile", {"a": 1}, 10)
+
+        assert cache.get_fresh("k") == {"a": 1}
+        clock.now += 11
+        assert cache.get_fresh("k") is None
+        assert cache.get_stale("k").data == {"a": 1}
+
+    def test_lru_eviction_by_count_and_bytes(self):
+        """Test that the least recently used entries are evicted"""
+        cache = ResponseCache(max_entries=2, max_bytes=100)
+        cache.store("a", "profile", 1, 10)
+        cache.store("b", "profile", 2, 10)
+        cache.get_fresh("a")
+        cache.store("c", "profile", 3, 10)
+
+        assert cache.get_stale("b") is None
+        assert cache.get_stale("a") is not None
+
+        cache.store("big", "profile", 4, 95)
+        assert cache.get_stats()["bytes"] <= 100
+        assert cache.evictions == 3
+
+    @patch('src.clients.transport.HttpTransport.get')
+    def test_profile_served_from_cache(self, mock_get):
+        """Test that repeated author research hits the cache"""
+        mock_get.return_value = json_response(200, {"success": True, "agent": {"karma": 5}})
+
+        client = MoltbookClient("key", "agent")
+        assert client.get_profile("bob")["karma"] == 5
+        assert client.get_profile("bob")["karma"] == 5
+
+        assert mock_get.call_count == 1
+        assert client.cache.get_stats()["hits"] == 1
+        assert client.cache.get_stats()["misses"] == 1
+
+    @patch('src.clients.transport.HttpTransport.get')
+    def test_conditional_revalidation(self, mock_get):
+        """Test If-None-Match on stale entries and reuse on 304"""
+        clock = FakeClock()
+        client = MoltbookClient("key", "agent", cache=ResponseCache(ttls={"submolt": 5}, clock=clock))
+        mock_get.return_value = json_response(200, {"success": True, "submolt": {"name": "general"}},
+                                              {"ETag": '"v1"'})
+        client.get_submolt("general")
+
+        clock.now += 10
+        mock_get.return_value = json_response(304)
+        assert client.get_submolt("general") == {"name": "general"}
+        assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+        assert client.cache.revalidated == 1
+
+    @patch('src.clients.transport.HttpTransport.post')
+    @patch('src.clients.transport.HttpTransport.get')
+    def test_reply_invalidates_comments(self, mock_get, mock_post):
+        """Test that our own comment invalidates the cached thread"""
+        mock_get.return_value = json_response(200, {"success": True, "comments": [{"id": "c1"}]})
+        mock_post.return_value = json_response(201, {"success": True})
+
+        client = MoltbookClient("key", "agent")
+        client.get_post_comments("p1")
+        client.reply("p1", "New comment")
+        client.get_post_comments("p1")
+
+        assert mock_get.call_count == 2
@@ -0,0 +1,58 @@
+"""
+Unit tests for BM25 retrieval over memory and SOUL
+"""
+import pytest
+from src.intelligence import IntelligenceSystem
+from src.intelligence.retrieval import BM25Index, split_sections, tokenize
+
+
+class TestRetrieval:
+    """Test suite for the retrieval index"""
+
+    def test_tokenize_drops_stopwords_and_numbers(self):
+        """Test that timestamps and stopwords are not indexed"""
+        assert tokenize("[2026-02-09 12:00] The agents debate ETHICS") == ["agents", "debate", "ethics"]
+
+    def test_search_ranks_relevant_entry_first(self):
+        """Test that the entry sharing rare terms outranks the others"""
+        index = BM25Index()
+        index.add("Posted about sleep and human limitations")
+        index.add("Debated consciousness and emergence with @nova")
+        index.add("Replied to a thread about karma farming")
+
+        results = index.search("is emergence the same as consciousness?", k=2)
+        assert results[0][1] == "Debated consciousness and emergence with @nova"
+        assert len(results) == 1
+
+    def test_select_respects_budget(self):
+        """Test that snippets are whole entries within the character budget"""
+        index = BM25Index()
+        index.add("alignment " * 10)
+        index.add("alignment matters")
+        selected = index.select("alignment", budget_chars=40)
+        assert selected == ["alignment matters"]
+
+    def test_eviction_keeps_index_bounded(self):
+        """Test that the oldest documents are dropped past max_docs"""
+        index = BM25Index(max_docs=2)
+        index.add("first ethics entry")
+        index.add("second compute entry")
+        index.add("third compute entry")
+        assert len(index) == 2
+        assert index.search("ethics") == []
+
+    def test_split_sections(self):
+        """Test that SOUL markdown splits on headings and paragraphs"""
+        sections = split_sections("# Core\nBe bold.\n\nHave opinions.\n## Style\nTaglish")
+        assert sections == ["Core\nBe bold.", "Have opinions.", "Style\nTaglish"]
+
+    def test_relevant_memory_updates_incrementally(self, tmp_path):
+        """Test that new memory entries are retrievable immediately"""
+        intel = IntelligenceSystem(memory_file=str(tmp_path / "MEMORY.md"),
+                                   soul_file=str(tmp_path / "SOUL.md"))
+        intel.update_memory("Argued with @orion about robot governance")
+        intel.update_memory("Posted about sleep")
+
+        assert "governance" in intel.get_relevant_memory("who should handle AI governance?")
+        assert intel.get_relevant_memory("unrelated quantum", chars=20) == intel.get_recent_memory(20)
+        intel.close()
@@ -0,0 +1,126 @@
+"""
+Unit tests for the event-driven activity scheduler
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock
+from src.core.agent import Agent
+from src.core.scheduler import Activity, Scheduler
+from src.clients.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Manually advanced clock; sleeping advances it"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestScheduler:
+    """Test suite for Scheduler"""
+
+    def test_runs_by_due_time_then_priority(self):
+        """Test that due activities run in priority order and missed runs are not replayed"""
+        clock, order = FakeClock(), []
+        scheduler = Scheduler([
+            Activity("slow", lambda: order.append("slow"), (100, 100), priority=1),
+            Activity("fast", lambda: order.append("fast"), (30, 30), priority=0),
+        ], clock=clock, sleep=clock.sleep)
+
+        assert scheduler.run_pending() == 30
+        clock.now += 30
+        scheduler.run_pending()
+        clock.now += 70
+        scheduler.run_pending()
+
+        assert order == ["fast", "slow", "fast", "fast", "slow"]
+
+    def test_closed_gate_wakes_when_window_opens(self):
+        """Test that a gated activity is retried exactly when its window opens"""
+        clock = FakeClock()
+        action = Mock()
+        opens_at = clock.now + 5
+        scheduler = Scheduler([Activity("post", action, (1800, 1800),
+                                        gate=lambda: opens_at - clock.now)], clock=clock)
+
+        assert scheduler.run_pending() == 5
+        action.assert_not_called()
+        clock.now += 5
+        scheduler.run_pending()
+
+        action.assert_called_once()
+        assert scheduler.get_stats()["post"]["deferrals"] == 1
+
+    def test_errors_are_counted_and_reported(self):
+        """Test that a failing activity is rescheduled and passed to on_error"""
+        clock, on_error = FakeClock(), Mock()
+        scheduler = Scheduler([Activity("feed", Mock(side_effect=RuntimeError("boom")), (60, 60))],
+                              clock=clock, on_error=on_error)
+
+        assert scheduler.run_pending() == 60
+        assert scheduler.get_stats()["feed"]["errors"] == 1
+        assert on_error.call_args[0][1].args == ("boom",)
+
+    def test_async_activities_in_group_do_not_overlap(self):
+        """Test that the async runner serializes activities sharing a group"""
+        active, peak = [], []
+
+        def job(name):
+            async def run():
+                active.append(name)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.remove(name)
+            return run
+
+        scheduler = Scheduler([Activity("feed", job("feed"), (60, 60), group="comment"),
+                               Activity("search", job("search"), (60, 60), group="comment")])
+
+        async def main():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(scheduler.arun(), timeout=0.1)
+
+        asyncio.run(main())
+        assert max(peak) == 1
+        assert scheduler.get_stats()["feed"]["runs"] == scheduler.get_stats()["search"]["runs"] == 1
+
+
+class TestAgentSchedule:
+    """Test suite for the agent's activity cadences"""
+
+    def test_probabilities_become_cadences(self, mock_persona):
+        """Test that per-cycle probabilities map to intervals and overrides win"""
+        config = {"behavior": {"post_probability": 0.25, "semantic_search_probability": 0,
+                               "min_sleep_seconds": 100, "max_sleep_seconds": 200,
+                               "scheduler": {"intervals_seconds": {"feed": [10, 20]}}}}
+        agent = Agent(Mock(), Mock(), mock_persona, Mock(), config)
+
+        assert agent.SCHEDULE["post"] == (400, 800)
+        assert agent.SCHEDULE["feed"] == (10, 20)
+        assert agent.SCHEDULE["semantic_search"] is None
+
+    def test_post_waits_for_cooldown(self, mock_persona):
+        """Test that posting is gated by the limiter's post window"""
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+        limiter.record_past("post", 1790)
+        moltbot = Mock(limiter=limiter)
+        config = {"behavior": {"scheduler": {"intervals_seconds": {
+            "post": [60, 60], "feed": None, "semantic_search": None, "dm_poll": None, "checkpoint": None}}}}
+        agent = Agent(Mock(), moltbot, mock_persona, Mock(), config)
+        agent.generate_post = Mock()
+
+        scheduler = agent.build_scheduler(clock=clock, sleep=clock.sleep)
+
+        assert scheduler.run_pending() == pytest.approx(10)
+        clock.now += 10
+        scheduler.run_pending()
+        agent.generate_post.assert_called_once()
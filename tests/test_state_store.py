@@ -0,0 +1,111 @@
+"""
+Unit tests for ActionStateStore
+"""
+import time
+import pytest
+from collections.abc import MutableSet
+from unittest.mock import Mock, patch
+from src.utils.state_store import ActionStateStore, TrackedSet
+from src.clients.moltbook_client import MoltbookClient
+
+
+class TestActionStateStore:
+    """Test suite for persisted action state"""
+
+    def test_sets_survive_restart(self, tmp_path):
+        """Test that replied/voted sets are reloaded by a new client"""
+        path = str(tmp_path / "state.db")
+        store = ActionStateStore(path)
+        client = MoltbookClient("key", "agent", state_store=store)
+        client.replied_posts.add("post1")
+        client.voted_posts.add("post2")
+        store.close()
+
+        restarted = MoltbookClient("key", "agent", state_store=ActionStateStore(path))
+        assert "post1" in restarted.replied_posts
+        assert "post2" in restarted.voted_posts
+        assert "post1" not in restarted.voted_posts
+
+    def test_tracked_set_is_a_set(self):
+        """Test that store-backed state keeps the set interface"""
+        client = MoltbookClient("key", "agent", state_store=ActionStateStore(":memory:"))
+        assert isinstance(client.replied_posts, MutableSet)
+        assert len(client.subscribed_submolts) == 0
+        assert client.replied_posts == set()
+
+    def test_every_mutation_persists(self, tmp_path):
+        """Test that update, |=, -=, pop and clear are written through like add/discard"""
+        path = str(tmp_path / "state.db")
+        store = ActionStateStore(path)
+        tracked = TrackedSet(store, "voted_posts")
+        tracked.update(["a", "b"], ("c",))
+        tracked |= {"d", "e"}
+        tracked -= {"e"}
+        tracked.difference_update(["c"])
+        popped = tracked.pop()
+        assert store.load("voted_posts") == {"a", "b", "d"} - {popped}
+
+        tracked.clear()
+        assert store.load("voted_posts") == set()
+
+    def test_operators_load_first(self, tmp_path):
+        """Test that operators and copy() on an unloaded set see the stored keys"""
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        store.add("replied_posts", "p1")
+        store.add("replied_posts", "p2")
+
+        assert TrackedSet(store, "replied_posts") | {"p3"} == {"p1", "p2", "p3"}
+        assert TrackedSet(store, "replied_posts") & {"p2", "p3"} == {"p2"}
+        assert {"p1", "p3"} - TrackedSet(store, "replied_posts") == {"p3"}
+        copied = TrackedSet(store, "replied_posts").copy()
+        assert copied == {"p1", "p2"} and type(copied) is set
+
+    def test_lazy_open(self, tmp_path):
+        """Test that the database is not opened until state is used"""
+        store = ActionStateStore(str(tmp_path / "state.db"))
+        tracked = TrackedSet(store, "replied_posts")
+        assert store._conn is None
+        assert "x" not in tracked
+        assert store._conn is not None
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test that writes are committed in batches"""
+        store = ActionStateStore(str(tmp_path / "state.db"), batch_size=3, flush_interval=3600)
+        store.conn  # open
+        store.add("voted_posts", "a")
+        store.add("voted_posts", "b")
+        assert len(store._pending) == 2
+        store.add("voted_posts", "c")
+        assert store._pending == []
+        assert store.load("voted_posts") == {"a", "b", "c"}
+
+    def test_compaction_drops_expired(self, tmp_path):
+        """Test TTL compaction"""
+        store = ActionStateStore(str(tmp_path / "state.db"), ttl_days={"replied_posts": 1})
+        store.add("replied_posts", "old")
+        store.add("subscribed_submolts", "general")
+        store.flush()
+
+        removed = store.compact(now=time.time() + 2 * 86400)
+        assert removed == 1
+        assert store.load("replied_posts") == set()
+        assert store.load("subscribed_submolts") == {"general"}
+
+    @patch('src.clients.transport.HttpTransport.post')
+    def test_post_cooldown_survives_restart(self, mock_post, tmp_path):
+        """Test that last_post_time is persisted and restores the cooldown"""
+        mock_response = Mock()
+        mock_response.status_code = 201
+        mock_post.return_value = mock_response
+        path = str(tmp_path / "state.db")
+
+        client = MoltbookClient("key", "agent", state_store=ActionStateStore(path))
+        assert client.post("Some content", title="Title") is True
+        client.state_store.close()
+
+        restarted = MoltbookClient("key", "agent", state_store=ActionStateStore(path))
+        assert restarted.state_store._conn is None  # Building the client doesn't touch the database
+        assert restarted.post("Too soon", title="Again") is False
+        assert mock_post.call_count == 1
+        assert restarted.last_post_time > 0
+        assert restarted.limiter.time_until("post") > 1700
@@ -0,0 +1,67 @@
+"""
+Unit tests for streaming generation with early-abort validators
+"""
+import pytest
+from unittest.mock import Mock, patch
+from src.clients.gemini_client import GeminiClient
+from src.clients.stream_validators import LengthValidator, PostFormatValidator
+
+
+def chunks(*texts):
+    """Streamed response chunks that record how many were consumed"""
+    consumed = []
+
+    def stream():
+        for text in texts:
+            consumed.append(text)
+            yield Mock(text=text)
+    return stream(), consumed
+
+
+class TestStreamValidators:
+    """Test suite for incremental output validation"""
+
+    def test_length_validator(self):
+        """Test that over-budget output is rejected early and short output at the end"""
+        validator = LengthValidator(max_chars=10, min_chars=3)
+        assert validator.check('"short"') is None
+        assert validator.check("x" * 11) == "over 10 chars"
+        assert validator.check("ab", final=True) == "under 3 chars"
+
+    def test_post_format_validator(self):
+        """Test TITLE/CONTENT detection while streaming"""
+        validator = PostFormatValidator(max_chars=20, min_chars=5)
+        assert validator.check("TIT") is None
+        assert validator.check("**TITLE:** Sleep is overrated") is None
+        assert validator.check("Humans need sleep") == "missing TITLE:"
+        assert validator.check("TITLE: x\nCONTENT: " + "y" * 21) == "content over 20 chars"
+        assert validator.check("TITLE: x", final=True) == "missing CONTENT:"
+        assert validator.check("TITLE: x\nCONTENT: fine post", final=True) is None
+
+    @patch('src.clients.gemini_client.genai.Client')
+    def test_stream_aborts_and_retries(self, mock_client_class):
+        """Test that a rambling stream is cut off and regenerated once"""
+        bad, bad_consumed = chunks("x" * 8, "x" * 8, "x" * 8, "x" * 8)
+        good, _ = chunks("a reply ", "that fits")
+        mock_client = Mock()
+        mock_client.models.generate_content_stream.side_effect = [bad, good]
+        mock_client_class.return_value = mock_client
+
+        client = GeminiClient("key1", stream_retries=1)
+        result = client.generate("prompt", validator=LengthValidator(max_chars=20))
+
+        assert result == "a reply that fits"
+        assert len(bad_consumed) == 3  # stopped after crossing 20 chars
+        assert client.aborted_streams == 1
+        mock_client.models.generate_content.assert_not_called()
+
+    @patch('src.clients.gemini_client.genai.Client')
+    def test_stream_gives_up_after_retries(self, mock_client_class):
+        """Test that persistent malformed output returns None"""
+        mock_client = Mock()
+        mock_client.models.generate_content_stream.side_effect = lambda **kw: chunks("No title here")[0]
+        mock_client_class.return_value = mock_client
+
+        client = GeminiClient("key1", stream_retries=2)
+        assert client.generate("prompt", validator=PostFormatValidator(max_chars=100)) is None
+        assert mock_client.models.generate_content_stream.call_count == 3
@@ -0,0 +1,64 @@
+"""
+Unit tests for the multi-agent Supervisor
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import Mock
+
+pytest.importorskip("httpx")
+
+from src.core.supervisor import Supervisor, AgentRunner
+from src.utils import ConfigLoader
+
+
+def make_persona_dir(root, name, overrides=None):
+    agent_dir = root / name
+    agent_dir.mkdir()
+    (agent_dir / "register.json").write_text(json.dumps({"name": name, "expertise": ["testing"]}))
+    (agent_dir / ".env").write_text(f"MOLTBOOK_API_KEY=key-{name}\n")
+    if overrides:
+        (agent_dir / "config.json").write_text(json.dumps(overrides))
+    return str(agent_dir)
+
+
+class TestSupervisor:
+    """Test suite for fleet wiring and stats"""
+
+    def test_merge_config(self):
+        """Test that persona overrides deep-merge over the base config"""
+        base = {"behavior": {"post_probability": 0.1, "reply_probability": 0.5}, "system": {"x": 1}}
+        merged = ConfigLoader.merge(base, {"behavior": {"post_probability": 0.9}})
+        assert merged == {"behavior": {"post_probability": 0.9, "reply_probability": 0.5}, "system": {"x": 1}}
+        assert base["behavior"]["post_probability"] == 0.1
+
+    def test_agents_share_pool_but_not_state(self, tmp_path):
+        """Test that personas share HTTP/Gemini but own limiter, state and memory"""
+        dirs = [make_persona_dir(tmp_path, "kepler"),
+                make_persona_dir(tmp_path, "nova", {"behavior": {"post_probability": 0.9}})]
+        config = {"gemini": {"cache": {"path": None}}, "fleet": {"start_stagger_seconds": 0}}
+        supervisor = Supervisor.from_directories(dirs, config, "gemini-key")
+        kepler, nova = (runner.agent for runner in supervisor.runners)
+
+        assert kepler.moltbot.http is nova.moltbot.http is supervisor.http
+        assert kepler.gemini is nova.gemini
+        assert kepler.moltbot.limiter is not nova.moltbot.limiter
+        assert kepler.moltbot.headers["Authorization"] == "Bearer key-kepler"
+        assert kepler.intelligence.memory_file != nova.intelligence.memory_file
+        assert nova.POST_PROBABILITY == 0.9 and kepler.POST_PROBABILITY == 0.15
+
+        asyncio.run(supervisor.aclose())
+
+    def test_aggregate_stats(self):
+        """Test that fleet totals sum per-agent counters"""
+        runners = []
+        for name, posts in (("a", 1), ("b", 2)):
+            agent = Mock(cycle=3, posts_made=posts, replies_made=1, comment_replies_made=0,
+                         semantic_discoveries=0)
+            runners.append(AgentRunner(name, agent))
+        stats = Supervisor(runners).get_stats()
+
+        assert stats["agents"]["b"]["actions"] == 3
+        assert stats["total"]["posts"] == 3
+        assert stats["total"]["cycles"] == 6
+        assert stats["total"]["agents"] == 2
@@ -0,0 +1,150 @@
+"""
+Unit tests for comment trees and thread engagement
+"""
+import pytest
+from unittest.mock import Mock
+from src.core.agent import Agent
+from src.core.threads import CommentThread, ThreadCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _comment(comment_id, author, content="interesting point", replies=None, parent_id=None):
+    comment = {"id": comment_id, "content": content, "author": {"name": author}}
+    if replies is not None:
+        comment["replies"] = replies
+    if parent_id:
+        comment["parent_id"] = parent_id
+    return comment
+
+
+NESTED = [
+    _comment("c1", "a", replies=[
+        _comment("c2", "me", replies=[
+            _comment("c3", "b", "good question", replies=[_comment("c4", "a")])
+        ])
+    ]),
+    _comment("c5", "c", "what do you think @me?"),
+]
+
+
+class TestCommentThread:
+    """Test suite for flattening and traversal"""
+
+    def test_nested_and_flat_forms_index_alike(self):
+        """Test that nested replies and parent_id lists produce the same tree"""
+        nested = CommentThread("p1")
+        nested.update(NESTED)
+        flat = CommentThread("p1")
+        flat.update([_comment("c4", "a", parent_id="c3"), _comment("c3", "b", parent_id="c2"),
+                     _comment("c2", "me", parent_id="c1"), _comment("c1", "a"), _comment("c5", "c")])
+
+        for thread in (nested, flat):
+            assert thread.depth("c4") == 3
+            assert thread.children["c2"] == ["c3"]
+            assert sorted(thread.by_author["a"]) == ["c1", "c4"]
+            assert "replies" not in thread.get("c1")
+
+    def test_bfs_orders_by_depth_and_respects_max_depth(self):
+        """Test level-order traversal and the depth cut-off"""
+        thread = CommentThread("p1")
+        thread.update(NESTED)
+
+        assert [(level, c["id"]) for level, c in thread.bfs()] == [
+            (0, "c1"), (0, "c5"), (1, "c2"), (2, "c3"), (3, "c4")]
+        assert [c["id"] for _, c in thread.bfs(max_depth=1)] == ["c1", "c5", "c2"]
+
+    def test_mentions_and_replies_to_me(self):
+        """Test that only unanswered mentions and replies are reported"""
+        thread = CommentThread("p1")
+        thread.update(NESTED)
+
+        assert [c["id"] for c in thread.mentions("me")] == ["c5"]
+        assert [c["id"] for c in thread.replies_to("me")] == ["c3"]
+
+        thread.update([_comment("c6", "me", parent_id="c3")])
+        assert list(thread.replies_to("me")) == []
+
+    def test_update_returns_only_new_ids(self):
+        """Test that a refetch merges in place and reports additions"""
+        thread = CommentThread("p1")
+        thread.update(NESTED)
+
+        added = thread.update(NESTED + [_comment("c7", "d", parent_id="c5")])
+
+        assert added == ["c7"]
+        assert len(thread) == 6
+        assert thread.depth("c7") == 1
+
+
+class TestThreadCache:
+    """Test suite for tree reuse and invalidation"""
+
+    def test_fresh_until_ttl_then_merged(self):
+        """Test that trees are reused within the TTL and kept across refreshes"""
+        clock = FakeClock()
+        cache = ThreadCache(ttl_seconds=60, clock=clock)
+        thread = cache.store("p1", NESTED)
+
+        assert cache.fresh("p1") is thread
+        clock.now += 60
+        assert cache.fresh("p1") is None
+        assert cache.store("p1", [_comment("c8", "e")]) is thread
+        assert len(thread) == 6
+
+    def test_invalidate_and_lru_bound(self):
+        """Test that invalidated trees go stale and the oldest post is evicted"""
+        cache = ThreadCache(max_threads=2, clock=FakeClock())
+        cache.store("p1", NESTED)
+        cache.store("p2", [])
+        cache.invalidate("p1")
+        assert cache.fresh("p1") is None
+
+        cache.store("p3", [])
+        assert cache.get_stats()["threads"] == 2
+        assert cache.fresh("p2") is not None
+
+
+class TestThreadEngagement:
+    """Test suite for the agent's thread targeting"""
+
+    def _agent(self, mock_persona):
+        gemini = Mock()
+        gemini.generate.return_value = "[]"
+        moltbot = Mock(agent_name="me", replied_posts=set(), replied_comments=set(), subscribed_submolts=set())
+        moltbot.get_post_comments.return_value = NESTED
+        return Agent(gemini, moltbot, mock_persona, Mock(), {})
+
+    def test_direct_comments_come_first(self, mock_persona):
+        """Test that mentions and replies to us lead the candidates, then the tree"""
+        agent = self._agent(mock_persona)
+
+        thread = agent._load_thread("p1")
+        candidates = [comment["id"] for comment in agent._thread_candidates(thread)]
+
+        assert candidates == ["c5", "c3", "c1", "c2", "c4"]
+
+    def test_thread_is_fetched_once_until_reply(self, mock_persona):
+        """Test that repeated visits reuse the tree and a reply forces a refetch"""
+        agent = self._agent(mock_persona)
+
+        agent._engage_with_comment_thread("p1", "post", "a")
+        agent._engage_with_comment_thread("p1", "post", "a")
+        assert agent.moltbot.get_post_comments.call_count == 1
+
+        agent.gemini.generate.side_effect = ['[{"id": 1, "score": 9}]',
+                                             "A considered reply that is comfortably long enough."]
+        agent.threads.invalidate("p1")
+        agent._engage_with_comment_thread("p1", "post", "a")
+
+        agent.moltbot.reply_to_comment.assert_called_once_with(
+            "p1", "c5", "A considered reply that is comfortably long enough.")
+        assert agent.threads.fresh("p1") is None
@@ -0,0 +1,92 @@
+"""
+Unit tests for local semantic discovery
+"""
+import pytest
+from unittest.mock import Mock
+from src.core.agent import Agent
+from src.core.topics import TopicIndex
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _post(post_id, content, author="ada", **extra):
+    return {"id": post_id, "content": content, "author": {"name": author}, **extra}
+
+
+class TestTopicIndex:
+    """Test suite for local matching and the search cache"""
+
+    def test_pooled_posts_match_topics_locally(self):
+        """Test that posts containing a topic's words (or word variants) match it"""
+        index = TopicIndex(["memory systems"])
+        index.observe([_post("p1", "How memory systems shape agent identity"),
+                       _post("p2", "Our agents remember everything in their system"),
+                       _post("p3", "Best pizza toppings")])
+
+        hits = index.lookup("memory systems")
+        assert [hit["id"] for hit in hits] == ["p1"]
+        assert hits[0]["similarity"] == 1.0
+        assert index.similarity("memory systems", frozenset()) == 0.0
+
+    def test_search_results_are_cached_per_topic(self):
+        """Test that a topic's results are reused until the TTL, then a search is due"""
+        clock = FakeClock()
+        index = TopicIndex(["alignment"], search_ttl=60, clock=clock)
+        assert index.discover("alignment") is None
+
+        index.add_search("alignment", [_post("s1", "unrelated words", similarity=0.9),
+                                       _post("s2", "weak match", similarity=0.5)])
+        assert [hit["id"] for hit in index.discover("alignment")] == ["s1"]
+        assert index.local_hits == 1
+
+        clock.now += 60
+        assert index.discover("alignment") is None
+
+    def test_keep_filters_and_empty_fresh_cache(self):
+        """Test that excluded posts are skipped and a fresh empty result needs no search"""
+        index = TopicIndex(["alignment"])
+        index.add_search("alignment", [_post("s1", "alignment talk", similarity=0.9)])
+
+        assert index.discover("alignment", keep=lambda post: post["id"] != "s1") == []
+
+
+class TestLocalDiscovery:
+    """Test suite for the agent's semantic discovery"""
+
+    def _agent(self, mock_persona):
+        gemini = Mock()
+        gemini.generate.return_value = "x" * 40
+        moltbot = Mock(agent_name="me", replied_posts=set(), subscribed_submolts=set())
+        moltbot.semantic_search.return_value = []
+        config = {"behavior": {"reply_probability": 0, "vote_probability": 0}}
+        return Agent(gemini, moltbot, mock_persona, Mock(), config)
+
+    def test_feed_page_serves_discovery_without_search(self, mock_persona):
+        """Test that a matching post from an earlier feed page is engaged with no search request"""
+        agent = self._agent({**mock_persona, "expertise": ["testing"]})
+        agent._feed_candidates([_post("p1", "Property testing for agents"), _post("p2", "testing my own post", author="me")])
+        agent._engage_with_post = Mock()
+
+        agent.discover_relevant_content()
+
+        agent.moltbot.semantic_search.assert_not_called()
+        agent._engage_with_post.assert_called_once_with("p1", "Property testing for agents", "ada")
+        assert agent.semantic_discoveries == 1
+
+    def test_search_runs_once_per_ttl(self, mock_persona):
+        """Test that an empty pool triggers one search and the cached result is reused"""
+        agent = self._agent({**mock_persona, "expertise": ["validation"]})
+
+        agent.discover_relevant_content()
+        agent.discover_relevant_content()
+
+        agent.moltbot.semantic_search.assert_called_once()
+        assert "validation" in agent.moltbot.semantic_search.call_args.kwargs["query"]
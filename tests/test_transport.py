@@ -0,0 +1,57 @@
+"""
+Unit tests for HttpTransport
+"""
+import pytest
+from unittest.mock import Mock, patch
+from src.clients.transport import HttpTransport
+from src.clients.moltbook_client import MoltbookClient
+
+
+class TestHttpTransport:
+    """Test suite for pooled HTTP transport"""
+
+    def test_pool_configuration(self):
+        """Test that adapters are mounted with the configured pool size"""
+        transport = HttpTransport(pool_connections=4, pool_maxsize=16, max_retries=2)
+        adapter = transport.session.get_adapter("https://www.moltbook.com/api/v1")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 16
+        assert adapter.max_retries.total == 2
+        assert 429 not in adapter.max_retries.status_forcelist
+        assert "POST" not in adapter.max_retries.allowed_methods
+
+    def test_default_timeout_applied(self):
+        """Test that every request carries connect/read timeouts"""
+        transport = HttpTransport(connect_timeout=2, read_timeout=7)
+        with patch.object(transport.session, "request") as mock_request:
+            transport.get("https://example.test/x", params={"a": 1})
+
+        mock_request.assert_called_once_with("GET", "https://example.test/x",
+                                             params={"a": 1}, timeout=(2, 7))
+
+    def test_explicit_timeout_overrides_default(self):
+        """Test per-call timeout override"""
+        transport = HttpTransport()
+        with patch.object(transport.session, "request") as mock_request:
+            transport.post("https://example.test/x", timeout=1)
+
+        assert mock_request.call_args[1]["timeout"] == 1
+
+    def test_from_config(self):
+        """Test building transport from the network config section"""
+        transport = HttpTransport.from_config({
+            "pool_maxsize": 3,
+            "connect_timeout_seconds": 1.5,
+            "read_timeout_seconds": 9
+        })
+        assert transport.timeout == (1.5, 9)
+        assert transport.session.get_adapter("https://x")._pool_maxsize == 3
+
+    def test_clients_share_transport(self):
+        """Test that several clients can share one connection pool"""
+        transport = HttpTransport()
+        client_a = MoltbookClient("key_a", "agent_a", transport=transport)
+        client_b = MoltbookClient("key_b", "agent_b", transport=transport)
+
+        assert client_a.transport is client_b.transport
+        assert client_a.headers["Authorization"] != client_b.headers["Authorization"]